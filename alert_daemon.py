@@ -0,0 +1,102 @@
+# alert_daemon.py
+import asyncio
+import threading
+from config import Config
+from quotes import QuoteSnapshot, fetch_snapshot
+
+
+class AlertDaemon:
+    """Evaluates alerts in the background on a fixed cadence.
+
+    Each cycle collects the distinct symbols of every checker's pending
+    alerts, fetches each symbol once (in concurrent bulk batches) and hands
+    the combined snapshot to every checker. A checker is any object with
+    ``pending_symbols()`` and ``check_snapshot(snapshot)``; if it has
+    ``reload_alerts()`` it is called first so alerts added by other sessions
+    are picked up. A checker whose alerts do not all read quotes can expose
+    ``quote_symbols()`` to keep the others out of the download.
+    """
+
+    def __init__(self, checkers, interval=None, batch_size=None, max_concurrency=None,
+                 fetch=None, on_trigger=None):
+        self.checkers = list(checkers)
+        self.interval = interval or Config.ALERT_CHECK_INTERVAL
+        self.batch_size = batch_size or Config.ALERT_FETCH_BATCH
+        self.max_concurrency = max_concurrency or Config.ALERT_FETCH_CONCURRENCY
+        self.fetch = fetch or fetch_snapshot
+        self.on_trigger = on_trigger
+        self.thread = None
+        self.loop = None
+        self.stop_event = None
+        self.last_cycle = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """Start the evaluation loop in a daemon thread (no-op if already running)"""
+        if self.running:
+            return
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._thread_main, args=(ready,),
+                                       name='alert-daemon', daemon=True)
+        self.thread.start()
+        ready.wait()
+
+    def stop(self, timeout=None):
+        """Ask the loop to finish its current cycle and wait for the thread"""
+        if not self.running:
+            return
+        self.loop.call_soon_threadsafe(self.stop_event.set)
+        self.thread.join(timeout)
+
+    def _thread_main(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.stop_event = asyncio.Event()
+        ready.set()
+        try:
+            self.loop.run_until_complete(self._run())
+        finally:
+            self.loop.close()
+
+    async def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                print(f"Error in alert cycle: {e}")
+            try:
+                await asyncio.wait_for(self.stop_event.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fetch_batches(self, symbols):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_batch(batch):
+            async with semaphore:
+                return await asyncio.to_thread(self.fetch, batch)
+
+        batches = [symbols[i:i + self.batch_size] for i in range(0, len(symbols), self.batch_size)]
+        return QuoteSnapshot.merge(await asyncio.gather(*(fetch_batch(b) for b in batches)))
+
+    async def run_cycle(self):
+        """Run one fetch-and-evaluate pass; returns {checker: triggered alerts}"""
+        await asyncio.gather(*(asyncio.to_thread(c.reload_alerts)
+                               for c in self.checkers if hasattr(c, 'reload_alerts')))
+        if not any(c.pending_symbols() for c in self.checkers):
+            return {}
+        symbols = list(dict.fromkeys(s for c in self.checkers
+                                     for s in getattr(c, 'quote_symbols', c.pending_symbols)()))
+        snapshot = await self._fetch_batches(symbols)
+        results = await asyncio.gather(*(asyncio.to_thread(c.check_snapshot, snapshot)
+                                         for c in self.checkers))
+        self.last_cycle = snapshot.fetched_at
+        triggered = dict(zip(self.checkers, results))
+        if self.on_trigger:
+            for checker, alerts in triggered.items():
+                if alerts:
+                    self.on_trigger(checker, alerts)
+        return triggered
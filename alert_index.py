@@ -0,0 +1,95 @@
+# alert_index.py
+from bisect import bisect_left, bisect_right, insort
+
+
+class AlertIndex:
+    """Pending alerts partitioned by symbol and kind with sorted thresholds.
+
+    Kinds are ``above`` / ``below`` (price thresholds) and ``pct_up`` /
+    ``pct_down`` (percent-change thresholds, stored as positive numbers).
+    Finding every alert hit by a price is a binary search plus a slice, so a
+    lookup costs O(log n + k) regardless of how many alerts are stored.
+    With ``inclusive`` a price equal to the threshold also triggers.
+    """
+
+    KINDS = ('above', 'below', 'pct_up', 'pct_down')
+
+    def __init__(self, inclusive=False):
+        self.inclusive = inclusive
+        self.books = {}
+        self.locations = {}
+
+    def __len__(self):
+        return len(self.locations)
+
+    def __contains__(self, alert_id):
+        return alert_id in self.locations
+
+    def symbols(self):
+        """Symbols that still have pending alerts"""
+        return list(dict.fromkeys(symbol for symbol, _ in self.books))
+
+    def add(self, alert_id, symbol, kind, threshold):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown alert kind: {kind}")
+        if alert_id in self.locations:
+            self.remove(alert_id)
+        threshold = float(threshold)
+        insort(self.books.setdefault((symbol, kind), []), (threshold, alert_id))
+        self.locations[alert_id] = (symbol, kind, threshold)
+
+    def remove(self, alert_id):
+        """Remove an alert; returns False if it was not indexed"""
+        location = self.locations.pop(alert_id, None)
+        if location is None:
+            return False
+        symbol, kind, threshold = location
+        book = self.books[(symbol, kind)]
+        i = bisect_left(book, (threshold, alert_id))
+        if i < len(book) and book[i] == (threshold, alert_id):
+            del book[i]
+        if not book:
+            del self.books[(symbol, kind)]
+        return True
+
+    def _below_end(self, book, value):
+        """Position after the thresholds under ``value`` (or equal when inclusive)"""
+        if self.inclusive:
+            return bisect_right(book, (value, float('inf')))
+        return bisect_left(book, (value,))
+
+    def _above_start(self, book, value):
+        """Position of the first threshold over ``value`` (or equal when inclusive)"""
+        if self.inclusive:
+            return bisect_left(book, (value,))
+        return bisect_right(book, (value, float('inf')))
+
+    def triggered(self, symbol, price, change_pct=None):
+        """IDs of alerts on ``symbol`` satisfied by the current price / percent change"""
+        books = self.books
+        hits = []
+        book = books.get((symbol, 'above'))
+        if book:
+            hits += [i for _, i in book[:self._below_end(book, price)]]
+        book = books.get((symbol, 'below'))
+        if book:
+            hits += [i for _, i in book[self._above_start(book, price):]]
+        if change_pct is not None:
+            book = books.get((symbol, 'pct_up'))
+            if book:
+                hits += [i for _, i in book[:self._below_end(book, change_pct)]]
+            book = books.get((symbol, 'pct_down'))
+            if book:
+                # Falling by more than the threshold: threshold < -change_pct
+                hits += [i for _, i in book[:self._below_end(book, -change_pct)]]
+        return hits
+
+    def crossed(self, symbol, previous_price, price):
+        """IDs of price alerts not satisfied at ``previous_price`` but satisfied at ``price``"""
+        if price >= previous_price:
+            book = self.books.get((symbol, 'above'), [])
+            lo, hi = self._below_end(book, previous_price), self._below_end(book, price)
+        else:
+            book = self.books.get((symbol, 'below'), [])
+            lo, hi = self._above_start(book, price), self._above_start(book, previous_price)
+        return [i for _, i in book[lo:hi]]
@@ -0,0 +1,330 @@
+# alert_rules.py
+"""Alert rules written as expressions over price and indicator fields.
+
+    RSI < 30 and Close crosses_above SMA_50
+    (Close > BB_upper or Daily_Return < -0.05) and not Volume < Volume_SMA
+
+Comparisons are ``< <= > >= == !=`` and ``crosses_above`` / ``crosses_below``
+(true when the relation flipped between the previous and the latest bar),
+combined with ``and``, ``or``, ``not`` and parentheses. Field names are those
+in ``FIELDS`` (case-insensitive).
+
+A rule is parsed once. Its numbers are lifted out as parameters, so rules
+that differ only in their numbers share one compiled *template*. A
+``RuleBook`` stacks the parameters of all rules with the same template into
+a matrix and evaluates the template with NumPy over every rule and symbol at
+once, so a check costs one vectorized pass per distinct rule shape rather
+than a Python call per rule.
+"""
+import re
+from functools import lru_cache
+import numpy as np
+from indicators import TECHNICAL_SPEC
+
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume'] + [
+    c for columns, _, _ in TECHNICAL_SPEC for c in columns]
+_FIELD_NAMES = {name.lower(): name for name in FIELDS}
+
+_COMPARISONS = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater,
+    '>=': np.greater_equal, '==': np.equal, '!=': np.not_equal,
+}
+_CROSSES = ('crosses_above', 'crosses_below')
+_TOKEN = re.compile(r'\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)'
+                    r'|([A-Za-z_][A-Za-z0-9_]*)|(<=|>=|==|!=|<|>|\(|\)|-))')
+
+
+def _tokenize(expression):
+    tokens, pos = [], 0
+    expression = expression.strip()
+    while pos < len(expression):
+        match = _TOKEN.match(expression, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Unexpected character at position {pos}: {expression[pos:]!r}")
+        number, word, symbol = match.groups()
+        if number is not None:
+            tokens.append(('num', float(number)))
+        elif word is not None:
+            lower = word.lower()
+            if lower in ('and', 'or', 'not') or lower in _CROSSES:
+                tokens.append(('op', lower))
+            elif lower in _FIELD_NAMES:
+                tokens.append(('field', _FIELD_NAMES[lower]))
+            else:
+                raise ValueError(f"Unknown field: {word} (choose from {', '.join(FIELDS)})")
+        else:
+            tokens.append(('op', symbol))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over the tokens; numbers become parameter slots"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.params = []
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None or (value is not None and token != ('op', value)):
+            found = token[1] if token[0] else 'end of rule'
+            raise ValueError(f"Expected {value or 'a value'}, found {found}")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self.disjunction()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected {self.peek()[1]} after complete rule")
+        return node
+
+    def disjunction(self):
+        node = self.conjunction()
+        while self.peek() == ('op', 'or'):
+            self.take()
+            node = ('or', node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.negation()
+        while self.peek() == ('op', 'and'):
+            self.take()
+            node = ('and', node, self.negation())
+        return node
+
+    def negation(self):
+        if self.peek() == ('op', 'not'):
+            self.take()
+            return ('not', self.negation())
+        if self.peek() == ('op', '('):
+            self.take()
+            node = self.disjunction()
+            self.take(')')
+            return node
+        return self.comparison()
+
+    def comparison(self):
+        left = self.operand()
+        kind, op = self.peek()
+        if kind != 'op' or (op not in _COMPARISONS and op not in _CROSSES):
+            raise ValueError(f"Expected a comparison after {left[1] if left[0] == 'field' else 'value'}")
+        self.take()
+        right = self.operand()
+        if op in _CROSSES:
+            return ('cross', op, left, right)
+        return ('cmp', op, left, right)
+
+    def operand(self):
+        sign = 1.0
+        if self.peek() == ('op', '-'):
+            self.take()
+            sign = -1.0
+        kind, value = self.take()
+        if kind == 'num':
+            self.params.append(sign * value)
+            return ('param', len(self.params) - 1)
+        if kind == 'field' and sign > 0:
+            return ('field', value)
+        raise ValueError(f"Expected a field or number, found {value}")
+
+
+@lru_cache(maxsize=4096)
+def parse(expression):
+    """Parse a rule into ``(template, params)``; raises ValueError if invalid"""
+    parser = _Parser(_tokenize(expression))
+    template = parser.parse()
+    return template, tuple(parser.params)
+
+
+def template_fields(template):
+    """Field names a template reads"""
+    if template[0] == 'field':
+        return {template[1]}
+    if template[0] == 'param':
+        return set()
+    return set().union(*(template_fields(node) for node in template[1:] if isinstance(node, tuple)))
+
+
+def _compile_operand(node):
+    if node[0] == 'param':
+        slot = node[1]
+        return lambda values, params: params[:, slot]
+    name = node[1]
+    return lambda values, params: values[name]
+
+
+def _known(*values):
+    known = True
+    for value in values:
+        known = known & ~np.isnan(value)
+    return known
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template):
+    """Vectorized evaluator ``f(current, previous, params) -> (value, known)``.
+
+    ``current`` and ``previous`` map field names to one value per rule and
+    ``params`` has one row per rule. Both results are bool arrays: ``known``
+    is False where the outcome depends on a missing (NaN) value, with
+    three-valued logic so ``not`` over missing data stays unknown while
+    ``x or <unknown>`` is still True when ``x`` is.
+    """
+    kind = template[0]
+    if kind == 'cmp':
+        compare = _COMPARISONS[template[1]]
+        left, right = _compile_operand(template[2]), _compile_operand(template[3])
+
+        def comparison(current, previous, params):
+            a, b = left(current, params), right(current, params)
+            return compare(a, b), _known(a, b)
+        return comparison
+    if kind == 'cross':
+        left, right = _compile_operand(template[2]), _compile_operand(template[3])
+        was, now = (np.less_equal, np.greater) if template[1] == 'crosses_above' else (np.greater_equal, np.less)
+
+        def cross(current, previous, params):
+            a0, b0 = left(previous, params), right(previous, params)
+            a1, b1 = left(current, params), right(current, params)
+            return was(a0, b0) & now(a1, b1), _known(a0, b0, a1, b1)
+        return cross
+    if kind == 'not':
+        inner = compile_template(template[1])
+
+        def negation(current, previous, params):
+            value, known = inner(current, previous, params)
+            return ~value & known, known
+        return negation
+    a, b = compile_template(template[1]), compile_template(template[2])
+    if kind == 'and':
+        def conjunction(current, previous, params):
+            (va, ka), (vb, kb) = a(current, previous, params), b(current, previous, params)
+            # Known when both sides are, or when either is known to be False
+            return va & vb, (ka & kb) | (ka & ~va) | (kb & ~vb)
+        return conjunction
+
+    def disjunction(current, previous, params):
+        (va, ka), (vb, kb) = a(current, previous, params), b(current, previous, params)
+        # Known when both sides are, or when either is known to be True
+        return va | vb, (ka & kb) | (ka & va) | (kb & vb)
+    return disjunction
+
+
+class RuleSnapshot:
+    """Latest and previous bar of every field for a set of symbols"""
+
+    def __init__(self, frames):
+        """``frames`` maps symbols to frames with the ``FIELDS`` columns (oldest bar first)"""
+        self.positions = {}
+        current, previous = [], []
+        for symbol, df in frames.items():
+            if df is None or len(df) == 0:
+                continue
+            values = df.reindex(columns=FIELDS).iloc[-2:].to_numpy(dtype=np.float64)
+            self.positions[symbol] = len(current)
+            current.append(values[-1])
+            previous.append(values[0] if len(values) > 1 else np.full(len(FIELDS), np.nan))
+        self.current = np.array(current, dtype=np.float64).reshape(-1, len(FIELDS))
+        self.previous = np.array(previous, dtype=np.float64).reshape(-1, len(FIELDS))
+
+    def __contains__(self, symbol):
+        return symbol in self.positions
+
+    def value(self, symbol, field='Close'):
+        if symbol not in self.positions:
+            return None
+        return float(self.current[self.positions[symbol], FIELDS.index(field)])
+
+
+class _Group:
+    """All pending rules sharing one template"""
+
+    def __init__(self, template):
+        self.evaluate = compile_template(template)
+        self.columns = {name: FIELDS.index(name) for name in template_fields(template)}
+        self.ids, self.symbols, self.params = [], [], []
+        self.arrays = None
+
+    def add(self, alert_id, symbol, params):
+        self.ids.append(alert_id)
+        self.symbols.append(symbol)
+        self.params.append(params)
+        self.arrays = None
+
+    def remove(self, alert_id):
+        i = self.ids.index(alert_id)
+        for values in (self.ids, self.symbols, self.params):
+            del values[i]
+        self.arrays = None
+
+    def _build(self):
+        unique, owner = np.unique(np.array(self.symbols, dtype=object), return_inverse=True)
+        params = np.array(self.params, dtype=np.float64).reshape(len(self.ids), -1)
+        self.arrays = (list(unique), owner, params, np.array(self.ids, dtype=object))
+
+    def triggered(self, snapshot):
+        if self.arrays is None:
+            self._build()
+        unique, owner, params, ids = self.arrays
+        if len(snapshot.current) == 0:
+            return []
+        # One lookup per distinct symbol; every rule then gathers its row by index
+        positions = np.array([snapshot.positions.get(s, -1) for s in unique], dtype=np.intp)
+        rows = positions[owner]
+        known = rows >= 0
+        rows = np.where(known, rows, 0)
+        current = {name: snapshot.current[rows, col] for name, col in self.columns.items()}
+        previous = {name: snapshot.previous[rows, col] for name, col in self.columns.items()}
+        with np.errstate(invalid='ignore'):
+            value, value_known = self.evaluate(current, previous, params)
+        # Rules that depend on missing data never trigger
+        hit = value & value_known & known
+        return ids[hit].tolist()
+
+
+class RuleBook:
+    """Pending rule alerts grouped by template for vectorized evaluation"""
+
+    def __init__(self):
+        self.groups = {}
+        self.locations = {}
+
+    def __len__(self):
+        return len(self.locations)
+
+    def __contains__(self, alert_id):
+        return alert_id in self.locations
+
+    def symbols(self):
+        """Symbols that still have pending rules"""
+        return list(dict.fromkeys(symbol for symbol, _ in self.locations.values()))
+
+    def add(self, alert_id, symbol, expression):
+        template, params = parse(expression)
+        if alert_id in self.locations:
+            self.remove(alert_id)
+        if template not in self.groups:
+            self.groups[template] = _Group(template)
+        self.groups[template].add(alert_id, symbol, params)
+        self.locations[alert_id] = (symbol, template)
+
+    def remove(self, alert_id):
+        location = self.locations.pop(alert_id, None)
+        if location is None:
+            return
+        group = self.groups[location[1]]
+        group.remove(alert_id)
+        if not group.ids:
+            del self.groups[location[1]]
+
+    def triggered(self, snapshot):
+        """Ids of every pending rule that holds on ``snapshot``"""
+        hits = []
+        for group in self.groups.values():
+            hits.extend(group.triggered(snapshot))
+        return hits
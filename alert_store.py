@@ -0,0 +1,197 @@
+# alert_store.py
+import os
+import json
+import sqlite3
+import threading
+from config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    triggered INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_alerts_source ON alerts (source, triggered);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS alert_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_id INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS alerts_inserted AFTER INSERT ON alerts BEGIN
+    INSERT INTO alert_changes (alert_id) VALUES (NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS alerts_updated AFTER UPDATE ON alerts BEGIN
+    INSERT INTO alert_changes (alert_id) VALUES (NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS alerts_deleted AFTER DELETE ON alerts BEGIN
+    INSERT INTO alert_changes (alert_id) VALUES (OLD.id);
+END;
+CREATE TRIGGER IF NOT EXISTS alert_changes_pruned AFTER INSERT ON alert_changes BEGIN
+    DELETE FROM alert_changes WHERE seq <= NEW.seq - 100000;
+END;
+"""
+
+
+class AlertStore:
+    """SQLite-backed alert storage shared by FinancialBot and AlertSystem.
+
+    Each write touches only the affected rows, so its cost does not depend
+    on how many alerts exist. WAL mode lets several Streamlit sessions and a
+    background checker read and write concurrently, and AUTOINCREMENT ids
+    are never reused after a removal. ``source`` separates the alert formats
+    of the two classes ('bot' and 'system').
+
+    Every insert, update and delete is also appended to ``alert_changes``
+    (by SQLite triggers, so all writers are covered), which lets readers
+    pick up other processes' edits with ``changes`` instead of reloading
+    the whole table. The log keeps the last 100,000 changes.
+    """
+
+    def __init__(self, path=None, legacy_json=None):
+        self.path = path or Config.ALERTS_DB
+        self.local = threading.local()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+        self._migrate_json(legacy_json or Config.ALERTS_JSON)
+
+    def _connect(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+        return conn
+
+    @staticmethod
+    def _payload(alert):
+        data = {k: v for k, v in alert.items() if k != 'id'}
+        return json.dumps(data, default=float)
+
+    @staticmethod
+    def _row_to_alert(row):
+        alert_id, data = row
+        alert = {'id': alert_id}
+        alert.update(json.loads(data))
+        return alert
+
+    def _migrate_json(self, json_path):
+        """Import the legacy alerts.json once, keeping its ids where they are unique"""
+        if not json_path or not os.path.exists(json_path):
+            return
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return
+            try:
+                with open(json_path, 'r') as f:
+                    legacy = json.load(f)
+            except (OSError, ValueError) as e:
+                # Not marked as migrated, so the import is retried next time
+                print(f"Error reading {json_path}: {e}")
+                return
+            taken = {row[0] for row in conn.execute('SELECT id FROM alerts')}
+            keep, renumber = [], []
+            for alert in legacy:
+                # The old store numbered alerts len(alerts)+1, so ids can repeat
+                if alert.get('id') in taken or alert.get('id') is None:
+                    renumber.append(alert)
+                else:
+                    taken.add(alert['id'])
+                    keep.append(alert)
+            conn.executemany(
+                'INSERT INTO alerts (id, source, symbol, triggered, data) VALUES (?, ?, ?, ?, ?)',
+                [(a['id'], self._legacy_source(a), a['symbol'], int(bool(a.get('triggered'))),
+                  self._payload(a)) for a in keep]
+            )
+            # Duplicates get fresh ids after all the kept ones
+            conn.executemany(
+                'INSERT INTO alerts (source, symbol, triggered, data) VALUES (?, ?, ?, ?)',
+                [(self._legacy_source(a), a['symbol'], int(bool(a.get('triggered'))),
+                  self._payload(a)) for a in renumber]
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (json_path,))
+
+    @staticmethod
+    def _legacy_source(alert):
+        return 'system' if 'target_price' in alert else 'bot'
+
+    def load(self, source, pending_only=False):
+        """All alerts for a source (only untriggered ones with ``pending_only``), oldest first"""
+        query = 'SELECT id, data FROM alerts WHERE source = ?'
+        if pending_only:
+            query += ' AND triggered = 0'
+        rows = self._connect().execute(query + ' ORDER BY id', (source,)).fetchall()
+        return [self._row_to_alert(row) for row in rows]
+
+    def last_change(self):
+        """Sequence number of the newest change; pass it to ``changes`` later"""
+        row = self._connect().execute('SELECT MAX(seq) FROM alert_changes').fetchone()
+        return row[0] or 0
+
+    def changes(self, source, since):
+        """Alerts changed after sequence ``since``: ``(seq, alerts, removed_ids)``.
+
+        ``alerts`` are the current rows of changed alerts for ``source`` and
+        ``removed_ids`` the changed ids that no longer exist. Returns None if
+        the log no longer reaches back to ``since``; reload everything then.
+        """
+        conn = self._connect()
+        first, last = conn.execute('SELECT MIN(seq), MAX(seq) FROM alert_changes').fetchone()
+        last = last or 0
+        if last < since or (first is not None and first > since + 1):
+            return None
+        ids = [row[0] for row in conn.execute(
+            'SELECT DISTINCT alert_id FROM alert_changes WHERE seq > ? AND seq <= ?', (since, last))]
+        alerts, found = [], set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = conn.execute(
+                f"SELECT id, source, data FROM alerts WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk).fetchall()
+            for alert_id, row_source, data in rows:
+                found.add(alert_id)
+                if row_source == source:
+                    alerts.append(self._row_to_alert((alert_id, data)))
+        alerts.sort(key=lambda a: a['id'])
+        return last, alerts, [i for i in ids if i not in found]
+
+    def add(self, source, alert):
+        """Insert an alert, assign its id and return it"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT INTO alerts (source, symbol, triggered, data) VALUES (?, ?, ?, ?)',
+                (source, alert['symbol'], int(bool(alert.get('triggered'))), self._payload(alert))
+            )
+        alert['id'] = cursor.lastrowid
+        return alert
+
+    def add_many(self, source, alerts):
+        """Insert many alerts in one transaction and assign their ids"""
+        with self._connect() as conn:
+            for alert in alerts:
+                cursor = conn.execute(
+                    'INSERT INTO alerts (source, symbol, triggered, data) VALUES (?, ?, ?, ?)',
+                    (source, alert['symbol'], int(bool(alert.get('triggered'))), self._payload(alert))
+                )
+                alert['id'] = cursor.lastrowid
+        return alerts
+
+    def update(self, alert):
+        """Rewrite a single alert row"""
+        self.update_many([alert])
+
+    def update_many(self, alerts):
+        with self._connect() as conn:
+            conn.executemany(
+                'UPDATE alerts SET triggered = ?, data = ? WHERE id = ?',
+                [(int(bool(a.get('triggered'))), self._payload(a), a['id']) for a in alerts]
+            )
+
+    def remove(self, alert_id):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM alerts WHERE id = ?', (alert_id,))
@@ -1,63 +1,120 @@
 # alerts.py
-import json
-import schedule
-import time
 from datetime import datetime
-import threading
+from alert_index import AlertIndex
+from alert_store import AlertStore
+from alert_daemon import AlertDaemon
 
 class AlertSystem:
-    def __init__(self):
+    def __init__(self, store=None):
+        self.store = store or AlertStore()
+        self.change_seq = 0
         self.alerts = []
         self.running = False
+        self.daemon = None
+        self.build_index()
+    
+    def build_index(self):
+        """Rebuild the threshold index from the current alerts"""
+        self.index = AlertIndex(inclusive=True)
+        self.alerts_by_id = {a['id']: a for a in self.alerts}
+        for alert in self.alerts:
+            self._index_alert(alert)
+    
+    def _index_alert(self, alert):
+        if not alert['triggered'] and alert['condition'] in ('above', 'below'):
+            self.index.add(alert['id'], alert['symbol'], alert['condition'], alert['target_price'])
         
     def create_price_alert(self, symbol, target_price, condition='above'):
         """Create a new price alert"""
         alert = {
-            'id': len(self.alerts) + 1,
             'symbol': symbol,
             'target_price': target_price,
             'condition': condition,
             'created': datetime.now().isoformat(),
             'triggered': False
         }
+        self.store.add('system', alert)
         self.alerts.append(alert)
-        self.save_alerts()
+        self.alerts_by_id[alert['id']] = alert
+        self._index_alert(alert)
         return alert
     
     def check_alerts(self, symbol, current_price):
         """Check if any alerts should be triggered"""
         triggered = []
-        for alert in self.alerts:
-            if alert['symbol'] == symbol and not alert['triggered']:
-                if alert['condition'] == 'above' and current_price >= alert['target_price']:
-                    alert['triggered'] = True
-                    alert['triggered_at'] = datetime.now().isoformat()
-                    alert['actual_price'] = current_price
-                    triggered.append(alert)
-                elif alert['condition'] == 'below' and current_price <= alert['target_price']:
-                    alert['triggered'] = True
-                    alert['triggered_at'] = datetime.now().isoformat()
-                    alert['actual_price'] = current_price
-                    triggered.append(alert)
+        for alert_id in sorted(self.index.triggered(symbol, current_price)):
+            alert = self.alerts_by_id[alert_id]
+            alert['triggered'] = True
+            alert['triggered_at'] = datetime.now().isoformat()
+            alert['actual_price'] = current_price
+            self.index.remove(alert_id)
+            triggered.append(alert)
         
         if triggered:
-            self.save_alerts()
+            self.save_alerts(triggered)
             self.send_notifications(triggered)
         
         return triggered
     
-    def save_alerts(self):
-        """Save alerts to JSON file"""
-        with open('alerts.json', 'w') as f:
-            json.dump(self.alerts, f, indent=2)
+    def save_alerts(self, alerts=None):
+        """Persist the given alerts (all alerts by default)"""
+        self.store.update_many(self.alerts if alerts is None else alerts)
     
     def load_alerts(self):
-        """Load alerts from JSON file"""
-        try:
-            with open('alerts.json', 'r') as f:
-                self.alerts = json.load(f)
-        except FileNotFoundError:
-            self.alerts = []
+        """Load alerts from the alert store"""
+        self.change_seq = self.store.last_change()
+        self.alerts = self.store.load('system')
+        self.build_index()
+    
+    def remove_alert(self, alert_id):
+        """Remove an alert by ID"""
+        self.alerts = [a for a in self.alerts if a['id'] != alert_id]
+        self.alerts_by_id.pop(alert_id, None)
+        self.index.remove(alert_id)
+        self.store.remove(alert_id)
+    
+    def reload_alerts(self):
+        """Apply alerts added, changed or removed by other sessions or processes"""
+        changes = self.store.changes('system', self.change_seq)
+        if changes is None:
+            self.load_alerts()
+            return
+        self.change_seq, changed, removed = changes
+        if not changed and not removed:
+            return
+        for alert_id in removed:
+            self.index.remove(alert_id)
+            self.alerts_by_id.pop(alert_id, None)
+        for alert in changed:
+            self.index.remove(alert['id'])
+            self.alerts_by_id[alert['id']] = alert
+            self._index_alert(alert)
+        self.alerts = list(self.alerts_by_id.values())
+    
+    def pending_symbols(self):
+        """Distinct symbols with untriggered alerts"""
+        return self.index.symbols()
+    
+    def check_snapshot(self, snapshot):
+        """Check every pending symbol against a quote snapshot"""
+        triggered = []
+        for symbol in self.pending_symbols():
+            price = snapshot.price(symbol)
+            if price is not None:
+                triggered.extend(self.check_alerts(symbol, price))
+        return triggered
+    
+    def start_monitoring(self, interval=None):
+        """Check alerts in the background until stop_monitoring is called"""
+        if self.daemon is None:
+            self.daemon = AlertDaemon([self], interval=interval)
+        self.daemon.start()
+        self.running = True
+    
+    def stop_monitoring(self):
+        if self.daemon is not None:
+            self.daemon.stop()
+        self.running = False
     
     def send_notifications(self, triggered_alerts):
         """Send notifications for triggered alerts"""
@@ -0,0 +1,129 @@
+# analysis.py
+"""Quick Analysis computations on bars that are already loaded.
+
+Everything works on NumPy arrays taken from the frame once, so multi-year
+daily or intraday series take milliseconds and nothing is downloaded again.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from price_store import PERIOD_OFFSETS
+import metrics
+
+
+def last_period(df, period='1mo'):
+    """Trailing slice of ``df`` covering ``period`` (a yfinance period string)"""
+    if df.empty:
+        return df
+    return df.loc[df.index >= df.index[-1] - PERIOD_OFFSETS[period]]
+
+
+def trend(df, period='1mo'):
+    """Latest close against the average close over ``period``"""
+    recent = last_period(df, period)['Close']
+    latest, average = float(recent.iloc[-1]), float(recent.mean())
+    return {'latest_close': latest, 'average_close': average, 'bullish': latest > average}
+
+
+def volatility(df, period='1mo'):
+    """Standard deviation of closes and of daily returns over ``period``"""
+    close = last_period(df, period)['Close'].to_numpy(dtype=float)
+    returns = close[1:] / close[:-1] - 1
+    return {'close_std': float(close.std(ddof=1)) if len(close) > 1 else 0.0,
+            'return_std_pct': float(returns.std(ddof=1) * 100) if len(returns) > 1 else 0.0}
+
+
+def pivots(high, low, window=5):
+    """Positions of pivot highs and lows.
+
+    A pivot high is a bar whose high is the maximum of the ``window`` bars on
+    either side of it (and likewise for lows), found with one sliding-window
+    max/min over the whole series.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    span = 2 * window + 1
+    if len(high) < span:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    centre = slice(window, len(high) - window)
+    pivot_highs = np.flatnonzero(high[centre] >= sliding_window_view(high, span).max(axis=1))
+    pivot_lows = np.flatnonzero(low[centre] <= sliding_window_view(low, span).min(axis=1))
+    return pivot_highs + window, pivot_lows + window
+
+
+def cluster_levels(prices, positions, tolerance=0.01):
+    """Group nearby pivot prices into levels.
+
+    Sorted prices start a new level wherever the gap to the previous price
+    exceeds ``tolerance`` (relative). Returns arrays (level price, touches,
+    last position).
+    """
+    if len(prices) == 0:
+        return np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    order = np.argsort(prices, kind='stable')
+    sorted_prices = prices[order]
+    breaks = np.diff(sorted_prices) > tolerance * sorted_prices[:-1]
+    starts = np.flatnonzero(np.concatenate([[True], breaks]))
+    group = np.cumsum(np.concatenate([[0], breaks]))
+    touches = np.bincount(group)
+    levels = np.bincount(group, weights=sorted_prices) / touches
+    last = np.maximum.reduceat(positions[order], starts)
+    return levels, touches, last
+
+
+@metrics.timed('support_resistance')
+def support_resistance(df, window=5, tolerance=0.01, max_levels=5):
+    """Support and resistance levels from clustered pivot highs and lows.
+
+    Levels below the latest close are support, levels above are resistance.
+    Each side is ordered by number of touches (then recency) and truncated to
+    ``max_levels``.
+    """
+    high = df['High'].to_numpy(dtype=float)
+    low = df['Low'].to_numpy(dtype=float)
+    current = float(df['Close'].iloc[-1])
+    pivot_highs, pivot_lows = pivots(high, low, window)
+    prices = np.concatenate([high[pivot_highs], low[pivot_lows]])
+    positions = np.concatenate([pivot_highs, pivot_lows])
+    levels, touches, last = cluster_levels(prices, positions, tolerance)
+
+    def side(mask):
+        idx = np.flatnonzero(mask)
+        idx = idx[np.lexsort((-last[idx], -touches[idx]))][:max_levels]
+        return [{'price': float(levels[i]), 'touches': int(touches[i]),
+                 'last_touch': df.index[last[i]],
+                 'distance_pct': float((levels[i] - current) / current * 100)} for i in idx]
+
+    return {'current_price': current,
+            'support': side(levels < current),
+            'resistance': side(levels >= current)}
+
+
+@metrics.timed('volume_profile')
+def volume_profile(df, bins=24, value_area=0.7):
+    """Volume traded at each price band (volume-by-price).
+
+    Each bar's volume is assigned to the band of its typical price
+    (high + low + close) / 3. Also returns the point of control (band with
+    the most volume) and the value area, the price range of the busiest bands
+    holding ``value_area`` of the total volume.
+    """
+    typical = (df['High'].to_numpy(dtype=float) + df['Low'].to_numpy(dtype=float)
+               + df['Close'].to_numpy(dtype=float)) / 3
+    volume = df['Volume'].to_numpy(dtype=float)
+    counts, edges = np.histogram(typical, bins=bins, weights=volume)
+    centres = (edges[:-1] + edges[1:]) / 2
+
+    busiest = np.argsort(counts)[::-1]
+    total = counts.sum()
+    covered = np.cumsum(counts[busiest])
+    n_value = int(np.searchsorted(covered, value_area * total)) + 1 if total else len(counts)
+    in_value = busiest[:n_value]
+    return {
+        'price': centres,
+        'volume': counts,
+        'edges': edges,
+        'poc': float(centres[busiest[0]]),
+        'value_area_low': float(edges[in_value.min()]),
+        'value_area_high': float(edges[in_value.max() + 1]),
+    }
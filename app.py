@@ -1,14 +1,22 @@
 # app.py
 import streamlit as st
+import os
+import json
+import threading
+import time
+import html
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
-import yfinance as yf
-import base64
 from stock_predictor import StockPredictor
 from financial_bot import FinancialBot
 from config import Config
+from model_registry import ModelRegistry
+from alert_daemon import AlertDaemon
+from compute_worker import ComputeService
+from chart_sampling import downsample_ohlc, downsample_series
+from alert_rules import FIELDS as RULE_FIELDS
+import analysis
+import precompute
+import metrics
 
 # Page configuration
 st.set_page_config(
@@ -18,9 +26,44 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize components
-predictor = StockPredictor()
-bot = FinancialBot()
+# Initialize components (the model registry is shared across reruns and sessions)
+@st.cache_resource
+def get_model_registry():
+    return ModelRegistry()
+
+@st.cache_resource
+def get_alert_daemon():
+    """One background alert checker per server process"""
+    daemon = AlertDaemon([FinancialBot(pending_only=True)])
+    daemon.start()
+    return daemon
+
+@st.cache_resource
+def get_alert_bot():
+    """Alert book shared by all sessions, plus its lock; reloaded incrementally on each visit"""
+    return FinancialBot(), threading.Lock()
+
+@st.cache_resource
+def get_compute_service():
+    """Worker processes for slow jobs, shared by all sessions"""
+    return ComputeService()
+
+@st.cache_resource(ttl=600)
+def get_precomputed():
+    """Newest nightly artifact (None if missing or too old); re-read every 10 minutes"""
+    return precompute.load_latest()
+
+@st.cache_resource
+def get_metrics_exporter():
+    """Prometheus endpoint / JSON dump of this process's metrics, if configured"""
+    return metrics.start_exporter(port=Config.METRICS_PORT, json_path=Config.METRICS_JSON,
+                                  interval=Config.METRICS_EXPORT_INTERVAL)
+
+predictor = StockPredictor(registry=get_model_registry())
+compute = get_compute_service()
+if Config.ALERT_DAEMON_ENABLED:
+    get_alert_daemon()
+get_metrics_exporter()
 
 # Custom CSS
 st.markdown("""
@@ -48,12 +91,12 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def create_download_link(df, filename):
-    """Generate a download link for DataFrame"""
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">Download CSV File</a>'
-    return href
+@st.fragment(run_every=2)
+def wait_for_job(job_id, message):
+    """Poll a background job and rerun the page once it has finished"""
+    if compute.status(job_id) not in ('pending', 'running'):
+        st.rerun()
+    st.info(f"⏳ {message}")
 
 def main():
     # App title with Seasons font
@@ -113,23 +156,32 @@ def main():
     if 'active_tab' not in st.session_state:
         st.session_state.active_tab = "Market Overview"
     
-    # Fetch data
-    @st.cache_data(ttl=3600)  # Cache for 1 hour
-    def get_stock_data(symbol, period):
-        return predictor.fetch_data(symbol, period)
-    
-    df = get_stock_data(symbol, period)
+    # Bars are fetched by a worker so a cold price store never blocks the rerun;
+    # while a refresh is pending the session keeps the last frame it was shown
+    job_id, status, df = compute.get('history', symbol, period)
+    if df is not None:
+        st.session_state.bars = ((symbol, period), df)
+    elif st.session_state.get('bars', (None, None))[0] == (symbol, period):
+        df = st.session_state.bars[1]
+    elif status not in ('pending', 'running'):
+        df = pd.DataFrame()  # fetch failed: the tabs show their no-data state
     
     # Main content area
-    if st.session_state.active_tab == "Market Overview":
-        display_market_overview(symbol, df, selected_stock)
+    if df is None and st.session_state.active_tab in ("Market Overview", "Financial Bot"):
+        wait_for_job(job_id, "Loading price history...")
+    elif st.session_state.active_tab == "Market Overview":
+        display_market_overview(symbol, df, selected_stock, period)
     elif st.session_state.active_tab == "Predictions":
         display_predictions(symbol, prediction_days, selected_stock)
     elif st.session_state.active_tab == "Financial Bot":
-        display_financial_bot(symbol)
+        display_financial_bot(symbol, df)
     elif st.session_state.active_tab == "Alert System":
         display_alert_system(symbol)
     
+    # Hidden diagnostics panel, opened with ?diagnostics=1
+    if st.query_params.get('diagnostics') == '1':
+        display_diagnostics()
+    
     # Footer
     st.markdown("---")
     st.markdown(
@@ -142,7 +194,68 @@ def main():
         unsafe_allow_html=True
     )
 
-def display_market_overview(symbol, df, selected_stock):
+def display_diagnostics():
+    """Latency percentiles, cache hit ratios and raw counters of this server process"""
+    st.markdown("---")
+    st.subheader("🩺 Diagnostics")
+    
+    st.markdown("**Latency by operation (ms)**")
+    st.dataframe(metrics.REGISTRY.latency_table(), use_container_width=True, hide_index=True)
+    
+    st.markdown("**Cache hit ratios**")
+    st.dataframe([{'cache': cache, **results} for cache, results
+                  in sorted(metrics.REGISTRY.cache_ratios().items())],
+                 use_container_width=True, hide_index=True)
+    
+    snapshot = metrics.REGISTRY.snapshot()
+    st.markdown("**Counters**")
+    st.dataframe([{'name': c['name'], 'labels': json.dumps(c['labels']), 'value': c['value']}
+                  for c in sorted(snapshot['counters'], key=lambda c: c['name'])],
+                 use_container_width=True, hide_index=True)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("Download JSON", json.dumps(snapshot),
+                           file_name="aurex_metrics.json", mime="application/json")
+    with col2:
+        st.download_button("Download Prometheus", metrics.REGISTRY.to_prometheus(),
+                           file_name="aurex_metrics.prom", mime="text/plain")
+    with col3:
+        if st.button("Reset metrics"):
+            metrics.REGISTRY.reset()
+            st.rerun()
+
+def display_export(symbol, period):
+    """Export form; the file is written by a worker and downloaded as a static file"""
+    st.markdown("### 💾 Export Data")
+    export_symbols = st.multiselect("Symbols", options=list(Config.POPULAR_STOCKS.values()),
+                                    default=[symbol])
+    fmt = st.selectbox("Format", ["csv", "parquet", "arrow"])
+    indicators = st.checkbox("Include technical indicators", value=True)
+    if st.button("Prepare Export") and export_symbols:
+        st.session_state.export_request = (tuple(export_symbols), fmt, period, indicators)
+        st.session_state.pop('export_file', None)
+    
+    # The request is dropped once the job finishes, so a rerun after the job
+    # result expires does not write the export again
+    request = st.session_state.get('export_request')
+    if request:
+        job_id, status, filename = compute.get('export', *request)
+        if status in ('pending', 'running'):
+            wait_for_job(job_id, "Writing export...")
+            return
+        del st.session_state.export_request
+        if not filename:
+            st.error("Export failed. Please try again.")
+            return
+        st.session_state.export_file = filename
+    
+    filename = st.session_state.get('export_file')
+    if filename and os.path.exists(os.path.join(Config.EXPORT_DIR, filename)):
+        st.markdown(f'<a href="{Config.EXPORT_URL}/{filename}" download="{filename}">'
+                    f'Download {filename}</a>', unsafe_allow_html=True)
+
+def display_market_overview(symbol, df, selected_stock, period):
     """Display market overview tab"""
     col1, col2 = st.columns([2, 1])
     
@@ -150,32 +263,40 @@ def display_market_overview(symbol, df, selected_stock):
         st.subheader(f"📊 {selected_stock} ({symbol}) - Price Chart")
         
         if not df.empty:
+            import plotly.graph_objects as go
+            # Indicator columns (NaN during warm-up) for the overlays
+            chart_df = predictor.indicator_cache.apply(symbol, df)
+            # Bounded payload: bucketed candles plus LTTB-sampled overlay lines
+            candles = downsample_ohlc(chart_df, Config.CHART_MAX_POINTS)
+            
             # Create interactive chart
             fig = go.Figure()
             
             # Candlestick chart
             fig.add_trace(go.Candlestick(
-                x=df.index,
-                open=df['Open'],
-                high=df['High'],
-                low=df['Low'],
-                close=df['Close'],
+                x=candles.index,
+                open=candles['Open'],
+                high=candles['High'],
+                low=candles['Low'],
+                close=candles['Close'],
                 name='Price'
             ))
             
             # Add moving averages
-            if 'SMA_20' in df.columns:
+            if 'SMA_20' in chart_df.columns:
+                sma_20 = downsample_series(chart_df['SMA_20'], Config.CHART_MAX_POINTS)
                 fig.add_trace(go.Scatter(
-                    x=df.index,
-                    y=df['SMA_20'],
+                    x=sma_20.index,
+                    y=sma_20,
                     line=dict(color='orange', width=1),
                     name='SMA 20'
                 ))
             
-            if 'SMA_50' in df.columns:
+            if 'SMA_50' in chart_df.columns:
+                sma_50 = downsample_series(chart_df['SMA_50'], Config.CHART_MAX_POINTS)
                 fig.add_trace(go.Scatter(
-                    x=df.index,
-                    y=df['SMA_50'],
+                    x=sma_50.index,
+                    y=sma_50,
                     line=dict(color='blue', width=1),
                     name='SMA 50'
                 ))
@@ -216,16 +337,12 @@ def display_market_overview(symbol, df, selected_stock):
                 st.metric("Low", f"${df['Low'].iloc[-1]:.2f}")
                 st.metric("Volume", f"{df['Volume'].iloc[-1]:,}")
             
-            # Download button
-            st.markdown("### 💾 Export Data")
-            if st.button("Download CSV"):
-                st.markdown(create_download_link(df, f"{symbol}_data.csv"), 
-                           unsafe_allow_html=True)
+            display_export(symbol, period)
             
             # Technical indicators
             st.markdown("### 📊 Technical Indicators")
             if len(df) > 20:
-                df_with_indicators = predictor.add_technical_indicators(df.copy())
+                df_with_indicators = predictor.add_technical_indicators(df.copy(), symbol)
                 
                 rsi = df_with_indicators['RSI'].iloc[-1]
                 rsi_status = "🔴 Overbought" if rsi > 70 else "🟢 Oversold" if rsi < 30 else "⚪ Neutral"
@@ -242,9 +359,19 @@ def display_predictions(symbol, days_ahead, selected_stock):
     """Display predictions tab"""
     st.subheader(f"🔮 Price Predictions for {selected_stock}")
     
-    with st.spinner("Training model and making predictions..."):
-        prediction = predictor.predict(symbol, days_ahead)
+    # One fit covers every slider position; the nightly artifact is used when it
+    # has the symbol, otherwise training runs in a worker process
+    precomputed = get_precomputed()
+    forecast = precomputed.forecast(symbol, 30) if precomputed else None
+    if forecast is None:
+        job_id, status, forecast = compute.get('predict_horizons', symbol, 30)
+        if status in ('pending', 'running'):
+            wait_for_job(job_id, "Training model and making predictions...")
+            return
+    else:
+        st.caption(f"Precomputed forecast from {precomputed.created:%Y-%m-%d %H:%M}")
     
+    prediction = forecast['predictions'][days_ahead - 1] if forecast else None
     if prediction:
         col1, col2, col3 = st.columns(3)
         
@@ -271,6 +398,7 @@ def display_predictions(symbol, days_ahead, selected_stock):
             )
         
         # Visual representation
+        import plotly.graph_objects as go
         fig = go.Figure()
         
         # Current price
@@ -289,6 +417,27 @@ def display_predictions(symbol, days_ahead, selected_stock):
         
         st.plotly_chart(fig, use_container_width=True)
         
+        # Forecast curve across all horizons
+        curve = forecast['predictions']
+        curve_fig = go.Figure()
+        curve_fig.add_trace(go.Scatter(
+            x=[p['prediction_date'] for p in curve],
+            y=[p['predicted_price'] for p in curve],
+            mode='lines+markers',
+            line=dict(color='purple', width=2),
+            name='Predicted Price'
+        ))
+        curve_fig.add_hline(y=prediction['current_price'], line_dash='dash',
+                            annotation_text='Current Price')
+        curve_fig.update_layout(
+            title='1-30 Day Forecast',
+            yaxis_title='Price ($)',
+            xaxis_title='Date',
+            template='plotly_white',
+            height=350
+        )
+        st.plotly_chart(curve_fig, use_container_width=True)
+        
         # Model information
         with st.expander("📋 Model Details"):
             st.write(f"**Last Training Date:** {prediction['training_info']['last_training_date']}")
@@ -308,7 +457,7 @@ def display_predictions(symbol, days_ahead, selected_stock):
     else:
         st.error("Could not generate predictions. Please try with a different stock or time period.")
 
-def display_financial_bot(symbol):
+def display_financial_bot(symbol, df):
     """Display financial bot tab"""
     st.subheader("🤖 Financial Bot Assistant")
     
@@ -318,10 +467,17 @@ def display_financial_bot(symbol):
         st.markdown("### 💬 Market Summary")
         
         # Get market summary
-        with st.spinner("Fetching market data..."):
-            summary = bot.get_market_summary(['^GSPC', 'AAPL', 'MSFT', 'GOOGL', 'AMZN'])
+        summary_symbols = ('^GSPC', 'AAPL', 'MSFT', 'GOOGL', 'AMZN')
+        job_id, status, summary = compute.get('market_summary', summary_symbols)
+        if status in ('pending', 'running'):
+            wait_for_job(job_id, "Fetching market data...")
+            # Show the precomputed prices until the live ones arrive
+            precomputed = get_precomputed()
+            if precomputed and precomputed.summary(summary_symbols):
+                summary = precomputed.summary(summary_symbols)
+                st.caption(f"Prices as of {precomputed.created:%Y-%m-%d %H:%M}")
         
-        for stock in summary:
+        for stock in summary or []:
             change_color = "positive" if stock['change'] >= 0 else "negative"
             st.markdown(f"""
             <div class="card">
@@ -340,31 +496,56 @@ def display_financial_bot(symbol):
         )
         
         if st.button("Run Analysis"):
-            with st.spinner("Analyzing..."):
-                # Simple analysis logic
-                stock_data = predictor.fetch_data(symbol, '1mo')
-                
-                if not stock_data.empty:
-                    latest_close = stock_data['Close'].iloc[-1]
-                    avg_close = stock_data['Close'].mean()
-                    
-                    if analysis_type == "Trend Analysis":
-                        trend = "🟢 Bullish" if latest_close > avg_close else "🔴 Bearish"
-                        st.success(f"**Trend:** {trend}")
-                        st.write(f"Current Price: ${latest_close:.2f}")
-                        st.write(f"30-day Average: ${avg_close:.2f}")
-                    
-                    elif analysis_type == "Volatility Check":
-                        volatility = stock_data['Close'].std()
-                        st.info(f"**30-day Volatility:** ${volatility:.2f}")
-                        st.write("Higher volatility indicates greater risk")
-                    
-                    st.write("---")
-                    st.write("**Recommendation:** Consider consulting multiple analysis tools before making investment decisions.")
+            st.session_state.analysis_request = (symbol, analysis_type)
+        
+        # Runs on the bars already loaded for the page, no extra download
+        if st.session_state.get('analysis_request') == (symbol, analysis_type) and not df.empty:
+            if analysis_type == "Trend Analysis":
+                result = analysis.trend(df)
+                trend = "🟢 Bullish" if result['bullish'] else "🔴 Bearish"
+                st.success(f"**Trend:** {trend}")
+                st.write(f"Current Price: ${result['latest_close']:.2f}")
+                st.write(f"30-day Average: ${result['average_close']:.2f}")
+            
+            elif analysis_type == "Volatility Check":
+                result = analysis.volatility(df)
+                st.info(f"**30-day Volatility:** ${result['close_std']:.2f}")
+                st.write(f"Daily return volatility: {result['return_std_pct']:.2f}%")
+                st.write("Higher volatility indicates greater risk")
+            
+            elif analysis_type == "Support/Resistance":
+                levels = analysis.support_resistance(df)
+                st.write(f"Current Price: ${levels['current_price']:.2f}")
+                for label, side in (("🟥 Resistance", 'resistance'), ("🟩 Support", 'support')):
+                    st.markdown(f"**{label}**")
+                    if not levels[side]:
+                        st.write("No level found in this period")
+                    for level in levels[side]:
+                        st.write(f"${level['price']:.2f} ({level['distance_pct']:+.1f}%) · "
+                                 f"{level['touches']} touches, last {level['last_touch']:%Y-%m-%d}")
+            
+            elif analysis_type == "Volume Analysis":
+                import plotly.graph_objects as go
+                profile = analysis.volume_profile(df)
+                st.write(f"**Point of Control:** ${profile['poc']:.2f}")
+                st.write(f"**Value Area (70%):** ${profile['value_area_low']:.2f} - "
+                         f"${profile['value_area_high']:.2f}")
+                fig = go.Figure(go.Bar(x=profile['volume'], y=profile['price'], orientation='h',
+                                       marker_color='#8e44ad', name='Volume'))
+                fig.add_hline(y=profile['poc'], line_dash='dash', line_color='orange')
+                fig.update_layout(height=350, xaxis_title="Volume", yaxis_title="Price ($)",
+                                  margin=dict(l=10, r=10, t=10, b=10))
+                st.plotly_chart(fig, use_container_width=True)
+            
+            st.write("---")
+            st.write("**Recommendation:** Consider consulting multiple analysis tools before making investment decisions.")
 
 def display_alert_system(symbol):
     """Display alert system tab"""
     st.subheader("🚨 Price Alert System")
+    bot, bot_lock = get_alert_bot()
+    with bot_lock:
+        bot.reload_alerts()
     
     tab1, tab2 = st.tabs(["Create Alert", "Active Alerts"])
     
@@ -382,7 +563,7 @@ def display_alert_system(symbol):
             
             alert_type = st.selectbox(
                 "Alert Type",
-                options=["price_above", "price_below", "percent_change"]
+                options=["price_above", "price_below", "percent_change", "rule"]
             )
         
         with col2:
@@ -394,6 +575,14 @@ def display_alert_system(symbol):
                     step=0.01
                 )
                 condition = None
+            elif alert_type == "rule":
+                threshold = None
+                condition = st.text_input(
+                    "Rule",
+                    value="RSI < 30 and Close crosses_above SMA_50",
+                    help="Compare fields with < <= > >= == != crosses_above crosses_below, "
+                         "combine with and / or / not. Fields: " + ", ".join(RULE_FIELDS)
+                )
             else:
                 threshold = st.number_input(
                     "Percentage Change (%)",
@@ -407,15 +596,31 @@ def display_alert_system(symbol):
                 )
         
         if st.button("➕ Add Alert", type="primary"):
-            alert = bot.add_alert(alert_symbol, alert_type, threshold, condition)
-            st.success(f"✅ Alert created for {alert_symbol} (ID: {alert['id']})")
+            try:
+                with bot_lock:
+                    alert = bot.add_alert(alert_symbol, alert_type, threshold, condition)
+                st.success(f"✅ Alert created for {alert_symbol} (ID: {alert['id']})")
+            except ValueError as e:
+                st.error(f"Invalid rule: {e}")
     
     with tab2:
         st.markdown("### Active Alerts")
+        if Config.ALERT_DAEMON_ENABLED:
+            st.caption(f"Alerts are checked automatically every {Config.ALERT_CHECK_INTERVAL} seconds.")
         
-        # Check for triggered alerts
+        # Check for triggered alerts in a worker; clicks within one check interval share a job
         if st.button("🔍 Check Alerts"):
-            triggered = bot.check_alerts()
+            st.session_state.alert_check = int(time.time() // Config.ALERT_CHECK_INTERVAL)
+        
+        window = st.session_state.get('alert_check')
+        if window is not None:
+            job_id, status, triggered = compute.get('check_alerts', window)
+            if status in ('pending', 'running'):
+                wait_for_job(job_id, "Checking alerts...")
+            else:
+                del st.session_state.alert_check
+                if status == 'error':
+                    st.error("Alert check failed. Please try again.")
             if triggered:
                 for alert in triggered:
                     st.error(f"""
@@ -427,7 +632,8 @@ def display_alert_system(symbol):
                     """)
         
         # Display all alerts
-        alerts = bot.alerts
+        with bot_lock:
+            alerts = list(bot.alerts)
         if alerts:
             for alert in alerts:
                 status = "✅ Triggered" if alert['triggered'] else "⏳ Active"
@@ -439,7 +645,7 @@ def display_alert_system(symbol):
                         <div>
                             <h4>{alert['symbol']}</h4>
                             <p><strong>Type:</strong> {alert['type'].replace('_', ' ').title()}</p>
-                            <p><strong>Threshold:</strong> {alert['threshold']}</p>
+                            <p><strong>{'Rule' if alert['type'] == 'rule' else 'Threshold'}:</strong> {html.escape(alert['condition']) if alert['type'] == 'rule' else alert['threshold']}</p>
                             <p><strong>Created:</strong> {alert['created']}</p>
                         </div>
                         <div style="color: {status_color}; font-weight: bold;">
@@ -451,7 +657,8 @@ def display_alert_system(symbol):
                 
                 # Remove button
                 if st.button(f"Remove Alert #{alert['id']}", key=f"remove_{alert['id']}"):
-                    bot.remove_alert(alert['id'])
+                    with bot_lock:
+                        bot.remove_alert(alert['id'])
                     st.rerun()
         else:
             st.info("No alerts set up yet. Create your first alert above!")
@@ -0,0 +1,132 @@
+# backtest.py
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+from stock_predictor import StockPredictor
+
+
+def walk_forward_splits(n_samples, n_folds=10, min_train=None, horizon=5):
+    """Expanding-window folds as (train_end, test_start, test_end) positions.
+
+    Training rows have targets up to ``horizon`` bars ahead, so each test
+    window starts ``horizon`` rows after the training window to avoid leakage.
+    """
+    min_train = min_train or n_samples // 2
+    test_size = (n_samples - min_train - horizon) // n_folds
+    if test_size < 1:
+        raise ValueError("Not enough rows for the requested number of folds")
+    splits = []
+    for fold in range(n_folds):
+        train_end = min_train + fold * test_size
+        test_start = train_end + horizon
+        test_end = n_samples if fold == n_folds - 1 else test_start + test_size
+        splits.append((train_end, test_start, test_end))
+    return splits
+
+
+def _run_fold(model, X, y, close, train_end, test_start, test_end, horizon, long_only):
+    """Fit on one training window and score the following test window"""
+    scaler = StandardScaler()
+    model = clone(model)
+    model.fit(scaler.fit_transform(X[:train_end]), y[:train_end])
+    predicted = model.predict(scaler.transform(X[test_start:test_end]))
+
+    actual = y[test_start:test_end]
+    base = close[test_start:test_end]
+    predicted_return = predicted / base - 1
+    actual_return = actual / base - 1
+    position = (predicted_return > 0).astype(float) if long_only else np.sign(predicted_return)
+    strategy = position * actual_return
+
+    # Compound only non-overlapping holding periods
+    step = slice(None, None, max(horizon, 1))
+    return {
+        'mae': float(np.mean(np.abs(predicted - actual))),
+        'hit_rate': float(np.mean(np.sign(predicted_return) == np.sign(actual_return))),
+        'strategy_return': float(np.prod(1 + strategy[step]) - 1),
+        'buy_hold_return': float(np.prod(1 + actual_return[step]) - 1),
+        'predicted': predicted,
+        'strategy': strategy,
+    }
+
+
+def backtest(features, model=None, n_folds=10, min_train=None, horizon=5,
+             n_jobs=-1, long_only=True):
+    """Walk-forward evaluation over a feature frame from ``prepare_features``.
+
+    The feature matrix is converted once and shared by all folds, which run
+    in parallel. Returns a dict with a per-fold frame, per-row predictions
+    and a summary.
+    """
+    model = model if model is not None else StockPredictor().model
+    X = features.drop(['Target'], axis=1).to_numpy(dtype=np.float32)
+    y = features['Target'].to_numpy(dtype=float)
+    close = features['Close'].to_numpy(dtype=float)
+    splits = walk_forward_splits(len(features), n_folds, min_train, horizon)
+
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(_run_fold)(model, X, y, close, train_end, test_start, test_end, horizon, long_only)
+        for train_end, test_start, test_end in splits
+    )
+
+    index = features.index
+    folds = pd.DataFrame([{
+        'fold': fold,
+        'train_end': index[train_end - 1],
+        'test_start': index[test_start],
+        'test_end': index[test_end - 1],
+        'mae': out['mae'],
+        'hit_rate': out['hit_rate'],
+        'strategy_return': out['strategy_return'],
+        'buy_hold_return': out['buy_hold_return'],
+    } for fold, ((train_end, test_start, test_end), out) in enumerate(zip(splits, outputs))])
+
+    predictions = pd.concat([
+        pd.DataFrame({'fold': fold, 'predicted': out['predicted'],
+                      'actual': y[test_start:test_end], 'strategy_return': out['strategy']},
+                     index=index[test_start:test_end])
+        for fold, ((_, test_start, test_end), out) in enumerate(zip(splits, outputs))
+    ])
+
+    return {
+        'folds': folds,
+        'predictions': predictions,
+        'summary': {
+            'folds': len(folds),
+            'mae': float(folds['mae'].mean()),
+            'hit_rate': float(folds['hit_rate'].mean()),
+            'strategy_return': float(np.prod(1 + folds['strategy_return']) - 1),
+            'buy_hold_return': float(np.prod(1 + folds['buy_hold_return']) - 1),
+        }
+    }
+
+
+def backtest_symbol(symbol, predictor=None, period='5y', horizon=5, **kwargs):
+    """Fetch, add indicators and build features once, then backtest one symbol"""
+    predictor = predictor or StockPredictor()
+    df = predictor.fetch_data(symbol, period)
+    if df.empty:
+        return None
+    df = predictor.add_technical_indicators(df, symbol)
+    features = predictor.prepare_features(df, horizon)
+    return backtest(features, model=predictor.model, horizon=horizon, **kwargs)
+
+
+def backtest_symbols(symbols, predictor=None, period='5y', horizon=5, **kwargs):
+    """Backtest many symbols; returns (per-fold frame, per-symbol summary frame)"""
+    predictor = predictor or StockPredictor()
+    folds, summaries = [], []
+    for symbol in symbols:
+        try:
+            result = backtest_symbol(symbol, predictor, period, horizon, **kwargs)
+        except Exception as e:
+            print(f"Error backtesting {symbol}: {e}")
+            continue
+        if result is None:
+            continue
+        folds.append(result['folds'].assign(symbol=symbol))
+        summaries.append(dict(result['summary'], symbol=symbol))
+    folds = pd.concat(folds, ignore_index=True) if folds else pd.DataFrame()
+    return folds, pd.DataFrame(summaries)
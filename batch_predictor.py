@@ -0,0 +1,88 @@
+# batch_predictor.py
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import pandas as pd
+from config import Config
+from stock_predictor import StockPredictor
+
+RESULT_COLUMNS = ['symbol', 'current_price', 'predicted_price', 'price_change_pct',
+                  'prediction_date', 'mae', 'confidence', 'error']
+
+# One predictor per worker process, created by the pool initializer
+_worker_predictor = None
+
+
+def _init_worker():
+    global _worker_predictor
+    _worker_predictor = StockPredictor()
+
+
+def _predict_symbol(symbol, days_ahead):
+    """Predict one symbol inside a worker; errors are returned, never raised"""
+    try:
+        predictor = _worker_predictor or StockPredictor()
+        result = predictor.predict(symbol, days_ahead)
+        if result is None:
+            return {'symbol': symbol, 'error': 'Insufficient data'}
+        return {
+            'symbol': symbol,
+            'current_price': result['current_price'],
+            'predicted_price': result['predicted_price'],
+            'price_change_pct': result['price_change_pct'],
+            'prediction_date': result['prediction_date'],
+            'mae': result['training_info']['mae'],
+            'confidence': result['confidence'],
+            'error': None
+        }
+    except Exception as e:
+        return {'symbol': symbol, 'error': str(e)}
+
+
+def normalize_symbols(symbols=None):
+    """Accept a list of symbols or a {name: symbol} mapping; drop duplicates"""
+    if symbols is None:
+        symbols = Config.POPULAR_STOCKS
+    if isinstance(symbols, dict):
+        symbols = symbols.values()
+    return list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+
+
+def rank_results(rows):
+    """Build the ranked frame: best predicted change first, failures last"""
+    df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    df = df.sort_values('price_change_pct', ascending=False, na_position='last')
+    df = df.reset_index(drop=True)
+    df.insert(0, 'rank', range(1, len(df) + 1))
+    return df
+
+
+def predict_universe(symbols=None, days_ahead=5, max_workers=None, max_pending=None, panel=False):
+    """Predict many symbols across a process pool and rank them by predicted change.
+
+    At most ``max_pending`` symbols are queued at a time, and a failure for
+    one symbol is recorded in its ``error`` column instead of aborting the run.
+    With ``panel=True`` one cross-sectional model is fitted for the whole
+    universe instead (see ``panel_model``).
+    """
+    if panel:
+        import panel_model
+        return panel_model.predict_universe(symbols, days_ahead)
+    symbols = normalize_symbols(symbols)
+    max_workers = max_workers or Config.BATCH_MAX_WORKERS or os.cpu_count() or 1
+    max_pending = max_pending or max_workers * 2
+    rows = []
+    if not symbols:
+        return rank_results(rows)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        remaining = iter(symbols)
+        pending = set()
+        for symbol in remaining:
+            pending.add(pool.submit(_predict_symbol, symbol, days_ahead))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                rows.extend(f.result() for f in done)
+        done, _ = wait(pending)
+        rows.extend(f.result() for f in done)
+
+    return rank_results(rows)
@@ -0,0 +1 @@
+"""Offline benchmarks for AUREX hot paths (run with ``python -m benchmarks``)."""
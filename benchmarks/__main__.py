@@ -0,0 +1,28 @@
+# benchmarks/__main__.py
+import argparse
+from benchmarks import backends, harness, imports, pipeline, provider
+
+SUITES = {
+    'backends': backends.run,
+    'imports': imports.run,
+    'pipeline': pipeline.run,
+    'provider': provider.run,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run AUREX offline benchmarks')
+    parser.add_argument('suite', nargs='?', default='pipeline', choices=sorted(SUITES))
+    parser.add_argument('--output', default='bench_results.json', help='JSON results file')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--quick', action='store_true', help='skip the largest sizes')
+    args = parser.parse_args()
+
+    results = SUITES[args.suite](quick=args.quick)
+    harness.write_results(args.output, args.suite, results)
+    if args.compare:
+        harness.compare(args.compare, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/backends.py
+"""Fit latency against accuracy for each model backend on synthetic bars.
+
+For every backend: fitting the single-horizon and the 30-horizon model,
+predicting the latest row, and walk-forward MAE / hit rate from
+``backtest``. Prices are synthetic (random walk), so the MAE compares
+backends with each other rather than measuring real forecasting skill.
+"""
+from backtest import backtest
+from model_backends import BACKENDS
+from stock_predictor import StockPredictor
+from benchmarks.harness import measure
+from benchmarks.synthetic import generate_ohlcv
+
+
+def run(workdir=None, quick=False):
+    predictor = StockPredictor()
+    df = predictor.add_technical_indicators(generate_ohlcv('AAPL', 252 * (2 if quick else 5)))
+    features = predictor.prepare_features(df, 5)
+    multi = predictor.prepare_multi_horizon_features(df, 30)
+    latest = features.drop(['Target'], axis=1).iloc[-1:]
+    results = []
+
+    for name in sorted(BACKENDS):
+        model_predictor = StockPredictor(backend=name)
+        params = {'backend': name, 'rows': len(features)}
+
+        results.append(measure('backend_fit', lambda: model_predictor.train_model(features),
+                               dict(params, horizons=1)))
+        results.append(measure('backend_fit', lambda: model_predictor.train_model(multi),
+                               dict(params, horizons=30), repeat=1))
+
+        model_predictor.train_model(features)
+        scaled = model_predictor.scaler.transform(latest)
+        results.append(measure('backend_predict', lambda: model_predictor.fitted_model.predict(scaled),
+                               params))
+
+        summary = {}
+
+        def walk_forward():
+            summary.update(backtest(features, model=model_predictor.model, horizon=5, n_jobs=1,
+                                    n_folds=3 if quick else 5)['summary'])
+        result = measure('backend_walk_forward', walk_forward, params, repeat=1)
+        result.update({'walk_forward_mae': summary['mae'], 'hit_rate': summary['hit_rate'],
+                       'strategy_return': summary['strategy_return']})
+        print(f"{'':<40} walk-forward MAE {summary['mae']:8.3f}   hit rate {summary['hit_rate']:.2%}")
+        results.append(result)
+
+    return results
@@ -0,0 +1,85 @@
+# benchmarks/harness.py
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+
+def measure(name, fn, params=None, repeat=3, setup=None):
+    """Time ``fn`` ``repeat`` times and record its peak traced memory in one extra run.
+
+    ``setup`` (optional) returns the positional arguments for each call and is
+    not included in the timings.
+    """
+    times = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+
+    args = setup() if setup else ()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        'name': name,
+        'params': params or {},
+        'repeat': repeat,
+        'min_seconds': min(times),
+        'median_seconds': statistics.median(times),
+        'peak_memory_bytes': peak,
+    }
+    print(f"{name:<40} {json.dumps(params or {}):<40} "
+          f"median {result['median_seconds'] * 1000:10.2f} ms   peak {peak / 1e6:8.2f} MB")
+    return result
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def write_results(path, suite, results):
+    """Write results with run metadata as JSON"""
+    payload = {
+        'suite': suite,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': _git_revision(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results written to {path}")
+
+
+def _key(result):
+    return result['name'], json.dumps(result['params'], sort_keys=True)
+
+
+def compare(baseline_path, results):
+    """Print the median-time ratio of each result against a previous run"""
+    with open(baseline_path, 'r') as f:
+        baseline = {_key(r): r for r in json.load(f)['results']}
+    print(f"\nComparison against {baseline_path} (ratio > 1 is slower):")
+    for result in results:
+        old = baseline.get(_key(result))
+        if old is None:
+            continue
+        ratio = result['median_seconds'] / old['median_seconds'] if old['median_seconds'] else float('inf')
+        print(f"{result['name']:<40} {json.dumps(result['params']):<40} x{ratio:6.2f}")
@@ -0,0 +1,91 @@
+# benchmarks/imports.py
+"""Cold import time of the app modules, measured with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter so earlier imports do not hide
+its cost. Alongside the total, the slowest top-level dependencies are
+recorded to show which heavy packages a module pulls in eagerly.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    'config',
+    'metrics',
+    'provider',
+    'price_store',
+    'quotes',
+    'metadata_cache',
+    'indicators',
+    'features',
+    'model_backends',
+    'model_registry',
+    'alert_store',
+    'alert_index',
+    'alert_rules',
+    'alert_daemon',
+    'financial_bot',
+    'alerts',
+    'data_fetcher',
+    'stock_predictor',
+    'analysis',
+    'backtest',
+    'panel',
+    'panel_model',
+    'batch_predictor',
+    'precompute',
+    'export',
+    'compute_worker',
+    'chart_sampling',
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module):
+    """Return (total microseconds, {top-level package: cumulative microseconds})"""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          capture_output=True, text=True, env=env, cwd=ROOT)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    total, packages = 0, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        if name == module:
+            total = int(cumulative)
+        else:
+            # The outermost entry of a package carries its whole cost
+            top = name.split('.')[0]
+            packages[top] = max(packages.get(top, 0), int(cumulative))
+    return total, packages
+
+
+def run(workdir=None, quick=False, repeat=None, top=5):
+    repeat = repeat or (1 if quick else 3)
+    results = []
+    for module in MODULES:
+        try:
+            profiles = [import_profile(module) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"Error importing {module}: {e}")
+            continue
+        times = [total / 1e6 for total, _ in profiles]
+        heaviest = sorted(profiles[-1][1].items(), key=lambda item: -item[1])[:top]
+        result = {
+            'name': f'import_{module}',
+            'params': {},
+            'repeat': repeat,
+            'min_seconds': min(times),
+            'median_seconds': statistics.median(times),
+            'peak_memory_bytes': None,
+            'heaviest_imports': {name: us / 1e6 for name, us in heaviest},
+        }
+        print(f"{result['name']:<40} median {result['median_seconds'] * 1000:10.2f} ms   "
+              + ", ".join(f"{name} {s * 1000:.0f} ms" for name, s in result['heaviest_imports'].items()))
+        results.append(result)
+    return results
@@ -0,0 +1,143 @@
+# benchmarks/pipeline.py
+"""Fetch -> indicators -> features -> train -> predict -> alerts, on synthetic data."""
+import os
+import tempfile
+import numpy as np
+import predictor as legacy_predictor
+from alert_rules import RuleBook, RuleSnapshot
+from alert_store import AlertStore
+from data_fetcher import DataFetcher
+from financial_bot import FinancialBot
+from metadata_cache import MetadataCache
+from model_registry import ModelRegistry
+from price_store import PriceStore
+from quotes import fetch_snapshot
+from stock_predictor import StockPredictor
+from benchmarks.harness import measure
+from benchmarks.synthetic import SyntheticProvider
+
+
+def _alerts(n_alerts, symbols, snapshot, seed=0):
+    """Mostly untriggered alerts spread over ``symbols`` (about 1% trigger)"""
+    rng = np.random.default_rng(seed)
+    alerts = []
+    for i in range(n_alerts):
+        symbol = symbols[i % len(symbols)]
+        price = snapshot.price(symbol)
+        kind = rng.integers(4)
+        hit = rng.random() < 0.01
+        if kind == 0:
+            alert = {'type': 'price_above', 'condition': None,
+                     'threshold': price * (0.9 if hit else 1.1 + rng.random())}
+        elif kind == 1:
+            alert = {'type': 'price_below', 'condition': None,
+                     'threshold': price * (1.1 if hit else 0.9 - 0.5 * rng.random())}
+        elif kind == 2:
+            alert = {'type': 'percent_change', 'condition': 'increase',
+                     'threshold': -100.0 if hit else 50.0 + rng.random()}
+        else:
+            alert = {'type': 'percent_change', 'condition': 'decrease',
+                     'threshold': -100.0 if hit else 50.0 + rng.random()}
+        alert.update({'symbol': symbol, 'created': '2026-01-01 00:00:00', 'triggered': False})
+        alerts.append(alert)
+    return alerts
+
+
+_RULES = [
+    'RSI < {a:.0f}',
+    'Close > {b:.2f}',
+    'RSI < {a:.0f} and Close crosses_above SMA_50',
+    '(Close > BB_upper or Daily_Return < -{c:.3f}) and Volume > {d:.0f}',
+]
+
+
+def _rule_book(n_rules, symbols, seed=0):
+    """``n_rules`` rules over four rule shapes with random numbers"""
+    rng = np.random.default_rng(seed)
+    book = RuleBook()
+    for i in range(n_rules):
+        expression = _RULES[i % len(_RULES)].format(
+            a=rng.uniform(10, 40), b=rng.uniform(50, 200), c=rng.uniform(0.01, 0.1),
+            d=rng.uniform(1e5, 1e7))
+        book.add(i, symbols[i % len(symbols)], expression)
+    return book
+
+
+def run(workdir=None, quick=False):
+    workdir = workdir or tempfile.mkdtemp(prefix='aurex-bench-')
+    provider = SyntheticProvider()
+    store = PriceStore(os.path.join(workdir, 'prices'), fetch=provider.history,
+                       refresh_seconds=10 ** 9)
+    predictor = StockPredictor(store=store, registry=ModelRegistry(os.path.join(workdir, 'models')))
+    results = []
+
+    # Fetch through the price store: cold (empty store) and warm
+    results.append(measure('fetch_data', lambda: predictor.fetch_data('AAPL', '5y'),
+                           {'store': 'cold'}, setup=lambda: store.clear('AAPL') or ()))
+    results.append(measure('fetch_data', lambda: predictor.fetch_data('AAPL', '5y'),
+                           {'store': 'warm'}))
+
+    for period in ['1y', '5y']:
+        raw = provider.history('AAPL', period=period)
+        params = {'period': period, 'rows': len(raw)}
+        results.append(measure('add_technical_indicators', predictor.add_technical_indicators,
+                               params, setup=lambda: (raw.copy(),)))
+        enriched = predictor.add_technical_indicators(raw.copy())
+        results.append(measure('stock_predictor.prepare_features',
+                               lambda: predictor.prepare_features(enriched, 5), params))
+        features = predictor.prepare_features(enriched, 5)
+        results.append(measure('train_model', lambda: predictor.train_model(features), params))
+
+        basic = DataFetcher(store=store).fetch_data('AAPL', period)
+        legacy = legacy_predictor.StockPredictor()
+        results.append(measure('predictor.prepare_features',
+                               lambda: legacy.prepare_features(basic), params))
+
+    # predict: cold registry (trains) and warm registry (bars unchanged)
+    def cold_predictor():
+        return (StockPredictor(store=store, registry=ModelRegistry(tempfile.mkdtemp(dir=workdir))),)
+    results.append(measure('predict', lambda p: p.predict('AAPL', 5), {'registry': 'cold'},
+                           setup=cold_predictor))
+    predictor.predict('AAPL', 5)
+    results.append(measure('predict', lambda: predictor.predict('AAPL', 5), {'registry': 'warm'}))
+
+    # check_alerts over a few hundred symbols
+    symbols = [f'SYM{i:04d}' for i in range(200)]
+    snapshot = fetch_snapshot(symbols, download=provider.download)
+    for n_alerts in ([10, 10_000] if quick else [10, 10_000, 1_000_000]):
+        db = os.path.join(workdir, f'alerts_{n_alerts}.db')
+        alert_store = AlertStore(db, legacy_json=os.path.join(workdir, 'none.json'))
+        alert_store.add_many('bot', _alerts(n_alerts, symbols, snapshot))
+        bot = FinancialBot(store=alert_store)
+
+        def reset_alerts(bot=bot):
+            # Un-trigger everything so each repeat evaluates the same alert book
+            with bot.store._connect() as conn:
+                conn.execute("UPDATE alerts SET triggered = 0, "
+                             "data = json_set(data, '$.triggered', json('false'))")
+            bot.reload_alerts()
+            return (snapshot,)
+        results.append(measure('check_alerts', bot.check_alerts, {'alerts': n_alerts},
+                               repeat=1 if n_alerts > 10_000 else 3, setup=reset_alerts))
+
+    # Rule alerts against the latest indicator rows of the same symbols
+    rule_snapshot = RuleSnapshot({s: predictor.add_technical_indicators(provider.history(s, period='6mo'))
+                                  for s in symbols})
+    for n_rules in ([10, 10_000] if quick else [10, 10_000, 1_000_000]):
+        book = _rule_book(n_rules, symbols)
+        book.triggered(rule_snapshot)
+        results.append(measure('rule_alerts', lambda: book.triggered(rule_snapshot), {'rules': n_rules}))
+
+    # get_market_summary across 10..1000 symbols (offline quotes and info)
+    bot = FinancialBot(store=AlertStore(os.path.join(workdir, 'summary.db'),
+                                        legacy_json=os.path.join(workdir, 'none.json')),
+                       quote_fetch=lambda s: fetch_snapshot(s, download=provider.download),
+                       metadata=MetadataCache(os.path.join(workdir, 'metadata.db'),
+                                              fetch=provider.info))
+    for n_symbols in ([10, 100] if quick else [10, 100, 1000]):
+        universe = [f'SUM{i:04d}' for i in range(n_symbols)]
+        provider.download(universe)
+        results.append(measure('get_market_summary', lambda: bot.get_market_summary(universe),
+                               {'symbols': n_symbols}))
+
+    return results
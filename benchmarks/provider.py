@@ -0,0 +1,61 @@
+# benchmarks/provider.py
+"""Many sessions asking for the same few symbols at once.
+
+A stand-in provider with fixed latency counts its upstream calls; with the
+shared client those should track the number of distinct symbols rather than
+the number of sessions.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from provider import ProviderClient
+from benchmarks.harness import measure
+from benchmarks.synthetic import SyntheticProvider
+
+
+class SlowProvider(SyntheticProvider):
+    """Synthetic bars behind a fixed per-call latency, counting calls"""
+
+    def __init__(self, latency=0.05):
+        super().__init__()
+        self.latency = latency
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """Zero the call count (usable as a ``measure`` setup)"""
+        self.calls = 0
+        return ()
+
+    def history(self, symbol, interval='1d', period=None, start=None):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return super().history(symbol, interval, period=period, start=start)
+
+
+def _burst(fetch, sessions, symbols):
+    """Every session requests every symbol, all at the same time"""
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(lambda i: [fetch(s, period='1y') for s in symbols[i % len(symbols):]
+                                 + symbols[:i % len(symbols)]], range(sessions)))
+
+
+def run(workdir=None, quick=False):
+    results = []
+    session_counts = [8, 32] if quick else [8, 32, 128]
+    symbols = [f'SYM{i}' for i in range(4)]
+    for sessions in session_counts:
+        params = {'sessions': sessions, 'symbols': len(symbols)}
+        direct = SlowProvider()
+        upstream = SlowProvider()
+        client = ProviderClient(upstream, rate=1000, burst=1000)
+        for name, source, fetch in [('provider_direct', direct, direct.history),
+                                    ('provider_client', upstream, client.history)]:
+            # Counts restart before every run, so they reflect the last one
+            result = measure(name, lambda: _burst(fetch, sessions, symbols), dict(params),
+                             repeat=1, setup=source.reset)
+            result['upstream_calls'] = source.calls
+            print(f"{'':<40} upstream calls: {source.calls}")
+            results.append(result)
+    return results
@@ -0,0 +1,63 @@
+# benchmarks/synthetic.py
+import zlib
+import numpy as np
+import pandas as pd
+from price_store import period_start
+
+TRADING_DAYS = 252
+
+
+def generate_ohlcv(symbol='SYN', periods=TRADING_DAYS * 5, end=None, s0=100.0,
+                   mu=0.08, sigma=0.25, seed=None):
+    """Deterministic daily OHLCV bars from geometric Brownian motion.
+
+    The random stream depends only on ``symbol`` (or ``seed``), so repeated
+    runs produce identical prices. Bars end on ``end`` (today by default).
+    """
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()) if seed is None else seed)
+    dt = 1.0 / TRADING_DAYS
+    shocks = rng.standard_normal(periods)
+    log_returns = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * shocks
+    close = s0 * np.exp(np.cumsum(log_returns))
+    open_ = np.concatenate([[s0], close[:-1]]) * (1 + rng.normal(0, 0.002, periods))
+    spread = np.abs(rng.normal(0, 0.01, periods)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.lognormal(mean=15, sigma=0.4, size=periods).astype(np.int64)
+
+    end = (end or pd.Timestamp.now()).normalize()
+    index = pd.bdate_range(end=end, periods=periods, tz='America/New_York', name='Date')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close,
+                         'Volume': volume}, index=index)
+
+
+class SyntheticProvider:
+    """Offline stand-in for Yahoo Finance built on ``generate_ohlcv``"""
+
+    def __init__(self, periods=TRADING_DAYS * 5):
+        self.periods = periods
+        self.cache = {}
+
+    def bars(self, symbol):
+        if symbol not in self.cache:
+            self.cache[symbol] = generate_ohlcv(symbol, self.periods)
+        return self.cache[symbol]
+
+    def history(self, symbol, interval='1d', period=None, start=None):
+        """Same signature as ``provider.YahooProvider.history``"""
+        df = self.bars(symbol)
+        if start is not None:
+            start = pd.Timestamp(start).tz_localize(df.index.tz)
+        elif period is not None:
+            start = period_start(period)
+            start = start.tz_localize(df.index.tz) if start is not None else None
+        return df.copy() if start is None else df.loc[df.index >= start].copy()
+
+    def download(self, symbols, period='5d'):
+        """Same shape as ``yf.download(symbols, group_by='ticker')``"""
+        return pd.concat({s: self.history(s, period=period) for s in symbols}, axis=1)
+
+    def info(self, symbol):
+        close = self.bars(symbol)['Close']
+        return {'shortName': f'{symbol} Synthetic', 'volume': int(self.bars(symbol)['Volume'].iloc[-1]),
+                'marketCap': int(close.iloc[-1] * 1e9)}
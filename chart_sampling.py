@@ -0,0 +1,73 @@
+# chart_sampling.py
+import numpy as np
+import pandas as pd
+
+
+def bucket_edges(n_rows, n_buckets):
+    """Start positions of ``n_buckets`` contiguous, near-equal row buckets"""
+    n_buckets = max(1, min(n_buckets, n_rows))
+    return np.linspace(0, n_rows, n_buckets + 1).astype(np.int64)[:-1]
+
+
+def downsample_ohlc(df, max_points):
+    """Aggregate consecutive bars into at most ``max_points`` candles.
+
+    Each bucket keeps the first open, highest high, lowest low, last close
+    and summed volume, stamped with the bucket's first timestamp, so the
+    chart keeps every extreme. Frames already small enough are returned
+    unchanged.
+    """
+    n = len(df)
+    if n <= max_points:
+        return df
+    starts = bucket_edges(n, max_points)
+    ends = np.append(starts[1:], n) - 1
+    out = pd.DataFrame({
+        'Open': df['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(df['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(df['Low'].to_numpy(), starts),
+        'Close': df['Close'].to_numpy()[ends],
+    }, index=df.index[starts])
+    if 'Volume' in df:
+        out['Volume'] = np.add.reduceat(df['Volume'].to_numpy(), starts)
+    return out
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of a line.
+
+    Returns the positions of the ``n_out`` points to keep. NaN values are
+    skipped. Keeps the first and last points and, for each bucket in
+    between, the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+    xv, yv = x[valid], y[valid]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_start = end
+        avg_x = xv[next_start:next_end].mean() if next_end > next_start else xv[-1]
+        avg_y = yv[next_start:next_end].mean() if next_end > next_start else yv[-1]
+        area = np.abs((xv[a] - avg_x) * (yv[start:end] - yv[a])
+                      - (xv[a] - xv[start:end]) * (avg_y - yv[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return valid[keep]
+
+
+def downsample_series(series, max_points):
+    """LTTB-downsample a time-indexed Series to at most ``max_points`` points"""
+    if len(series) <= max_points:
+        return series
+    x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+    return series.iloc[lttb(x, series.to_numpy(), max_points)]
@@ -0,0 +1,172 @@
+# compute_worker.py
+import json
+import hashlib
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+import metrics
+
+# Per-process state of the worker processes, created on first use
+_predictor = None
+_metadata = None
+_alert_bot = None
+
+
+def _get_predictor():
+    global _predictor
+    if _predictor is None:
+        from stock_predictor import StockPredictor
+        _predictor = StockPredictor()
+    return _predictor
+
+
+def _get_metadata():
+    global _metadata
+    if _metadata is None:
+        from metadata_cache import MetadataCache
+        _metadata = MetadataCache()
+    return _metadata
+
+
+def _get_alert_bot():
+    global _alert_bot
+    if _alert_bot is None:
+        from financial_bot import FinancialBot
+        _alert_bot = FinancialBot(pending_only=True)
+    return _alert_bot
+
+
+def _job_predict(symbol, days_ahead):
+    return _get_predictor().predict(symbol, days_ahead)
+
+
+def _job_predict_horizons(symbol, max_horizon):
+    return _get_predictor().predict_horizons(symbol, max_horizon)
+
+
+def _job_market_summary(symbols):
+    from financial_bot import market_summary
+    return market_summary(list(symbols), metadata=_get_metadata())
+
+
+def _job_check_alerts(window):
+    """Check pending alerts; ``window`` only groups identical requests into one job"""
+    bot = _get_alert_bot()
+    bot.reload_alerts()
+    return bot.check_alerts()
+
+
+def _job_history(symbol, period):
+    return _get_predictor().fetch_data(symbol, period)
+
+
+def _job_export(symbols, fmt, period, indicators):
+    from export import export_symbols
+    return export_symbols(list(symbols), fmt, period, indicators, predictor=_get_predictor())
+
+
+JOBS = {
+    'predict': _job_predict,
+    'predict_horizons': _job_predict_horizons,
+    'market_summary': _job_market_summary,
+    'check_alerts': _job_check_alerts,
+    'history': _job_history,
+    'export': _job_export,
+}
+
+
+def _run_job(kind, *args):
+    """Run a job in the worker and hand back its metrics along with the result"""
+    try:
+        return JOBS[kind](*args), metrics.REGISTRY.drain()
+    except Exception:
+        metrics.REGISTRY.drain()
+        raise
+
+
+class ComputeService:
+    """Runs slow work (fetching, training, summaries) in worker processes.
+
+    ``submit`` returns a job id derived from the job kind and arguments, so
+    identical requests from different sessions share one in-flight job.
+    Finished results are kept for ``result_ttl`` seconds and then recomputed
+    on the next request.
+    """
+
+    def __init__(self, max_workers=None, result_ttl=None):
+        self.pool = ProcessPoolExecutor(
+            max_workers=max_workers or Config.COMPUTE_MAX_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        self.result_ttl = Config.COMPUTE_RESULT_TTL if result_ttl is None else result_ttl
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def job_id(kind, *args):
+        payload = json.dumps([kind, args], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def _expired(self, job, now):
+        return job['finished'] is not None and now - job['finished'] > self.result_ttl
+
+    def submit(self, kind, *args):
+        """Queue a job (or join an identical one) and return its id"""
+        if kind not in JOBS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = self.job_id(kind, *args)
+        now = time.time()
+        with self.lock:
+            for old_id in [j for j, job in self.jobs.items() if self._expired(job, now)]:
+                del self.jobs[old_id]
+            if job_id not in self.jobs:
+                future = self.pool.submit(_run_job, kind, *args)
+                job = {'kind': kind, 'args': args, 'submitted': now, 'finished': None,
+                       'future': future}
+                future.add_done_callback(lambda f, job=job: self._finish(job, f))
+                self.jobs[job_id] = job
+        return job_id
+
+    @staticmethod
+    def _finish(job, future):
+        job['finished'] = time.time()
+        op = f"job_{job['kind']}"
+        # Queueing plus run time, as seen by the app
+        metrics.observe('latency_seconds', job['finished'] - job['submitted'], op=op)
+        if future.cancelled() or future.exception() is not None:
+            metrics.inc('errors_total', op=op)
+        else:
+            metrics.REGISTRY.merge(future.result()[1])
+
+    def status(self, job_id):
+        """One of 'pending', 'running', 'done', 'error' or 'unknown'"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return 'unknown'
+        future = job['future']
+        if not future.done():
+            return 'running' if future.running() else 'pending'
+        return 'error' if future.exception() is not None else 'done'
+
+    def result(self, job_id, default=None):
+        """The job's result once done, otherwise ``default``"""
+        if self.status(job_id) != 'done':
+            return default
+        return self.jobs[job_id]['future'].result()[0]
+
+    def error(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or not job['future'].done():
+            return None
+        return job['future'].exception()
+
+    def get(self, kind, *args):
+        """Submit if needed and return (job_id, status, result or None)"""
+        job_id = self.submit(kind, *args)
+        status = self.status(job_id)
+        return job_id, status, self.result(job_id)
+
+    def shutdown(self, wait=False):
+        self.pool.shutdown(wait=wait, cancel_futures=True)
@@ -1,6 +1,5 @@
 # config.py
-import yfinance as yf
-import pandas as pd
+import os
 from datetime import datetime, timedelta
 
 class Config:
@@ -26,4 +25,57 @@ class Config:
         'Johnson & Johnson': 'JNJ'
     }  
     # Technical indicators to calculate
-    INDICATORS = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'BB_upper', 'BB_lower']
\ No newline at end of file
+    INDICATORS = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'BB_upper', 'BB_lower']
+    # Local price store (one Parquet file per symbol and interval)
+    PRICE_STORE_DIR = os.getenv('AUREX_PRICE_STORE_DIR', os.path.join('data', 'prices'))
+    # Seconds before a stored series is topped up from the provider again
+    PRICE_REFRESH_SECONDS = int(os.getenv('AUREX_PRICE_REFRESH_SECONDS', '300'))
+    # Fitted model registry (joblib files) and in-memory LRU size
+    MODEL_DIR = os.getenv('AUREX_MODEL_DIR', os.path.join('data', 'models'))
+    MODEL_CACHE_SIZE = int(os.getenv('AUREX_MODEL_CACHE_SIZE', '64'))
+    # Regressor used by both predictors: forest, fast_forest, hist_gb or ridge
+    # (compare them with 'python -m benchmarks backends')
+    MODEL_BACKEND = os.getenv('AUREX_MODEL_BACKEND', 'forest')
+    # Worker processes for universe-wide batch prediction (None = all cores)
+    BATCH_MAX_WORKERS = int(os.getenv('AUREX_BATCH_MAX_WORKERS', '0')) or None
+    # Alert storage (SQLite in WAL mode); the legacy JSON file is imported once
+    ALERTS_DB = os.getenv('AUREX_ALERTS_DB', 'alerts.db')
+    ALERTS_JSON = 'alerts.json'
+    # Background alert evaluation
+    ALERT_DAEMON_ENABLED = os.getenv('AUREX_ALERT_DAEMON', '1') == '1'
+    ALERT_CHECK_INTERVAL = int(os.getenv('AUREX_ALERT_CHECK_INTERVAL', '60'))
+    ALERT_FETCH_BATCH = 200
+    ALERT_FETCH_CONCURRENCY = 4
+    # Memory budget for the in-process multi-symbol price panel
+    PANEL_MAX_BYTES = int(os.getenv('AUREX_PANEL_MAX_BYTES', str(256 * 1024 * 1024)))
+    # Background compute worker processes and how long finished results are reused
+    COMPUTE_MAX_WORKERS = int(os.getenv('AUREX_COMPUTE_MAX_WORKERS', '2'))
+    COMPUTE_RESULT_TTL = int(os.getenv('AUREX_COMPUTE_RESULT_TTL', '300'))
+    # Maximum points sent to the browser per chart trace
+    CHART_MAX_POINTS = int(os.getenv('AUREX_CHART_MAX_POINTS', '800'))
+    # Market data provider ('yahoo', or 'file' to serve PROVIDER_DIR offline) and
+    # the shared client's rate limit (calls/second, burst) and retry policy
+    PROVIDER = os.getenv('AUREX_PROVIDER', 'yahoo')
+    PROVIDER_DIR = os.getenv('AUREX_PROVIDER_DIR', os.path.join('data', 'provider'))
+    PROVIDER_RATE = float(os.getenv('AUREX_PROVIDER_RATE', '2'))
+    PROVIDER_BURST = int(os.getenv('AUREX_PROVIDER_BURST', '5'))
+    PROVIDER_RETRIES = int(os.getenv('AUREX_PROVIDER_RETRIES', '3'))
+    PROVIDER_BACKOFF = float(os.getenv('AUREX_PROVIDER_BACKOFF', '0.5'))
+    # Symbol metadata (.info) cache and how long entries stay fresh (seconds)
+    METADATA_DB = os.getenv('AUREX_METADATA_DB', os.path.join('data', 'metadata.db'))
+    METADATA_TTL = int(os.getenv('AUREX_METADATA_TTL', str(24 * 3600)))
+    # Nightly precompute artifacts (python precompute.py): where they go, how many
+    # to keep, the oldest one the app still uses (seconds) and the universe
+    PRECOMPUTE_DIR = os.getenv('AUREX_PRECOMPUTE_DIR', os.path.join('data', 'precomputed'))
+    PRECOMPUTE_KEEP = 7
+    PRECOMPUTE_MAX_AGE = int(os.getenv('AUREX_PRECOMPUTE_MAX_AGE', str(36 * 3600)))
+    PRECOMPUTE_SYMBOLS = [s for s in os.getenv('AUREX_PRECOMPUTE_SYMBOLS', '').split(',') if s]
+    # Data exports, served by Streamlit's static file handler from ./static
+    # (server.enableStaticServing) and deleted after EXPORT_TTL seconds
+    EXPORT_DIR = os.path.join('static', 'exports')
+    EXPORT_URL = 'app/static/exports'
+    EXPORT_TTL = int(os.getenv('AUREX_EXPORT_TTL', '3600'))
+    # Metrics export: Prometheus /metrics port and/or a periodically written JSON file
+    METRICS_PORT = int(os.getenv('AUREX_METRICS_PORT', '0')) or None
+    METRICS_JSON = os.getenv('AUREX_METRICS_JSON') or None
+    METRICS_EXPORT_INTERVAL = int(os.getenv('AUREX_METRICS_EXPORT_INTERVAL', '60'))
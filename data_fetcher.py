@@ -1,11 +1,12 @@
 # data_fetcher.py
-import yfinance as yf
-import pandas as pd
-from datetime import datetime, timedelta
+from price_store import PriceStore
+from indicators import IndicatorCache, BASIC_SPEC
 
 class DataFetcher:
-    def __init__(self):
+    def __init__(self, store=None):
         self.sp500_symbols = self._load_sp500_symbols()
+        self.store = store or PriceStore()
+        self.indicator_cache = IndicatorCache(BASIC_SPEC, self._add_indicators)
     
     def _load_sp500_symbols(self):
         # Top S&P 500 stocks
@@ -14,19 +15,20 @@ class DataFetcher:
     
     def fetch_data(self, symbol, period='1y', interval='1d'):
         try:
-            stock = yf.Ticker(symbol)
-            df = stock.history(period=period, interval=interval)
+            df = self.store.get(symbol, period=period, interval=interval)
             
-            # Calculate technical indicators
-            df['MA_20'] = df['Close'].rolling(window=20).mean()
-            df['MA_50'] = df['Close'].rolling(window=50).mean()
-            df['RSI'] = self._calculate_rsi(df['Close'])
-            
-            return df
+            # Calculate technical indicators (incrementally for new bars)
+            return self.indicator_cache.apply((symbol, interval), df)
         except Exception as e:
             print(f"Error fetching {symbol}: {e}")
             return None
     
+    def _add_indicators(self, df):
+        df['MA_20'] = df['Close'].rolling(window=20).mean()
+        df['MA_50'] = df['Close'].rolling(window=50).mean()
+        df['RSI'] = self._calculate_rsi(df['Close'])
+        return df
+    
     def _calculate_rsi(self, prices, period=14):
         delta = prices.diff()
         gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
@@ -0,0 +1,135 @@
+# export.py
+"""Multi-symbol data export written straight to disk in chunks.
+
+Bars (optionally with the technical indicator columns) are written one
+symbol and ``chunk_rows`` rows at a time to CSV, Parquet or Arrow IPC, so
+memory stays at about one symbol's frame however large the export is. Files
+go to Streamlit's static directory and are downloaded from there, outside
+the page.
+"""
+import os
+import time
+import hashlib
+from datetime import datetime
+import numpy as np
+from config import Config
+from indicators import TECHNICAL_SPEC
+
+FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+INDICATOR_COLUMNS = [c for columns, _, _ in TECHNICAL_SPEC for c in columns]
+
+
+class _CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+class _ArrowWriter:
+    """Parquet (one row group per chunk) or Arrow IPC file, via pyarrow"""
+
+    def __init__(self, path, fmt):
+        import pyarrow as pa
+        self.pa = pa
+        self.schema = None
+        self.path = path
+        self.fmt = fmt
+        self.writer = None
+
+    def write(self, chunk):
+        table = self.pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+        if self.writer is None:
+            self.schema = table.schema
+            if self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                self.writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                self.writer = self.pa.ipc.new_file(self.path, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        elif not os.path.exists(self.path):
+            open(self.path, 'wb').close()
+
+
+def _writer(path, fmt):
+    if fmt == 'csv':
+        return _CsvWriter(path)
+    return _ArrowWriter(path, fmt)
+
+
+def _export_frame(symbol, df, columns):
+    """One symbol's bars as a flat frame with fixed columns and dtypes"""
+    out = df.reindex(columns=columns[2:])
+    out = out.astype({c: np.float64 for c in columns[2:] if c != 'Volume'})
+    out['Volume'] = out['Volume'].fillna(0).astype(np.int64)
+    out.insert(0, 'Symbol', symbol)
+    out.insert(0, 'Date', df.index)
+    return out
+
+
+def export_symbols(symbols, fmt='csv', period='1y', indicators=True, predictor=None,
+                   directory=None, chunk_rows=50_000):
+    """Write bars for ``symbols`` to a new file and return its name.
+
+    Rows are ordered by symbol, then date, with ``Date`` and ``Symbol`` as the
+    first columns. Symbols without data are skipped.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if predictor is None:
+        from stock_predictor import StockPredictor
+        predictor = StockPredictor()
+    directory = directory or Config.EXPORT_DIR
+    os.makedirs(directory, exist_ok=True)
+    cleanup(directory)
+
+    label = symbols[0] if len(symbols) == 1 else f'{len(symbols)}_symbols'
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+    digest = hashlib.sha1(repr((list(symbols), indicators)).encode()).hexdigest()[:6]
+    name = f"{label.replace('^', '')}_{period}_{stamp}_{digest}{FORMATS[fmt]}"
+    path = os.path.join(directory, name)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    columns = ['Date', 'Symbol'] + PRICE_COLUMNS + (INDICATOR_COLUMNS if indicators else [])
+
+    writer = _writer(tmp_path, fmt)
+    try:
+        for symbol in symbols:
+            df = predictor.fetch_data(symbol, period)
+            if df.empty:
+                continue
+            if indicators:
+                # Full frame, warm-up rows included (NaN indicators)
+                df = predictor.indicator_cache.apply(symbol, df)
+            frame = _export_frame(symbol, df, columns)
+            del df
+            for start in range(0, len(frame), chunk_rows):
+                writer.write(frame.iloc[start:start + chunk_rows])
+    finally:
+        writer.close()
+    os.replace(tmp_path, path)
+    return name
+
+
+def cleanup(directory=None, max_age=None):
+    """Delete exports (and leftovers of failed ones) older than ``max_age`` seconds"""
+    directory = directory or Config.EXPORT_DIR
+    max_age = Config.EXPORT_TTL if max_age is None else max_age
+    now = time.time()
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,122 @@
+# features.py
+"""Declarative feature pipeline shared by both predictor modules.
+
+A ``FeatureSpec`` lists the raw columns, lags, rolling means and percent
+changes to build. ``build_feature_matrix`` fills them all into one
+preallocated, C-contiguous float32 array in a single pass (lags come from a
+sliding-window view, not repeated ``shift`` calls) and drops incomplete rows
+once at the end.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class FeatureSpec:
+    """What to build, in output column order.
+
+    ``columns``: raw columns copied as-is
+    ``lags``: {source column: [lags]}, named with ``lag_name``
+    ``rolling_means``: [(name, source column, window)]
+    ``pct_changes``: [(name, source column)]
+    """
+
+    def __init__(self, columns, lags=None, lag_name='{column}_lag_{lag}',
+                 rolling_means=None, pct_changes=None):
+        self.columns = list(columns)
+        self.lags = dict(lags or {})
+        self.lag_name = lag_name
+        self.rolling_means = list(rolling_means or [])
+        self.pct_changes = list(pct_changes or [])
+
+    @property
+    def feature_names(self):
+        names = list(self.columns)
+        for column, lags in self.lags.items():
+            names += [self.lag_name.format(column=column, lag=lag) for lag in lags]
+        names += [name for name, _, _ in self.rolling_means]
+        names += [name for name, _ in self.pct_changes]
+        return names
+
+
+# StockPredictor (stock_predictor.py)
+STOCK_FEATURES = FeatureSpec(
+    columns=['Close', 'Volume', 'SMA_20', 'SMA_50', 'RSI',
+             'MACD', 'MACD_signal', 'BB_upper', 'BB_lower'],
+    lags={'Close': [1, 2, 3, 4, 5]},
+)
+
+# StockPredictor (predictor.py), fed by DataFetcher
+BASIC_FEATURES = FeatureSpec(
+    columns=['Close', 'Volume', 'MA_20', 'MA_50', 'RSI'],
+    lags={'Close': [1, 2, 3, 5]},
+    lag_name='{column}_Lag_{lag}',
+    rolling_means=[('MA_5', 'Close', 5), ('MA_10', 'Close', 10)],
+    pct_changes=[('Price_Change', 'Close')],
+)
+
+
+def build_feature_matrix(df, spec, targets=None, target_column='Close'):
+    """Build features (and optional future targets) as one float32 matrix.
+
+    ``targets`` maps output names to horizons, e.g. {'Target': 5}; each is
+    ``target_column`` shifted that many rows into the future. Returns
+    ``(matrix, index, column_names)`` with incomplete rows removed.
+    """
+    targets = dict(targets or {})
+    names = spec.feature_names + list(targets)
+    n = len(df)
+    out = np.full((n, len(names)), np.nan, dtype=np.float32)
+    sources = {}
+
+    def source(column):
+        if column not in sources:
+            sources[column] = df[column].to_numpy(dtype=np.float64)
+        return sources[column]
+
+    col = 0
+    for column in spec.columns:
+        out[:, col] = source(column)
+        col += 1
+
+    for column, lags in spec.lags.items():
+        values = source(column)
+        max_lag = max(lags)
+        if n > max_lag:
+            # windows[i] holds values[i .. i + max_lag]; the last element is "now"
+            windows = sliding_window_view(values, max_lag + 1)
+            for lag in lags:
+                out[max_lag:, col] = windows[:, max_lag - lag]
+                out[lag:max_lag, col] = values[:max_lag - lag]
+                col += 1
+        else:
+            for lag in lags:
+                out[lag:, col] = values[:n - lag] if n > lag else []
+                col += 1
+
+    for _, column, window in spec.rolling_means:
+        values = source(column)
+        if n >= window:
+            out[window - 1:, col] = sliding_window_view(values, window).mean(axis=1)
+        col += 1
+
+    for _, column in spec.pct_changes:
+        values = source(column)
+        if n > 1:
+            out[1:, col] = values[1:] / values[:-1] - 1
+        col += 1
+
+    for horizon in targets.values():
+        values = source(target_column)
+        if n > horizon:
+            out[:n - horizon, col] = values[horizon:]
+        col += 1
+
+    valid = ~np.isnan(out).any(axis=1)
+    return np.ascontiguousarray(out[valid]), df.index[valid], names
+
+
+def build_feature_frame(df, spec, targets=None, target_column='Close'):
+    """``build_feature_matrix`` wrapped in a DataFrame without copying the block"""
+    matrix, index, names = build_feature_matrix(df, spec, targets, target_column)
+    return pd.DataFrame(matrix, index=index, columns=names, copy=False)
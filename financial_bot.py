@@ -1,108 +1,247 @@
 # financial_bot.py
-import yfinance as yf
-import pandas as pd
-from datetime import datetime, timedelta
-import json
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from config import Config
+from quotes import fetch_snapshot
+from alert_index import AlertIndex
+from alert_rules import RuleBook, RuleSnapshot, parse as parse_rule
+from alert_store import AlertStore
+from metadata_cache import MetadataCache
+import metrics
+
+
+@metrics.timed('get_market_summary')
+def market_summary(symbols=None, snapshot=None, quote_fetch=None, metadata=None):
+    """Price, change and name of each symbol; needs no alert store"""
+    if symbols is None:
+        symbols = ['^GSPC', 'AAPL', 'MSFT', 'GOOGL']
+    if snapshot is None or any(s not in snapshot for s in symbols):
+        snapshot = (quote_fetch or fetch_snapshot)(symbols)
+    metrics.inc('rows_total', len(symbols), op='get_market_summary')
+    # Names and market caps come from the long-lived metadata cache;
+    # only prices and volumes are fetched on every call
+    info_by_symbol = (metadata or MetadataCache()).get_many([s for s in symbols if s in snapshot])
+
+    summary = []
+    for symbol in symbols:
+        try:
+            quote = snapshot.change(symbol)
+            if quote is None:
+                continue
+            current, change, change_pct = quote
+            info = info_by_symbol.get(symbol, {})
+
+            summary.append({
+                'symbol': symbol,
+                'name': info.get('shortName', symbol),
+                'price': round(current, 2),
+                'change': round(change, 2),
+                'change_pct': round(change_pct, 2),
+                'volume': snapshot.volume(symbol),
+                'market_cap': info.get('marketCap', 0)
+            })
+        except:
+            metrics.inc('errors_total', op='get_market_summary')
+            continue
+    return summary
+
 
 class FinancialBot:
-    def __init__(self):
-        self.alerts_file = 'alerts.json'
-        self.alerts = self.load_alerts()        
+    def __init__(self, store=None, quote_fetch=None, info_fetch=None, metadata=None,
+                 frame_fetch=None, pending_only=False):
+        self.store = store or AlertStore()
+        self.pending_only = pending_only
+        self.fetch_quotes = quote_fetch or fetch_snapshot
+        self.fetch_frame = frame_fetch or self._indicator_frame
+        self._predictor = None
+        self._predictor_lock = threading.Lock()
+        self.info_fetch = info_fetch
+        self._metadata = metadata
+        self.change_seq = self.store.last_change()
+        self.alerts = self.load_alerts()
+        self.build_index()
+    @property
+    def metadata(self):
+        """Symbol metadata cache, created on first use (alert checking never needs it)"""
+        if self._metadata is None:
+            self._metadata = MetadataCache(fetch=self.info_fetch)
+        return self._metadata
+    def _indicator_frame(self, symbol):
+        """Stored bars with indicator columns (updated incrementally between checks)"""
+        with self._predictor_lock:
+            if self._predictor is None:
+                from stock_predictor import StockPredictor
+                self._predictor = StockPredictor()
+        df = self._predictor.fetch_data(symbol)
+        # The indicator cache is shared across symbols and not thread-safe
+        with self._predictor_lock:
+            return self._predictor.add_technical_indicators(df, symbol)
+    @staticmethod
+    def _index_kind(alert):
+        """Map an alert to its AlertIndex kind"""
+        if alert['type'] == 'price_above':
+            return 'above'
+        if alert['type'] == 'price_below':
+            return 'below'
+        if alert['type'] == 'percent_change':
+            return 'pct_up' if alert['condition'] == 'increase' else 'pct_down'
+        return None
+    def _index_alert(self, alert):
+        if alert['triggered']:
+            return
+        if alert['type'] == 'rule':
+            try:
+                self.rules.add(alert['id'], alert['symbol'], alert['condition'])
+            except ValueError as e:
+                print(f"Skipping alert {alert['id']}: {e}")
+            return
+        kind = self._index_kind(alert)
+        if kind is not None:
+            self.index.add(alert['id'], alert['symbol'], kind, alert['threshold'])
+    def build_index(self):
+        """Rebuild the threshold index and rule book from the loaded alerts"""
+        self.index = AlertIndex()
+        self.rules = RuleBook()
+        self.alerts_by_id = {a['id']: a for a in self.alerts}
+        for alert in self.alerts:
+            self._index_alert(alert)
+    def _unindex(self, alert_id):
+        self.index.remove(alert_id)
+        self.rules.remove(alert_id)
     def load_alerts(self):
-        """Load saved alerts from file"""
-        if os.path.exists(self.alerts_file):
-            with open(self.alerts_file, 'r') as f:
-                return json.load(f)
-        return []    
-    def save_alerts(self):
-        """Save alerts to file"""
-        with open(self.alerts_file, 'w') as f:
-            json.dump(self.alerts, f, indent=2)    
+        """Load saved alerts (only untriggered ones with ``pending_only``) from the alert store"""
+        return self.store.load('bot', self.pending_only)
+    def reload_alerts(self):
+        """Apply alerts added, changed or removed by other sessions or processes"""
+        changes = self.store.changes('bot', self.change_seq)
+        if changes is None:
+            # Too far behind the change log: start over
+            self.change_seq = self.store.last_change()
+            self.alerts = self.load_alerts()
+            self.build_index()
+            return
+        self.change_seq, changed, removed = changes
+        if not changed and not removed:
+            return
+        for alert_id in removed:
+            self._unindex(alert_id)
+            self.alerts_by_id.pop(alert_id, None)
+        for alert in changed:
+            self._unindex(alert['id'])
+            if self.pending_only and alert['triggered']:
+                self.alerts_by_id.pop(alert['id'], None)
+            else:
+                self.alerts_by_id[alert['id']] = alert
+                self._index_alert(alert)
+        self.alerts = list(self.alerts_by_id.values())
+    def save_alerts(self, alerts=None):
+        """Persist the given alerts (all alerts by default)"""
+        self.store.update_many(self.alerts if alerts is None else alerts)
     def add_alert(self, symbol, alert_type, threshold, condition):
-        """Add a new price alert"""
+        """Add a new alert; for ``rule`` alerts ``condition`` is the rule expression"""
+        if alert_type == 'rule':
+            parse_rule(condition)  # raises ValueError before anything is stored
         alert = {
-            'id': len(self.alerts) + 1,
             'symbol': symbol,
-            'type': alert_type,  # 'price_above', 'price_below', 'percent_change'
+            'type': alert_type,  # 'price_above', 'price_below', 'percent_change', 'rule'
             'threshold': threshold,
             'condition': condition,
             'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'triggered': False
         }
+        self.store.add('bot', alert)
         self.alerts.append(alert)
-        self.save_alerts()
+        self.alerts_by_id[alert['id']] = alert
+        self._index_alert(alert)
         return alert    
-    def check_alerts(self):
+    def pending_symbols(self):
+        """Distinct symbols referenced by alerts that have not triggered yet"""
+        return list(dict.fromkeys(self.index.symbols() + self.rules.symbols()))
+    def quote_symbols(self):
+        """Symbols whose pending alerts read quotes (rule alerts read stored bars)"""
+        return self.index.symbols()
+    def get_snapshot(self, symbols=None):
+        """Fetch one quote snapshot covering pending price alerts and the given symbols"""
+        return self.fetch_quotes(list(dict.fromkeys(self.quote_symbols() + list(symbols or []))))
+    @metrics.timed('check_alerts')
+    def check_alerts(self, snapshot=None):
         """Check all alerts against current prices"""
+        symbols = self.index.symbols()
+        if snapshot is None:
+            # Rule alerts read indicator rows instead of quotes
+            snapshot = self.fetch_quotes(symbols)
         triggered_alerts = []        
-        for alert in self.alerts:
-            if alert['triggered']:
-                continue                
+        metrics.inc('rows_total', len(symbols), op='check_alerts')
+        for symbol in symbols:
             try:
-                stock = yf.Ticker(alert['symbol'])
-                current_price = stock.history(period='1d')['Close'].iloc[-1]                
-                is_triggered = False
-                if alert['type'] == 'price_above' and current_price > alert['threshold']:
-                    is_triggered = True
-                elif alert['type'] == 'price_below' and current_price < alert['threshold']:
-                    is_triggered = True
-                elif alert['type'] == 'percent_change':
-                    # Get yesterday's price
-                    hist = stock.history(period='2d')
-                    if len(hist) >= 2:
-                        yesterday_price = hist['Close'].iloc[-2]
-                        pct_change = ((current_price - yesterday_price) / yesterday_price) * 100
-                        if alert['condition'] == 'increase' and pct_change > alert['threshold']:
-                            is_triggered = True
-                        elif alert['condition'] == 'decrease' and pct_change < -alert['threshold']:
-                            is_triggered = True                
-                if is_triggered:
+                quote = snapshot.change(symbol)
+                if quote is None:
+                    continue
+                current_price, _, pct_change = quote
+                # Binary search over sorted thresholds instead of scanning every alert
+                for alert_id in sorted(self.index.triggered(symbol, current_price, pct_change)):
+                    alert = self.alerts_by_id[alert_id]
                     alert['triggered'] = True
                     alert['triggered_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                     alert['triggered_price'] = current_price
+                    self.index.remove(alert_id)
                     triggered_alerts.append(alert.copy())
                     
             except Exception as e:
+                metrics.inc('errors_total', op='check_alerts')
                 print(f"Error checking alert: {e}")
         
+        if len(self.rules):
+            triggered_alerts.extend(self._check_rules())
+        
         if triggered_alerts:
-            self.save_alerts()
+            metrics.inc('alerts_triggered_total', len(triggered_alerts))
+            self.save_alerts(triggered_alerts)
             
         return triggered_alerts
     
-    def get_market_summary(self, symbols=None):
+    def rule_snapshot(self, symbols=None):
+        """Latest two indicator rows of every symbol with pending rules (loaded concurrently)"""
+        symbols = list(symbols or self.rules.symbols())
+        frames = {}
+        if not symbols:
+            return RuleSnapshot(frames)
+        with ThreadPoolExecutor(max_workers=min(Config.ALERT_FETCH_CONCURRENCY, len(symbols))) as pool:
+            futures = {symbol: pool.submit(self.fetch_frame, symbol) for symbol in symbols}
+            for symbol, future in futures.items():
+                try:
+                    frames[symbol] = future.result()
+                except Exception as e:
+                    metrics.inc('errors_total', op='check_rules')
+                    print(f"Error loading indicators for {symbol}: {e}")
+        return RuleSnapshot(frames)
+    def _check_rules(self, snapshot=None):
+        """Evaluate every pending rule alert at once against the latest indicator rows"""
+        if snapshot is None:
+            snapshot = self.rule_snapshot()
+        metrics.inc('rows_total', len(self.rules), op='check_rules')
+        triggered_alerts = []
+        for alert_id in sorted(self.rules.triggered(snapshot)):
+            alert = self.alerts_by_id[alert_id]
+            alert['triggered'] = True
+            alert['triggered_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            alert['triggered_price'] = round(snapshot.value(alert['symbol']), 2)
+            self.rules.remove(alert_id)
+            triggered_alerts.append(alert.copy())
+        return triggered_alerts
+    
+    def check_snapshot(self, snapshot):
+        """Entry point for the background AlertDaemon"""
+        return self.check_alerts(snapshot)
+    
+    def get_market_summary(self, symbols=None, snapshot=None):
         """Get summary for multiple stocks"""
-        if symbols is None:
-            symbols = ['^GSPC', 'AAPL', 'MSFT', 'GOOGL']
-        
-        summary = []
-        for symbol in symbols:
-            try:
-                stock = yf.Ticker(symbol)
-                info = stock.info
-                hist = stock.history(period='5d')
-                
-                if not hist.empty:
-                    current = hist['Close'].iloc[-1]
-                    prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                    change = current - prev_close
-                    change_pct = (change / prev_close) * 100
-                    
-                    summary.append({
-                        'symbol': symbol,
-                        'name': info.get('shortName', symbol),
-                        'price': round(current, 2),
-                        'change': round(change, 2),
-                        'change_pct': round(change_pct, 2),
-                        'volume': info.get('volume', 0),
-                        'market_cap': info.get('marketCap', 0)
-                    })
-            except:
-                continue        
-        return summary    
+        return market_summary(symbols, snapshot, quote_fetch=self.fetch_quotes, metadata=self.metadata)
     def remove_alert(self, alert_id):
         """Remove an alert by ID"""
         self.alerts = [a for a in self.alerts if a['id'] != alert_id]
-        self.save_alerts()
+        self.alerts_by_id.pop(alert_id, None)
+        self._unindex(alert_id)
+        self.store.remove(alert_id)
         return True
\ No newline at end of file
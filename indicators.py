@@ -0,0 +1,422 @@
+# indicators.py
+"""Streaming technical indicators.
+
+Each indicator can be seeded from a history of values (vectorized) and then
+updated one bar at a time in constant time. The formulas follow the ``ta``
+batch implementations used in ``StockPredictor.add_technical_indicators`` so
+incremental rows match the batch path.
+"""
+import copy
+import math
+from collections import OrderedDict, deque
+import numpy as np
+import pandas as pd
+import metrics
+
+NAN = float('nan')
+
+
+class RollingSum:
+    """Sliding-window sum with Neumaier compensation"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def _add(self, x):
+        t = self.total + x
+        if abs(self.total) >= abs(x):
+            self.compensation += (self.total - t) + x
+        else:
+            self.compensation += (x - t) + self.total
+        self.total = t
+
+    def seed(self, values):
+        tail = [float(v) for v in np.asarray(values, dtype=float)[-self.window:]]
+        self.values = deque(tail)
+        self.total = math.fsum(tail)
+        self.compensation = 0.0
+
+    def update(self, x):
+        self.values.append(x)
+        self._add(x)
+        if len(self.values) > self.window:
+            self._add(-self.values.popleft())
+        return self.total + self.compensation
+
+    @property
+    def full(self):
+        return len(self.values) >= self.window
+
+    @property
+    def value(self):
+        return self.total + self.compensation
+
+
+class RollingMean:
+    """Simple moving average (``Series.rolling(window).mean()``)"""
+
+    def __init__(self, window):
+        self.sum = RollingSum(window)
+
+    def seed(self, values):
+        self.sum.seed(values)
+        return self.value
+
+    def update(self, x):
+        self.sum.update(float(x))
+        return self.value
+
+    @property
+    def value(self):
+        if not self.sum.full:
+            return NAN
+        return self.sum.value / self.sum.window
+
+
+class EMA:
+    """Exponential moving average (``Series.ewm(adjust=False).mean()``).
+
+    Leading NaN inputs are skipped, as pandas does, and the output stays NaN
+    until ``min_periods`` observations have been seen.
+    """
+
+    def __init__(self, span=None, alpha=None, min_periods=0):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+        self.min_periods = min_periods
+        self.mean = NAN
+        self.count = 0
+
+    def seed(self, values):
+        series = pd.Series(np.asarray(values, dtype=float))
+        self.count = int(series.notna().sum())
+        if self.count:
+            self.mean = float(series.ewm(alpha=self.alpha, adjust=False).mean().iloc[-1])
+        return self.value
+
+    def update(self, x):
+        if x != x:
+            return self.value
+        if self.count == 0:
+            self.mean = float(x)
+        else:
+            self.mean = (1.0 - self.alpha) * self.mean + self.alpha * x
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        return self.mean if self.count >= max(self.min_periods, 1) else NAN
+
+
+class Diff:
+    """One-bar difference (``Series.diff()``)"""
+
+    def __init__(self):
+        self.previous = NAN
+
+    def seed(self, values):
+        values = np.asarray(values, dtype=float)
+        self.previous = float(values[-1]) if len(values) else NAN
+        return float(values[-1] - values[-2]) if len(values) > 1 else NAN
+
+    def update(self, x):
+        result = x - self.previous
+        self.previous = float(x)
+        return result
+
+
+class PctChange(Diff):
+    """One-bar percent change (``Series.pct_change()``)"""
+
+    def seed(self, values):
+        values = np.asarray(values, dtype=float)
+        self.previous = float(values[-1]) if len(values) else NAN
+        return float(values[-1] / values[-2] - 1) if len(values) > 1 else NAN
+
+    def update(self, x):
+        previous = self.previous
+        self.previous = float(x)
+        return x / previous - 1 if previous == previous else NAN
+
+
+class WilderRSI:
+    """RSI with Wilder smoothing, as ``ta.momentum.RSIIndicator``"""
+
+    def __init__(self, window=14):
+        self.window = window
+        self.previous = NAN
+        self.up = EMA(alpha=1.0 / window, min_periods=window)
+        self.down = EMA(alpha=1.0 / window, min_periods=window)
+
+    def seed(self, values):
+        close = pd.Series(np.asarray(values, dtype=float))
+        diff = close.diff(1)
+        self.up.seed(diff.where(diff > 0, 0.0).values)
+        self.down.seed((-diff.where(diff < 0, 0.0)).values)
+        self.previous = float(close.iloc[-1]) if len(close) else NAN
+        return self.value
+
+    def update(self, x):
+        # The first diff is NaN and ``ta`` maps it to a zero move
+        diff = x - self.previous
+        self.previous = float(x)
+        self.up.update(diff if diff > 0 else 0.0)
+        self.down.update(-diff if diff < 0 else 0.0)
+        return self.value
+
+    @property
+    def value(self):
+        up, down = self.up.value, self.down.value
+        if down == 0:
+            return 100.0
+        return 100 - (100 / (1 + up / down))
+
+
+class SimpleRSI:
+    """RSI from simple moving averages of gains and losses (``DataFetcher._calculate_rsi``)"""
+
+    def __init__(self, window=14):
+        self.previous = NAN
+        self.gain = RollingMean(window)
+        self.loss = RollingMean(window)
+
+    def seed(self, values):
+        prices = pd.Series(np.asarray(values, dtype=float))
+        delta = prices.diff()
+        self.gain.seed(delta.where(delta > 0, 0).values)
+        self.loss.seed((-delta.where(delta < 0, 0)).values)
+        self.previous = float(prices.iloc[-1]) if len(prices) else NAN
+        return self.value
+
+    def update(self, x):
+        delta = x - self.previous
+        self.previous = float(x)
+        self.gain.update(delta if delta > 0 else 0.0)
+        self.loss.update(-delta if delta < 0 else 0.0)
+        return self.value
+
+    @property
+    def value(self):
+        gain, loss = self.gain.value, self.loss.value
+        if loss == 0:
+            return NAN if gain == 0 else 100.0
+        return 100 - (100 / (1 + gain / loss))
+
+
+class MACD:
+    """MACD line and signal from a chain of EMAs, as ``ta.trend.MACD``"""
+
+    def __init__(self, window_slow=26, window_fast=12, window_sign=9):
+        self.window_slow = window_slow
+        self.window_fast = window_fast
+        self.fast = EMA(span=window_fast, min_periods=window_fast)
+        self.slow = EMA(span=window_slow, min_periods=window_slow)
+        self.signal = EMA(span=window_sign, min_periods=window_sign)
+
+    def seed(self, values):
+        close = pd.Series(np.asarray(values, dtype=float))
+        fast = close.ewm(span=self.window_fast, min_periods=self.window_fast, adjust=False).mean()
+        slow = close.ewm(span=self.window_slow, min_periods=self.window_slow, adjust=False).mean()
+        self.fast.seed(close.values)
+        self.slow.seed(close.values)
+        self.signal.seed((fast - slow).values)
+        return self.value
+
+    def update(self, x):
+        self.fast.update(x)
+        self.slow.update(x)
+        self.signal.update(self.fast.value - self.slow.value)
+        return self.value
+
+    @property
+    def value(self):
+        return self.fast.value - self.slow.value, self.signal.value
+
+
+class BollingerBands:
+    """Upper and lower bands from a Welford sliding-window variance (ddof=0)"""
+
+    def __init__(self, window=20, window_dev=2):
+        self.window = window
+        self.window_dev = window_dev
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def seed(self, values):
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        for x in np.asarray(values, dtype=float)[-self.window:]:
+            self._add(float(x))
+        return self.value
+
+    def _add(self, x):
+        self.values.append(x)
+        n = len(self.values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self):
+        y = self.values.popleft()
+        n = len(self.values)
+        if n == 0:
+            self.mean, self.m2 = 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.mean = (old_mean * (n + 1) - y) / n
+        self.m2 -= (y - old_mean) * (y - self.mean)
+
+    def update(self, x):
+        self._add(float(x))
+        if len(self.values) > self.window:
+            self._remove()
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window:
+            return NAN, NAN
+        std = math.sqrt(max(self.m2, 0.0) / len(self.values))
+        return self.mean + self.window_dev * std, self.mean - self.window_dev * std
+
+
+# (output columns, input column, factory) for StockPredictor.add_technical_indicators
+TECHNICAL_SPEC = [
+    (('SMA_20',), 'Close', lambda: RollingMean(20)),
+    (('SMA_50',), 'Close', lambda: RollingMean(50)),
+    (('RSI',), 'Close', lambda: WilderRSI(14)),
+    (('MACD', 'MACD_signal'), 'Close', MACD),
+    (('BB_upper', 'BB_lower'), 'Close', BollingerBands),
+    (('Volume_SMA',), 'Volume', lambda: RollingMean(20)),
+    (('Daily_Return',), 'Close', PctChange),
+    (('Price_Change',), 'Close', Diff),
+]
+
+# Indicators added by DataFetcher.fetch_data
+BASIC_SPEC = [
+    (('MA_20',), 'Close', lambda: RollingMean(20)),
+    (('MA_50',), 'Close', lambda: RollingMean(50)),
+    (('RSI',), 'Close', lambda: SimpleRSI(14)),
+]
+
+
+class IndicatorEngine:
+    """A set of streaming indicators updated together, one bar at a time"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.indicators = [factory() for _, _, factory in spec]
+        self.columns = [c for columns, _, _ in spec for c in columns]
+        self.last_index = None
+        self._checkpoint = None
+
+    def seed(self, df):
+        """Initialise all indicator states from a history of bars.
+
+        The last bar is fed through ``update`` so that it can be amended later.
+        """
+        history = df.iloc[:-1]
+        for (_, field, _), indicator in zip(self.spec, self.indicators):
+            indicator.seed(history[field].values)
+        self.last_index = history.index[-1] if len(history) else None
+        self._checkpoint = None
+        if len(df):
+            self.update(df.iloc[-1], df.index[-1])
+        return self
+
+    def update(self, bar, index=None, checkpoint=True):
+        """Feed one new bar (a mapping of fields) and return its indicator values"""
+        self._checkpoint = (copy.deepcopy(self.indicators), self.last_index) if checkpoint else None
+        row = {}
+        for (columns, field, _), indicator in zip(self.spec, self.indicators):
+            result = indicator.update(float(bar[field]))
+            if len(columns) == 1:
+                row[columns[0]] = result
+            else:
+                row.update(zip(columns, result))
+        self.last_index = index
+        return row
+
+    def amend(self, bar, index=None):
+        """Replace the most recent bar, e.g. a still-forming daily candle"""
+        if self._checkpoint is None:
+            raise ValueError("No bar to amend")
+        self.indicators, self.last_index = self._checkpoint
+        return self.update(bar, index)
+
+    def extend(self, bars):
+        """Update with every bar in a frame and return the new indicator rows.
+
+        Only the final bar is checkpointed, so each update stays O(1).
+        """
+        last = len(bars) - 1
+        rows = [self.update(bar, index, checkpoint=(i == last))
+                for i, (index, bar) in enumerate(bars.iterrows())]
+        return pd.DataFrame(rows, index=bars.index, columns=self.columns)
+
+
+class IndicatorCache:
+    """Keeps enriched frames and engine state so new bars are added incrementally.
+
+    ``batch`` computes the indicator columns for a whole frame and is used on a
+    miss; afterwards only the new or amended trailing bars are run through the
+    engine.
+    """
+
+    def __init__(self, spec, batch, max_entries=256):
+        self.spec = spec
+        self.batch = batch
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def apply(self, key, df):
+        """Return ``df`` with indicator columns added (NaN warm-up rows kept)"""
+        if df.empty:
+            return self.batch(df)
+        key = (key, df.index[0])
+        entry = self.entries.get(key)
+        enriched = None
+        if entry is not None:
+            enriched = self._extend(entry, df)
+        if enriched is None:
+            metrics.inc('cache_total', cache='indicators', result='miss')
+            enriched = self.batch(df.copy())
+            entry = {'engine': IndicatorEngine(self.spec).seed(df)}
+        else:
+            metrics.inc('cache_total', cache='indicators',
+                        result='hit' if enriched is entry['frame'] else 'extend')
+        entry['frame'] = enriched
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return enriched.copy()
+
+    @staticmethod
+    def _extend(entry, df):
+        frame, engine = entry['frame'], entry['engine']
+        n = len(frame)
+        if len(df) < n or df.index[n - 1] != frame.index[-1]:
+            return None
+        if n > 1 and df['Close'].iloc[n - 2] != frame['Close'].iloc[-2]:
+            return None
+        raw_columns = [c for c in df.columns if c not in engine.columns]
+        last_same = df[raw_columns].iloc[n - 1].equals(frame[raw_columns].iloc[-1])
+        if last_same and len(df) == n:
+            return frame
+        frame = frame.iloc[:-1] if not last_same else frame
+        start = n - 1 if not last_same else n
+        new_bars = df[raw_columns].iloc[start:]
+        if not last_same:
+            first = engine.amend(new_bars.iloc[0], new_bars.index[0])
+            rows = pd.DataFrame([first], index=new_bars.index[:1], columns=engine.columns)
+            if len(new_bars) > 1:
+                rows = pd.concat([rows, engine.extend(new_bars.iloc[1:])])
+        else:
+            rows = engine.extend(new_bars)
+        return pd.concat([frame, pd.concat([new_bars, rows], axis=1)])
@@ -0,0 +1,139 @@
+# metadata_cache.py
+import os
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import Config
+from provider import get_client
+import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    symbol TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+class MetadataCache:
+    """Persistent symbol metadata (``.info``: name, market cap, sector, ...).
+
+    Kept apart from the price store because it changes rarely and is the
+    slowest provider call. Entries live in SQLite and in memory; an entry
+    older than ``ttl`` is still returned and refreshed in the background, so
+    only a symbol seen for the first time waits for the provider.
+    """
+
+    def __init__(self, path=None, ttl=None, fetch=None, max_workers=4, miss_timeout=30):
+        self.path = path or Config.METADATA_DB
+        self.ttl = Config.METADATA_TTL if ttl is None else ttl
+        self.fetch = fetch or get_client().info
+        self.miss_timeout = miss_timeout
+        self.memory = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='metadata')
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+        return conn
+
+    def _read(self, symbols):
+        if not symbols:
+            return {}
+        placeholders = ','.join('?' * len(symbols))
+        rows = self._connect().execute(
+            f'SELECT symbol, fetched_at, data FROM metadata WHERE symbol IN ({placeholders})',
+            list(symbols)).fetchall()
+        return {symbol: (json.loads(data), fetched_at) for symbol, fetched_at, data in rows}
+
+    def _refresh(self, symbol):
+        try:
+            data = self.fetch(symbol)
+        except Exception as e:
+            metrics.inc('errors_total', op='metadata_refresh')
+            print(f"Error fetching metadata for {symbol}: {e}")
+            return None
+        if not data:
+            return None
+        fetched_at = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute('INSERT OR REPLACE INTO metadata (symbol, fetched_at, data) VALUES (?, ?, ?)',
+                             (symbol, fetched_at, json.dumps(data, default=str)))
+        except sqlite3.Error as e:
+            print(f"Error storing metadata for {symbol}: {e}")
+        with self.lock:
+            self.memory[symbol] = (data, fetched_at)
+        return data
+
+    def refresh(self, symbol):
+        """Schedule a background refresh (joining one already running); returns its future"""
+        with self.lock:
+            future = self.pending.get(symbol)
+            if future is None:
+                future = self.pool.submit(self._refresh, symbol)
+                self.pending[symbol] = future
+                future.add_done_callback(lambda f, symbol=symbol: self._done(symbol, f))
+        return future
+
+    def _done(self, symbol, future):
+        with self.lock:
+            if self.pending.get(symbol) is future:
+                del self.pending[symbol]
+
+    def get_many(self, symbols):
+        """Return {symbol: metadata dict} ({} where nothing could be fetched)"""
+        symbols = list(dict.fromkeys(symbols))
+        with self.lock:
+            entries = {s: self.memory[s] for s in symbols if s in self.memory}
+        stored = self._read([s for s in symbols if s not in entries])
+        with self.lock:
+            self.memory.update(stored)
+        entries.update(stored)
+
+        now = time.time()
+        result, missing = {}, {}
+        for symbol in symbols:
+            entry = entries.get(symbol)
+            if entry is None:
+                metrics.inc('cache_total', cache='metadata', result='miss')
+                missing[symbol] = self.refresh(symbol)
+                continue
+            data, fetched_at = entry
+            if now - fetched_at > self.ttl:
+                metrics.inc('cache_total', cache='metadata', result='stale')
+                self.refresh(symbol)
+            else:
+                metrics.inc('cache_total', cache='metadata', result='hit')
+            result[symbol] = data
+
+        # Unknown symbols are fetched concurrently and awaited once
+        if missing:
+            wait(missing.values(), timeout=self.miss_timeout)
+            for symbol, future in missing.items():
+                result[symbol] = (future.result() if future.done() else None) or {}
+        return result
+
+    def get(self, symbol):
+        return self.get_many([symbol])[symbol]
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+        with self._connect() as conn:
+            conn.execute('DELETE FROM metadata')
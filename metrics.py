@@ -0,0 +1,287 @@
+# metrics.py
+"""Lightweight in-process metrics for the hot paths.
+
+Latencies go into fixed-bucket histograms and everything else (calls, rows,
+cache lookups, errors) into counters, both keyed by a name plus labels such
+as ``op="fetch_data"``. Recording is a dict update under a lock, so it is
+cheap enough to leave on everywhere. Metrics can be exported as Prometheus
+text or JSON, and snapshots taken in worker processes can be merged back
+into the parent's registry.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+PREFIX = 'aurex_'
+
+# Upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+
+class Histogram:
+    """Cumulative-style bucket counts plus sum and count"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside the matching bucket"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def to_dict(self):
+        return {'buckets': list(self.buckets), 'counts': list(self.counts),
+                'sum': self.sum, 'count': self.count}
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data['buckets'])
+        hist.counts = list(data['counts'])
+        hist.sum = data['sum']
+        hist.count = data['count']
+        return hist
+
+    def merge(self, other):
+        if other.buckets != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+
+class MetricsRegistry:
+    """Counters and histograms keyed by (name, labels)"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, op):
+        """Record the latency of a block under ``op``; exceptions count as errors"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc('errors_total', op=op)
+            raise
+        finally:
+            self.observe('latency_seconds', time.perf_counter() - start, op=op)
+
+    def _snapshot(self):
+        return {
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in self.counters.items()],
+            'histograms': [{'name': name, 'labels': dict(labels), **hist.to_dict()}
+                           for (name, labels), hist in self.histograms.items()],
+        }
+
+    def snapshot(self):
+        """JSON-serialisable copy of all metrics"""
+        with self.lock:
+            return self._snapshot()
+
+    def drain(self):
+        """Return a snapshot and reset, e.g. to ship a worker's metrics to the parent"""
+        with self.lock:
+            snapshot = self._snapshot()
+            self.counters = {}
+            self.histograms = {}
+        return snapshot
+
+    def merge(self, snapshot):
+        """Add a snapshot (from ``snapshot`` or ``drain``) into this registry"""
+        with self.lock:
+            for counter in snapshot.get('counters', []):
+                key = (counter['name'], _label_key(counter['labels']))
+                self.counters[key] = self.counters.get(key, 0) + counter['value']
+            for data in snapshot.get('histograms', []):
+                key = (data['name'], _label_key(data['labels']))
+                hist = Histogram.from_dict(data)
+                if key in self.histograms:
+                    self.histograms[key].merge(hist)
+                else:
+                    self.histograms[key] = hist
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+
+    def latency_table(self, quantiles=(0.5, 0.95, 0.99)):
+        """One row per operation: calls, errors, mean and quantile latencies in ms"""
+        with self.lock:
+            histograms = {dict(labels).get('op'): hist for (name, labels), hist
+                          in self.histograms.items() if name == 'latency_seconds'}
+            errors = {dict(labels).get('op'): value for (name, labels), value
+                      in self.counters.items() if name == 'errors_total'}
+            rows = []
+            for op, hist in sorted(histograms.items()):
+                row = {'op': op, 'calls': hist.count, 'errors': errors.get(op, 0),
+                       'mean_ms': 1000 * hist.sum / hist.count if hist.count else None}
+                for q in quantiles:
+                    value = hist.quantile(q)
+                    row[f'p{int(q * 100)}_ms'] = None if value is None else 1000 * value
+                rows.append(row)
+        return rows
+
+    def cache_ratios(self):
+        """{cache: {result: count, ..., 'hit_ratio': float}} from ``cache_total``.
+
+        Every result other than ``miss`` (e.g. an incremental ``extend``)
+        counts as a hit.
+        """
+        caches = {}
+        with self.lock:
+            for (name, labels), value in self.counters.items():
+                if name != 'cache_total':
+                    continue
+                labels = dict(labels)
+                results = caches.setdefault(labels.get('cache'), {})
+                results[labels.get('result')] = results.get(labels.get('result'), 0) + value
+        for results in caches.values():
+            total = sum(results.values())
+            results['hit_ratio'] = (total - results.get('miss', 0)) / total if total else None
+        return caches
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+            seen = set()
+            for (name, labels), value in counters:
+                metric = PREFIX + name
+                if metric not in seen:
+                    lines.append(f'# TYPE {metric} counter')
+                    seen.add(metric)
+                lines.append(f'{metric}{_format_labels(labels)} {value}')
+            for (name, labels), hist in histograms:
+                metric = PREFIX + name
+                if metric not in seen:
+                    lines.append(f'# TYPE {metric} histogram')
+                    seen.add(metric)
+                cumulative = 0
+                for bound, n in zip(list(hist.buckets) + ['+Inf'], hist.counts):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+                lines.append(f'{metric}_sum{_format_labels(labels)} {hist.sum}')
+                lines.append(f'{metric}_count{_format_labels(labels)} {hist.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path):
+        """Atomically write a snapshot to ``path``"""
+        payload = dict(self.snapshot(), written_at=time.time(), pid=os.getpid())
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+
+
+def timed(op):
+    """Decorator recording latency, call count and errors of a function under ``op``"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with REGISTRY.timer(op):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_exporter(port=None, json_path=None, interval=60, registry=None):
+    """Serve ``/metrics`` on ``port`` and/or write ``json_path`` every ``interval`` seconds.
+
+    Both run in daemon threads; returns the HTTP server (or None).
+    """
+    registry = registry or REGISTRY
+    server = None
+    if port:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('', port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+
+    if json_path:
+        def write_loop():
+            while True:
+                try:
+                    registry.write_json(json_path)
+                except Exception as e:
+                    print(f"Error writing metrics: {e}")
+                time.sleep(interval)
+
+        threading.Thread(target=write_loop, name='metrics-json', daemon=True).start()
+    return server
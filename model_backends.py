@@ -0,0 +1,53 @@
+# model_backends.py
+"""Interchangeable regressors for the price predictors.
+
+Each backend is a factory for an unfitted scikit-learn estimator, picked by
+name (``Config.MODEL_BACKEND`` / ``AUREX_MODEL_BACKEND`` per deployment).
+scikit-learn is imported only when a model is built.
+"""
+from config import Config
+
+
+def _forest():
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor(n_estimators=100, random_state=42)
+
+
+def _fast_forest():
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor(n_estimators=30, n_jobs=-1, random_state=42)
+
+
+def _hist_gb():
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    return HistGradientBoostingRegressor(random_state=42)
+
+
+def _ridge():
+    # Closed-form solution on the standardized features
+    from sklearn.linear_model import Ridge
+    return Ridge(alpha=1.0, solver='cholesky')
+
+
+BACKENDS = {
+    'forest': _forest,
+    'fast_forest': _fast_forest,
+    'hist_gb': _hist_gb,
+    'ridge': _ridge,
+}
+
+
+def make_model(name=None):
+    """A new unfitted estimator for backend ``name`` (default: configured backend)"""
+    name = name or Config.MODEL_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown model backend: {name} (choose from {', '.join(sorted(BACKENDS))})")
+    return BACKENDS[name]()
+
+
+def for_targets(model, n_targets):
+    """Wrap ``model`` so it can fit several target columns if it cannot natively"""
+    if n_targets <= 1 or model.__sklearn_tags__().target_tags.multi_output:
+        return model
+    from sklearn.multioutput import MultiOutputRegressor
+    return MultiOutputRegressor(model)
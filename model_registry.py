@@ -0,0 +1,100 @@
+# model_registry.py
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+import pandas as pd
+from config import Config
+import metrics
+
+
+def feature_hash(columns, params=None):
+    """Short stable hash of the feature set and model parameters"""
+    payload = json.dumps({'columns': list(columns), 'params': params or {}},
+                         sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+class ModelRegistry:
+    """Fitted models keyed by symbol, horizon, feature hash and last bar.
+
+    Entries live on disk as joblib files, with the most recently used ones
+    also kept in an in-memory LRU. Storing a new version for a symbol,
+    horizon and feature set removes the older versions.
+    """
+
+    def __init__(self, directory=None, max_entries=None):
+        self.directory = directory or Config.MODEL_DIR
+        self.max_entries = max_entries or Config.MODEL_CACHE_SIZE
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def _stamp(last_timestamp):
+        return pd.Timestamp(last_timestamp).strftime('%Y%m%dT%H%M%S')
+
+    def _prefix(self, symbol, horizon, fhash):
+        return f"{quote(symbol, safe='')}_h{horizon}_{fhash}_"
+
+    def _path(self, symbol, horizon, fhash, last_timestamp):
+        name = f"{self._prefix(symbol, horizon, fhash)}{self._stamp(last_timestamp)}.joblib"
+        return os.path.join(self.directory, name)
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, symbol, horizon, fhash, last_timestamp):
+        """Return the stored entry dict, or None if there is no current model"""
+        key = (symbol, horizon, fhash, self._stamp(last_timestamp))
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                metrics.inc('cache_total', cache='models', result='hit')
+                return self.memory[key]
+        path = self._path(symbol, horizon, fhash, last_timestamp)
+        if not os.path.exists(path):
+            metrics.inc('cache_total', cache='models', result='miss')
+            return None
+        try:
+            import joblib
+            entry = joblib.load(path)
+        except Exception as e:
+            metrics.inc('errors_total', op='model_load')
+            print(f"Error loading model {path}: {e}")
+            return None
+        metrics.inc('cache_total', cache='models', result='disk')
+        with self.lock:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, symbol, horizon, fhash, last_timestamp, entry):
+        """Store an entry (e.g. model, scaler, training info) and evict stale versions"""
+        stamp = self._stamp(last_timestamp)
+        path = self._path(symbol, horizon, fhash, last_timestamp)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            import joblib
+            joblib.dump(entry, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error saving model {path}: {e}")
+        with self.lock:
+            for key in [k for k in self.memory if k[:3] == (symbol, horizon, fhash) and k[3] != stamp]:
+                del self.memory[key]
+            self._remember((symbol, horizon, fhash, stamp), entry)
+        self._evict_stale(symbol, horizon, fhash, os.path.basename(path))
+
+    def _evict_stale(self, symbol, horizon, fhash, keep):
+        prefix = self._prefix(symbol, horizon, fhash)
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith('.joblib') and name != keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
@@ -0,0 +1,175 @@
+# panel.py
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from config import Config
+from price_store import period_start
+
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close')
+
+
+def _dates(index):
+    """Daily bars keyed by calendar date, without timezone"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+class PricePanel:
+    """Daily OHLCV for many symbols in two array blocks over one shared date index.
+
+    Prices are float32 with shape (slots, dates, 4) and volume is int64 with
+    shape (slots, dates); a symbol occupies one slot. ``view`` and ``frame``
+    return slices of those blocks without copying. Storage grows by doubling
+    up to ``max_bytes``; beyond that the least recently used symbol is
+    evicted and its slot reused. Growing reallocates the blocks, so views
+    taken earlier keep pointing at the old arrays. Eviction overwrites the
+    slot in place, so a view of an evicted symbol silently shows the bars of
+    whichever symbol took its slot; use views only while the symbol is
+    resident (e.g. within one pass over ``symbols``).
+    """
+
+    def __init__(self, dates, max_bytes=None, capacity=16):
+        self.dates = pd.DatetimeIndex(sorted(set(_dates(dates))))
+        self.max_bytes = max_bytes or Config.PANEL_MAX_BYTES
+        capacity = max(1, min(capacity, self.max_slots))
+        self.prices = np.full((capacity, len(self.dates), len(PRICE_FIELDS)), np.nan, dtype=np.float32)
+        self.volumes = np.zeros((capacity, len(self.dates)), dtype=np.int64)
+        self.slots = OrderedDict()
+        self.ranges = {}
+        self.free = list(range(capacity - 1, -1, -1))
+
+    @property
+    def slot_bytes(self):
+        return len(self.dates) * (len(PRICE_FIELDS) * 4 + 8)
+
+    @property
+    def max_slots(self):
+        return max(1, self.max_bytes // max(self.slot_bytes, 1))
+
+    @property
+    def capacity(self):
+        return self.prices.shape[0]
+
+    @property
+    def nbytes(self):
+        return self.prices.nbytes + self.volumes.nbytes
+
+    @property
+    def symbols(self):
+        return list(self.slots)
+
+    def __contains__(self, symbol):
+        return symbol in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _grow(self):
+        old_capacity = self.capacity
+        new_capacity = min(old_capacity * 2, self.max_slots)
+        if new_capacity <= old_capacity:
+            return False
+        extra = new_capacity - old_capacity
+        self.prices = np.concatenate([
+            self.prices,
+            np.full((extra,) + self.prices.shape[1:], np.nan, dtype=np.float32)
+        ])
+        self.volumes = np.concatenate([
+            self.volumes, np.zeros((extra, self.volumes.shape[1]), dtype=np.int64)
+        ])
+        self.free.extend(range(new_capacity - 1, old_capacity - 1, -1))
+        return True
+
+    def _slot_for(self, symbol):
+        if symbol in self.slots:
+            return self.slots[symbol]
+        if not self.free and not self._grow():
+            evicted, slot = self.slots.popitem(last=False)
+            self.ranges.pop(evicted, None)
+            self.free.append(slot)
+        return self.free.pop()
+
+    def add(self, symbol, df):
+        """Store (or replace) a symbol's bars; dates outside the panel are ignored"""
+        slot = self._slot_for(symbol)
+        self.prices[slot] = np.nan
+        self.volumes[slot] = 0
+        positions = self.dates.get_indexer(_dates(df.index))
+        found = positions >= 0
+        rows = positions[found]
+        self.prices[slot, rows] = df.loc[found, list(PRICE_FIELDS)].to_numpy(dtype=np.float32)
+        if 'Volume' in df:
+            self.volumes[slot, rows] = df.loc[found, 'Volume'].fillna(0).to_numpy(dtype=np.int64)
+        self.slots[symbol] = slot
+        self.slots.move_to_end(symbol)
+        self.ranges[symbol] = (int(rows.min()), int(rows.max()) + 1) if len(rows) else (0, 0)
+
+    def remove(self, symbol):
+        slot = self.slots.pop(symbol, None)
+        if slot is not None:
+            self.ranges.pop(symbol, None)
+            self.free.append(slot)
+
+    def view(self, symbol):
+        """Zero-copy (dates, prices, volumes) for the symbol's stored date range"""
+        slot = self.slots[symbol]
+        self.slots.move_to_end(symbol)
+        start, end = self.ranges[symbol]
+        return self.dates[start:end], self.prices[slot, start:end], self.volumes[slot, start:end]
+
+    def frame(self, symbol):
+        """OHLCV DataFrame for one symbol; the float32 price block is not copied"""
+        dates, prices, volumes = self.view(symbol)
+        df = pd.DataFrame(prices, index=dates, columns=list(PRICE_FIELDS), copy=False)
+        df['Volume'] = volumes
+        return df
+
+    def field(self, name, symbols=None):
+        """Date x symbol frame of one price field (copies the selected slots)"""
+        symbols = self.symbols if symbols is None else list(symbols)
+        slots = [self.slots[s] for s in symbols]
+        if name == 'Volume':
+            values = self.volumes[slots].T
+        else:
+            values = self.prices[slots, :, PRICE_FIELDS.index(name)].T
+        return pd.DataFrame(values, index=self.dates, columns=symbols)
+
+    @classmethod
+    def from_store(cls, store, symbols, period='5y', max_bytes=None, max_workers=8):
+        """Load daily bars for many symbols from a PriceStore into one panel.
+
+        Downloads overlap in threads and each frame is copied into the panel
+        as it arrives. The panel spans every calendar day of ``period`` and
+        its budget is raised to fit all symbols, so none is evicted while
+        loading.
+        """
+        symbols = list(dict.fromkeys(symbols))
+
+        def load(symbol):
+            try:
+                return store.get(symbol, period=period)
+            except Exception as e:
+                print(f"Error loading {symbol}: {e}")
+                return pd.DataFrame()
+
+        start = period_start(period)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            loaded = zip(symbols, pool.map(load, symbols))
+            if start is None:
+                # 'max' has no fixed start: the dates come from the data itself
+                loaded = [(symbol, df) for symbol, df in loaded if not df.empty]
+                dates = pd.DatetimeIndex(np.unique(np.concatenate(
+                    [_dates(df.index).values for _, df in loaded]))) if loaded else pd.DatetimeIndex([])
+            else:
+                dates = pd.date_range(start, pd.Timestamp.now().normalize(), freq='D')
+            slot_bytes = len(dates) * (len(PRICE_FIELDS) * 4 + 8)
+            panel = cls(dates, max_bytes=max(max_bytes or Config.PANEL_MAX_BYTES,
+                                             slot_bytes * max(len(symbols), 1)),
+                        capacity=len(symbols) or 1)
+            for symbol, df in loaded:
+                if not df.empty:
+                    panel.add(symbol, df)
+        return panel
@@ -0,0 +1,254 @@
+# panel_model.py
+"""One model trained across the whole universe instead of one per symbol.
+
+Every symbol's ``STOCK_FEATURES`` rows are made scale-free (price columns
+relative to the close, volume against the symbol's own average, RSI in
+0..1), tagged with one target-encoded symbol column (the symbol's mean
+training return, shrunk towards the universe mean) and stacked into one
+float32 matrix. The target is the return over ``horizon`` days, so symbols
+with very different prices share one fit, and thinly traded names borrow
+strength from the rest. One column per symbol would instead grow the matrix
+with the universe (500 symbols x 2y is several hundred MB per copy).
+Predicting the universe is then one ``predict`` call over the latest row of
+every symbol.
+"""
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from features import STOCK_FEATURES, build_feature_matrix
+from model_backends import make_model
+from model_registry import ModelRegistry, feature_hash
+from batch_predictor import RESULT_COLUMNS, normalize_symbols, rank_results
+from panel import PRICE_FIELDS, PricePanel
+import metrics
+
+PANEL_KEY = '__panel__'
+# Rows a symbol needs before its own mean return outweighs the universe mean
+SHRINKAGE = 100
+# Fitted state kept in the model registry
+ENTRY_KEYS = ('symbols', 'symbol_effects', 'global_effect', 'feature_names', 'model',
+              'scaler', 'training_info')
+
+
+def normalize_features(matrix, names):
+    """Scale-free copy of a ``STOCK_FEATURES`` matrix; returns (features, names, close)"""
+    close = matrix[:, names.index('Close')].astype(np.float64)
+    columns, out_names = [], []
+    for i, name in enumerate(names):
+        values = matrix[:, i].astype(np.float64)
+        if name == 'Close':
+            continue
+        if name == 'Volume':
+            log_volume = np.log1p(values)
+            values = log_volume - log_volume.mean()
+        elif name == 'RSI':
+            values = values / 100
+        elif name in ('MACD', 'MACD_signal'):
+            values = values / close
+        else:
+            # Moving averages, bands and lagged closes
+            values = values / close - 1
+        columns.append(values)
+        out_names.append(name)
+    return np.column_stack(columns).astype(np.float32), out_names, close
+
+
+class PanelModel:
+    """Cross-sectional regressor predicting ``horizon``-day returns for many symbols"""
+
+    def __init__(self, horizon=5, backend=None, holdout=0.2):
+        self.horizon = horizon
+        self.backend = backend
+        self.holdout = holdout
+        self.symbols = []
+        self.symbol_effects = {}
+        self.global_effect = 0.0
+        self.feature_names = []
+        self.model = None
+        self.scaler = None
+        self.training_info = None
+
+    def _rows(self, symbol, df):
+        """(features, dates, close, future close) for one enriched frame"""
+        matrix, index, names = build_feature_matrix(df, STOCK_FEATURES)
+        features, self.feature_names, close = normalize_features(matrix, names)
+        future = df['Close'].shift(-self.horizon).reindex(index).to_numpy(dtype=np.float64)
+        return features, index, close, future
+
+    def _design(self, features, symbol):
+        """Append the symbol's encoded effect (the universe mean for unseen symbols)"""
+        effect = self.symbol_effects.get(symbol, self.global_effect)
+        return np.hstack([features, np.full((len(features), 1), effect, dtype=np.float32)])
+
+    @metrics.timed('panel_fit')
+    def fit(self, frames):
+        """Fit once on every symbol in ``frames`` ({symbol: enriched frame})"""
+        from sklearn.base import clone
+        from sklearn.preprocessing import StandardScaler
+        self.symbols = sorted(frames)
+        blocks, dates, closes, targets, owners = [], [], [], [], []
+        for i, symbol in enumerate(self.symbols):
+            features, index, close, future = self._rows(symbol, frames[symbol])
+            known = ~np.isnan(future)
+            blocks.append(features[known])
+            dates.append(_naive_dates(index[known]))
+            closes.append(close[known])
+            targets.append(future[known] / close[known] - 1)
+            owners.append(np.full(known.sum(), i))
+        y = np.concatenate(targets)
+        dates = np.concatenate(dates)
+        close = np.concatenate(closes)
+        owner = np.concatenate(owners)
+        if len(y) < 100:
+            raise ValueError("Not enough rows to fit the panel model")
+        metrics.inc('rows_total', len(y), op='panel_fit')
+
+        # Hold out the most recent dates of every symbol at once (no look-ahead)
+        cutoff = np.quantile(dates.astype(np.int64), 1 - self.holdout)
+        test = dates.astype(np.int64) > cutoff
+        if test.all() or not test.any():
+            raise ValueError("Not enough distinct dates for a holdout period")
+
+        # Symbol effects come from the training rows only
+        train_owner, train_y = owner[~test], y[~test]
+        self.global_effect = float(train_y.mean())
+        counts = np.bincount(train_owner, minlength=len(self.symbols))
+        sums = np.bincount(train_owner, weights=train_y, minlength=len(self.symbols))
+        effects = (sums + SHRINKAGE * self.global_effect) / (counts + SHRINKAGE)
+        self.symbol_effects = dict(zip(self.symbols, effects.astype(float)))
+        X = np.vstack([self._design(block, symbol) for block, symbol in zip(blocks, self.symbols)])
+        del blocks
+
+        self.scaler = StandardScaler()
+        self.model = clone(make_model(self.backend))
+        self.model.fit(self.scaler.fit_transform(X[~test]), train_y)
+        error = np.abs(self.model.predict(self.scaler.transform(X[test])) - y[test]) * close[test]
+        mae_by_symbol = {symbol: float(error[owner[test] == i].mean())
+                         for i, symbol in enumerate(self.symbols) if (owner[test] == i).any()}
+        self.training_info = {
+            'mae': float(error.mean()),
+            'mae_by_symbol': mae_by_symbol,
+            'rows': int(len(y)),
+            'symbols': len(self.symbols),
+            'last_training_date': datetime.now().strftime('%Y-%m-%d'),
+            'features_used': self.feature_names + ['symbol_effect'],
+        }
+        return self.training_info
+
+    @metrics.timed('panel_predict')
+    def predict(self, frames):
+        """Ranked predictions (``batch_predictor`` columns) for every frame in one call"""
+        rows, latest = [], []
+        for symbol, df in frames.items():
+            features, _, close, _ = self._rows(symbol, df)
+            if len(features) == 0:
+                rows.append({'symbol': symbol, 'error': 'Insufficient data'})
+                continue
+            latest.append((symbol, self._design(features[-1:], symbol), close[-1]))
+        if latest:
+            X = np.vstack([design for _, design, _ in latest])
+            returns = self.model.predict(self.scaler.transform(X))
+            prediction_date = (datetime.now() + timedelta(days=self.horizon)).strftime('%Y-%m-%d')
+            for (symbol, _, current), predicted_return in zip(latest, returns):
+                predicted = current * (1 + predicted_return)
+                mae = self.training_info['mae_by_symbol'].get(symbol, self.training_info['mae'])
+                rows.append({
+                    'symbol': symbol,
+                    'current_price': round(float(current), 2),
+                    'predicted_price': round(float(predicted), 2),
+                    'price_change_pct': round(float(predicted_return) * 100, 2),
+                    'prediction_date': prediction_date,
+                    'mae': mae,
+                    'confidence': max(0, min(100, 100 - mae)),
+                    'error': None
+                })
+        return rank_results(rows)
+
+
+def _naive_dates(index):
+    index = pd.DatetimeIndex(index)
+    return (index.tz_localize(None) if index.tz is not None else index).to_numpy()
+
+
+class IndicatorFrames(Mapping):
+    """{symbol: frame with indicators} over a PricePanel, computed on access.
+
+    The bars stay in the panel's float32 blocks and an indicator frame is
+    built only when a symbol is looked up and not kept, so one pass over the
+    universe holds a single float64 frame at a time.
+    """
+
+    def __init__(self, panel, predictor):
+        self.panel = panel
+        self.predictor = predictor
+
+    def __getitem__(self, symbol):
+        if symbol not in self.panel:
+            raise KeyError(symbol)
+        df = self.panel.frame(symbol).astype({c: np.float64 for c in PRICE_FIELDS})
+        # Calendar days without a bar (weekends, holidays) are empty rows
+        df = df[df['Close'].notna()]
+        return self.predictor.add_technical_indicators(df)
+
+    def __contains__(self, symbol):
+        return symbol in self.panel
+
+    def __iter__(self):
+        return iter(self.panel.symbols)
+
+    def __len__(self):
+        return len(self.panel)
+
+    def last_bar(self, symbol):
+        """Date of the symbol's newest bar, without building its frame"""
+        dates, prices, _ = self.panel.view(symbol)
+        known = np.flatnonzero(~np.isnan(prices[:, PRICE_FIELDS.index('Close')]))
+        return dates[known[-1]] if len(known) else None
+
+
+def load_frames(symbols, predictor=None, period='2y', max_workers=8):
+    """Lazy {symbol: frame with indicators} for every symbol that has data"""
+    if predictor is None:
+        from stock_predictor import StockPredictor
+        predictor = StockPredictor()
+    panel = PricePanel.from_store(predictor.store, symbols, period, max_workers=max_workers)
+    return IndicatorFrames(panel, predictor)
+
+
+def predict_universe(symbols=None, days_ahead=5, period='2y', backend=None,
+                     predictor=None, registry=None):
+    """Fit (or reuse) the panel model and predict all symbols in one batch.
+
+    The fitted model is kept in the model registry under the symbol set
+    along with every symbol's last bar, so it is reused until any symbol
+    gets a new bar.
+    """
+    symbols = normalize_symbols(symbols)
+    frames = load_frames(symbols, predictor, period)
+    missing = [{'symbol': s, 'error': 'No data'} for s in symbols if s not in frames]
+    if not frames:
+        return rank_results(missing)
+
+    registry = registry or ModelRegistry()
+    panel = PanelModel(days_ahead, backend)
+    template = make_model(backend)
+    fhash = feature_hash(STOCK_FEATURES.feature_names + sorted(frames),
+                         dict(template.get_params(), estimator=type(template).__name__))
+    last_bars = {symbol: str(frames.last_bar(symbol)) for symbol in frames}
+    last_bar = max(last_bars.values())
+    cached = registry.get(PANEL_KEY, days_ahead, fhash, last_bar)
+    # The key only carries the newest bar; a lagging symbol's new bar is
+    # caught by comparing every symbol's last bar
+    if cached and cached.get('last_bars') == last_bars:
+        for key in ENTRY_KEYS:
+            setattr(panel, key, cached[key])
+    else:
+        panel.fit(frames)
+        entry = {key: getattr(panel, key) for key in ENTRY_KEYS}
+        registry.put(PANEL_KEY, days_ahead, fhash, last_bar, dict(entry, last_bars=last_bars))
+
+    ranked = panel.predict(frames)
+    if missing:
+        ranked = rank_results(ranked[RESULT_COLUMNS].to_dict('records') + missing)
+    return ranked
@@ -0,0 +1,188 @@
+# precompute.py
+"""Headless batch job that precomputes what the app would otherwise do on demand.
+
+For every symbol in the universe it tops up the price store, computes the
+indicators, trains (or reuses) the multi-horizon model and records the
+forecast curve, then adds one market summary for the whole universe. The
+result is written as a versioned JSON artifact; the app loads the newest one
+at startup and only computes live for symbols that are missing from it.
+
+    python precompute.py                      # Config universe
+    python precompute.py --symbols AAPL MSFT --workers 4
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+from config import Config
+from batch_predictor import normalize_symbols
+
+ARTIFACT_VERSION = 1
+ARTIFACT_PATTERN = 'precomputed_*.json'
+
+# One predictor per worker process, created by the pool initializer
+_worker_predictor = None
+
+
+def _init_worker():
+    global _worker_predictor
+    from stock_predictor import StockPredictor
+    _worker_predictor = StockPredictor()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _indicator_snapshot(df):
+    """Latest bar with all indicator columns as plain floats"""
+    last = df.iloc[-1]
+    snapshot = {column: (None if np.isnan(value) else float(value))
+                for column, value in last.items() if np.issubdtype(type(value), np.number)}
+    snapshot['date'] = df.index[-1].isoformat()
+    return snapshot
+
+
+def precompute_symbol(symbol, period='1y', max_horizon=30):
+    """Everything the app needs for one symbol; errors are returned, never raised"""
+    try:
+        if _worker_predictor is None:
+            _init_worker()
+        predictor = _worker_predictor
+        df = predictor.fetch_data(symbol, period)
+        if df.empty:
+            return {'symbol': symbol, 'error': 'No data'}
+        indicators = _indicator_snapshot(predictor.add_technical_indicators(df, symbol))
+        forecast = predictor.predict_horizons(symbol, max_horizon, period)
+        if forecast is None:
+            return {'symbol': symbol, 'indicators': indicators, 'error': 'Insufficient data'}
+        return {'symbol': symbol, 'indicators': indicators, 'forecast': forecast, 'error': None}
+    except Exception as e:
+        return {'symbol': symbol, 'error': str(e)}
+
+
+def run(symbols=None, period='1y', max_horizon=30, max_workers=None, output_dir=None):
+    """Precompute the universe and write an artifact; returns its path"""
+    symbols = normalize_symbols(symbols or Config.PRECOMPUTE_SYMBOLS or None)
+    max_workers = max_workers or Config.BATCH_MAX_WORKERS or os.cpu_count() or 1
+    started = time.time()
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        rows = list(pool.map(precompute_symbol, symbols, [period] * len(symbols),
+                             [max_horizon] * len(symbols)))
+
+    from financial_bot import market_summary
+    try:
+        summary = market_summary(symbols)
+    except Exception as e:
+        print(f"Error building market summary: {e}")
+        summary = []
+
+    artifact = {
+        'version': ARTIFACT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'period': period,
+        'max_horizon': max_horizon,
+        'symbols': symbols,
+        'forecasts': {r['symbol']: r['forecast'] for r in rows if r.get('forecast')},
+        'indicators': {r['symbol']: r['indicators'] for r in rows if r.get('indicators')},
+        'summary': summary,
+        'errors': {r['symbol']: r['error'] for r in rows if r.get('error')},
+        'seconds': round(time.time() - started, 1),
+    }
+    return write_artifact(artifact, output_dir)
+
+
+def write_artifact(artifact, output_dir=None, keep=None):
+    """Atomically write a new artifact and prune all but the newest ``keep``"""
+    output_dir = output_dir or Config.PRECOMPUTE_DIR
+    keep = Config.PRECOMPUTE_KEEP if keep is None else keep
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+    path = os.path.join(output_dir, f'precomputed_{stamp}.json')
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(artifact, f, default=_json_default)
+    os.replace(tmp_path, path)
+    for old in sorted(glob.glob(os.path.join(output_dir, ARTIFACT_PATTERN)))[:-keep]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+    return path
+
+
+class Precomputed:
+    """Read side of an artifact, as used by the app"""
+
+    def __init__(self, artifact, path=None):
+        self.artifact = artifact
+        self.path = path
+        self.created = datetime.fromisoformat(artifact['created'])
+
+    def forecast(self, symbol, max_horizon=30):
+        """The precomputed ``predict_horizons`` result, or None if missing"""
+        if self.artifact.get('max_horizon', 0) < max_horizon:
+            return None
+        forecast = self.artifact['forecasts'].get(symbol)
+        if forecast is None:
+            return None
+        return dict(forecast, predictions=forecast['predictions'][:max_horizon])
+
+    def indicators(self, symbol):
+        return self.artifact['indicators'].get(symbol)
+
+    def summary(self, symbols):
+        """Precomputed summary rows for ``symbols`` (only those present)"""
+        rows = {row['symbol']: row for row in self.artifact.get('summary', [])}
+        return [rows[s] for s in symbols if s in rows]
+
+
+def load_latest(output_dir=None, max_age=None):
+    """Load the newest artifact, or None if there is none recent enough"""
+    output_dir = output_dir or Config.PRECOMPUTE_DIR
+    max_age = Config.PRECOMPUTE_MAX_AGE if max_age is None else max_age
+    for path in sorted(glob.glob(os.path.join(output_dir, ARTIFACT_PATTERN)), reverse=True):
+        try:
+            with open(path, 'r') as f:
+                artifact = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading {path}: {e}")
+            continue
+        if artifact.get('version') != ARTIFACT_VERSION:
+            continue
+        precomputed = Precomputed(artifact, path)
+        if (datetime.now() - precomputed.created).total_seconds() > max_age:
+            return None
+        return precomputed
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute forecasts, indicators and summaries')
+    parser.add_argument('--symbols', nargs='*', help='symbols to process (default: configured universe)')
+    parser.add_argument('--period', default='1y', help='price history period')
+    parser.add_argument('--max-horizon', type=int, default=30, help='longest forecast horizon in days')
+    parser.add_argument('--workers', type=int, help='worker processes')
+    parser.add_argument('--output-dir', help='artifact directory')
+    args = parser.parse_args()
+
+    path = run(args.symbols, args.period, args.max_horizon, args.workers, args.output_dir)
+    with open(path, 'r') as f:
+        artifact = json.load(f)
+    print(f"Wrote {path}: {len(artifact['forecasts'])}/{len(artifact['symbols'])} forecasts "
+          f"in {artifact['seconds']}s")
+    for symbol, error in artifact['errors'].items():
+        print(f"  {symbol}: {error}")
+
+
+if __name__ == '__main__':
+    main()
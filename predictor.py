@@ -1,38 +1,16 @@
 # predictor.py
-import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
+from features import BASIC_FEATURES, build_feature_frame
+from model_backends import make_model
 
 class StockPredictor:
-    def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
+    def __init__(self, backend=None):
+        self.model = make_model(backend)
         self.scaler = StandardScaler()
     
     def prepare_features(self, df):
-        # Create features
-        features = pd.DataFrame()
-        features['Close'] = df['Close']
-        features['Volume'] = df['Volume']
-        features['MA_20'] = df['MA_20']
-        features['MA_50'] = df['MA_50']
-        features['RSI'] = df['RSI']
-        
-        # Lag features
-        for lag in [1, 2, 3, 5]:
-            features[f'Close_Lag_{lag}'] = df['Close'].shift(lag)
-        
-        # Moving averages
-        features['MA_5'] = df['Close'].rolling(window=5).mean()
-        features['MA_10'] = df['Close'].rolling(window=10).mean()
-        
-        # Price change
-        features['Price_Change'] = df['Close'].pct_change()
-        
-        # Drop NaN
-        features = features.dropna()
-        
-        return features
+        # Raw columns, Close lags, MA_5/MA_10 and price change as one float32 block
+        return build_feature_frame(df, BASIC_FEATURES)
     
     def train_predict(self, df, days_to_predict=7):
         try:
@@ -0,0 +1,148 @@
+# price_store.py
+import os
+import time
+import threading
+from urllib.parse import quote
+import pandas as pd
+from config import Config
+from provider import get_client
+import metrics
+
+# Calendar span covered by each yfinance ``period`` string
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def period_start(period, now=None):
+    """Return the first date covered by a yfinance period (None for 'max')"""
+    now = (now or pd.Timestamp.now()).normalize()
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return now.replace(month=1, day=1)
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Unsupported period: {period}")
+    return now - PERIOD_OFFSETS[period]
+
+
+class PriceStore:
+    """Persistent OHLCV cache with one Parquet file per symbol and interval.
+
+    A request reads the stored bars and only asks the provider for bars from
+    the last stored timestamp onwards; the full period is downloaded only
+    when the store does not reach back far enough yet.
+    """
+
+    def __init__(self, directory=None, fetch=None, refresh_seconds=None):
+        self.directory = directory or Config.PRICE_STORE_DIR
+        self.fetch = fetch or get_client().history
+        self.refresh_seconds = (Config.PRICE_REFRESH_SECONDS
+                                if refresh_seconds is None else refresh_seconds)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, symbol, interval):
+        return os.path.join(self.directory, f"{quote(symbol, safe='')}_{interval}.parquet")
+
+    def _lock(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def read(self, symbol, interval='1d'):
+        """Read all stored bars for a symbol (empty frame if none)"""
+        path = self._path(symbol, interval)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"Error reading stored prices for {symbol}: {e}")
+            return pd.DataFrame()
+
+    def write(self, symbol, interval, df, covered_from):
+        """Atomically replace the stored bars for a symbol"""
+        df = df.copy()
+        df.attrs = {'covered_from': covered_from, 'fetched_at': time.time()}
+        path = self._path(symbol, interval)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _covers(cached, start):
+        covered_from = cached.attrs.get('covered_from')
+        if covered_from is None:
+            return False
+        if covered_from == 'max':
+            return True
+        return start is not None and pd.Timestamp(covered_from) <= start
+
+    @staticmethod
+    def _merge(cached, fresh):
+        if cached.empty:
+            return fresh
+        if fresh.empty:
+            return cached
+        # Later bars win so a partial bar from the previous fetch gets replaced
+        merged = pd.concat([cached[cached.index < fresh.index[0]], fresh])
+        return merged[~merged.index.duplicated(keep='last')].sort_index()
+
+    @staticmethod
+    def _slice(df, start):
+        if df.empty or start is None:
+            return df.copy()
+        if df.index.tz is not None:
+            start = start.tz_localize(df.index.tz)
+        return df.loc[df.index >= start].copy()
+
+    def get(self, symbol, period='1y', interval='1d'):
+        """Return bars for ``period``, topping up the store with any new bars"""
+        start = period_start(period)
+        with self._lock((symbol, interval)):
+            cached = self.read(symbol, interval)
+            covered_from = cached.attrs.get('covered_from')
+
+            if cached.empty or not self._covers(cached, start):
+                metrics.inc('cache_total', cache='prices', result='miss')
+                fresh = self.fetch(symbol, interval, period=period)
+                covered_from = 'max' if start is None else start.strftime('%Y-%m-%d')
+            elif time.time() - cached.attrs.get('fetched_at', 0) >= self.refresh_seconds:
+                metrics.inc('cache_total', cache='prices', result='delta')
+                last_date = cached.index[-1].strftime('%Y-%m-%d')
+                try:
+                    fresh = self.fetch(symbol, interval, start=last_date)
+                except Exception as e:
+                    # Serve the stored bars through a provider outage; only a
+                    # cold miss has nothing to fall back on
+                    metrics.inc('errors_total', op='price_refresh')
+                    print(f"Error refreshing prices for {symbol}: {e}")
+                    return self._slice(cached, start)
+            else:
+                metrics.inc('cache_total', cache='prices', result='hit')
+                return self._slice(cached, start)
+
+            if fresh is None or fresh.empty:
+                return self._slice(cached, start)
+
+            merged = self._merge(cached, fresh)
+            try:
+                self.write(symbol, interval, merged, covered_from)
+            except Exception as e:
+                print(f"Error storing prices for {symbol}: {e}")
+            return self._slice(merged, start)
+
+    def clear(self, symbol, interval='1d'):
+        """Drop the stored bars for a symbol"""
+        path = self._path(symbol, interval)
+        if os.path.exists(path):
+            os.remove(path)
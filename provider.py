@@ -0,0 +1,236 @@
+# provider.py
+"""Shared market-data client.
+
+All price history, bulk quote and symbol-info requests go through one
+``ProviderClient`` per process. Identical requests that arrive while one is
+already in flight wait for it instead of calling the provider again (single
+flight), upstream calls are paced by a token bucket, and failed calls are
+retried with jittered exponential backoff. The upstream is Yahoo Finance by
+default, or a directory of files for offline use (``AUREX_PROVIDER=file``).
+"""
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import quote
+import pandas as pd
+from config import Config
+import metrics
+
+
+class TokenBucket:
+    """Allows ``rate`` calls per second on average with bursts of up to ``capacity``"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers share its outcome"""
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        """Return (result, shared) where ``shared`` is True for callers that waited"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = {'event': threading.Event(), 'result': None, 'error': None}
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result'], True
+        try:
+            call['result'] = fn(*args, **kwargs)
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call['event'].set()
+        return call['result'], False
+
+
+class YahooProvider:
+    """Yahoo Finance via yfinance (imported on first use)"""
+
+    def history(self, symbol, interval='1d', period=None, start=None):
+        """Bars for a full period or from a start date"""
+        import yfinance as yf
+        stock = yf.Ticker(symbol)
+        if start is not None:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period, interval=interval)
+
+    def download(self, symbols, period='5d'):
+        """Daily bars for many symbols in one bulk request"""
+        import yfinance as yf
+        return yf.download(symbols, period=period, group_by='ticker', auto_adjust=True,
+                           threads=True, progress=False)
+
+    def info(self, symbol):
+        import yfinance as yf
+        return yf.Ticker(symbol).info
+
+
+class FileProvider:
+    """Offline stand-in that serves bars and info from a directory.
+
+    Bars are read from ``{symbol}_{interval}.parquet`` (or ``.csv`` with a
+    date index in the first column) and info from ``{symbol}.json``; use
+    ``save`` to record fixtures from another provider.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or Config.PROVIDER_DIR
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def bars(self, symbol, interval='1d'):
+        base = self._path(f"{quote(symbol, safe='')}_{interval}")
+        if os.path.exists(base + '.parquet'):
+            return pd.read_parquet(base + '.parquet')
+        if os.path.exists(base + '.csv'):
+            return pd.read_csv(base + '.csv', index_col=0, parse_dates=True)
+        return pd.DataFrame()
+
+    def history(self, symbol, interval='1d', period=None, start=None):
+        df = self.bars(symbol, interval)
+        if df.empty:
+            return df
+        if start is not None:
+            start = pd.Timestamp(start)
+        elif period is not None:
+            from price_store import period_start
+            start = period_start(period)
+        if start is None:
+            return df
+        if df.index.tz is not None and start.tz is None:
+            start = start.tz_localize(df.index.tz)
+        return df.loc[df.index >= start]
+
+    def download(self, symbols, period='5d'):
+        """Same shape as ``yf.download(symbols, group_by='ticker')``"""
+        frames = {s: self.history(s, period=period) for s in symbols}
+        frames = {s: df for s, df in frames.items() if not df.empty}
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    def info(self, symbol):
+        path = self._path(f"{quote(symbol, safe='')}.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def save(self, symbol, bars=None, info=None, interval='1d'):
+        """Store bars and/or info for ``symbol``"""
+        if bars is not None:
+            bars.to_parquet(self._path(f"{quote(symbol, safe='')}_{interval}.parquet"))
+        if info is not None:
+            with open(self._path(f"{quote(symbol, safe='')}.json"), 'w') as f:
+                json.dump(info, f, default=str)
+
+
+def _copy(result):
+    return result.copy() if hasattr(result, 'copy') else result
+
+
+class ProviderClient:
+    """Coalescing, rate-limited and retrying front end for a provider.
+
+    ``provider`` needs ``history``, ``download`` and ``info`` methods with the
+    signatures of ``YahooProvider``. Callers that joined an in-flight request
+    receive their own copy of its result.
+    """
+
+    def __init__(self, provider=None, rate=None, burst=None, retries=None, backoff=None,
+                 max_backoff=30.0):
+        self.provider = provider or YahooProvider()
+        self.bucket = TokenBucket(rate or Config.PROVIDER_RATE, burst or Config.PROVIDER_BURST)
+        self.retries = Config.PROVIDER_RETRIES if retries is None else retries
+        self.backoff = Config.PROVIDER_BACKOFF if backoff is None else backoff
+        self.max_backoff = max_backoff
+        self.flights = SingleFlight()
+
+    def _fetch(self, kind, *args, **kwargs):
+        """One upstream call, paced by the token bucket and retried on errors"""
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire()
+            if waited:
+                metrics.observe('latency_seconds', waited, op='provider_rate_limit_wait')
+            metrics.inc('provider_requests_total', kind=kind)
+            try:
+                with metrics.timer(f'provider_{kind}'):
+                    return getattr(self.provider, kind)(*args, **kwargs)
+            except Exception:
+                if attempt >= self.retries:
+                    raise
+                # Full jitter keeps retries from many callers from lining up
+                time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+                attempt += 1
+                metrics.inc('provider_retries_total', kind=kind)
+
+    def _call(self, key, kind, *args, **kwargs):
+        result, shared = self.flights.do(key, self._fetch, kind, *args, **kwargs)
+        if shared:
+            metrics.inc('provider_coalesced_total', kind=kind)
+            return _copy(result)
+        return result
+
+    def history(self, symbol, interval='1d', period=None, start=None):
+        """Same signature as ``YahooProvider.history``"""
+        start = None if start is None else str(start)
+        return self._call(('history', symbol, interval, period, start), 'history',
+                          symbol, interval, period=period, start=start)
+
+    def download(self, symbols, period='5d'):
+        symbols = list(symbols)
+        return self._call(('download', tuple(sorted(symbols)), period), 'download',
+                          symbols, period=period)
+
+    def info(self, symbol):
+        return self._call(('info', symbol), 'info', symbol)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client for the configured provider"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if Config.PROVIDER == 'file':
+                _client = ProviderClient(FileProvider())
+            else:
+                _client = ProviderClient(YahooProvider())
+        return _client
@@ -0,0 +1,88 @@
+# quotes.py
+import time
+import pandas as pd
+from provider import get_client
+
+
+class QuoteSnapshot:
+    """Latest closes and volumes for a set of symbols, taken in one bulk fetch"""
+
+    def __init__(self, closes=None, volumes=None):
+        self.closes = closes or {}
+        self.volumes = volumes or {}
+        self.fetched_at = time.time()
+
+    def __contains__(self, symbol):
+        return symbol in self.closes
+
+    @property
+    def symbols(self):
+        return list(self.closes)
+
+    def price(self, symbol):
+        """Latest close, or None if the symbol has no data"""
+        closes = self.closes.get(symbol)
+        return closes[-1] if closes else None
+
+    def previous_close(self, symbol):
+        """Close before the latest one (falls back to the latest close)"""
+        closes = self.closes.get(symbol)
+        if not closes:
+            return None
+        return closes[-2] if len(closes) > 1 else closes[-1]
+
+    def volume(self, symbol):
+        volumes = self.volumes.get(symbol)
+        return volumes[-1] if volumes else 0
+
+    def change(self, symbol):
+        """Return (price, change, change_pct) against the previous close"""
+        current = self.price(symbol)
+        if current is None:
+            return None
+        prev_close = self.previous_close(symbol)
+        change = current - prev_close
+        return current, change, (change / prev_close) * 100
+
+    @classmethod
+    def merge(cls, snapshots):
+        """Combine several snapshots (e.g. one per fetched batch) into one"""
+        closes, volumes = {}, {}
+        for snapshot in snapshots:
+            closes.update(snapshot.closes)
+            volumes.update(snapshot.volumes)
+        return cls(closes, volumes)
+
+    @classmethod
+    def from_frame(cls, df, symbols):
+        """Build a snapshot from a ``yf.download(..., group_by='ticker')`` frame"""
+        closes, volumes = {}, {}
+        if df is None or df.empty:
+            return cls(closes, volumes)
+        if not isinstance(df.columns, pd.MultiIndex):
+            df = pd.concat({symbols[0]: df}, axis=1)
+        available = set(df.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in available:
+                continue
+            bars = df[symbol].dropna(subset=['Close'])
+            if bars.empty:
+                continue
+            closes[symbol] = [float(c) for c in bars['Close'].values]
+            if 'Volume' in bars:
+                volumes[symbol] = [int(v) for v in bars['Volume'].fillna(0).values]
+        return cls(closes, volumes)
+
+
+def fetch_snapshot(symbols, period='5d', download=None):
+    """Fetch one snapshot for all distinct symbols in a single bulk call"""
+    symbols = list(dict.fromkeys(s for s in symbols if s))
+    if not symbols:
+        return QuoteSnapshot()
+    download = download or get_client().download
+    try:
+        df = download(symbols, period=period)
+    except Exception as e:
+        print(f"Error fetching quotes: {e}")
+        return QuoteSnapshot()
+    return QuoteSnapshot.from_frame(df, symbols)
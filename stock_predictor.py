@@ -1,37 +1,85 @@
 # stock_predictor.py
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_absolute_error
-import ta
 from config import Config
+from price_store import PriceStore
+from provider import get_client
+from indicators import IndicatorCache, TECHNICAL_SPEC
+from model_registry import ModelRegistry, feature_hash
+from features import STOCK_FEATURES, build_feature_frame
+from model_backends import make_model, for_targets
+import metrics
+
+# scikit-learn and ta are imported where they are used, so that
+# fetching stored bars and charting do not pay for loading them.
 
 class StockPredictor:
-    def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.scaler = StandardScaler()
+    def __init__(self, store=None, registry=None, backend=None):
+        self.backend = backend or Config.MODEL_BACKEND
+        self._model = None
+        self._scaler = None
+        self.fitted_model = None
+        self.store = store or PriceStore()
+        self.indicator_cache = IndicatorCache(TECHNICAL_SPEC, self._compute_indicators)
+        self.registry = registry or ModelRegistry()
+    
+    @property
+    def model(self):
+        """Unfitted template estimator; each training run fits a clone of it"""
+        if self._model is None:
+            self._model = make_model(self.backend)
+        return self._model
+    
+    @model.setter
+    def model(self, value):
+        self._model = value
+    
+    @property
+    def scaler(self):
+        if self._scaler is None:
+            from sklearn.preprocessing import StandardScaler
+            self._scaler = StandardScaler()
+        return self._scaler
+    
+    @scaler.setter
+    def scaler(self, value):
+        self._scaler = value
         
+    @metrics.timed('fetch_data')
     def fetch_data(self, symbol, period='1y'):
-        """Fetch historical data from Yahoo Finance"""
+        """Fetch historical data, reading stored bars and downloading only new ones"""
         try:
-            stock = yf.Ticker(symbol)
-            df = stock.history(period=period)
+            df = self.store.get(symbol, period=period)
             
             if df.empty:
                 # Fallback to manual date range
-                df = yf.download(symbol, start=Config.START_DATE, end=Config.END_DATE)       
+                df = get_client().history(symbol, start=Config.START_DATE)       
+            metrics.inc('rows_total', len(df), op='fetch_data')
             return df
         except Exception as e:
+            metrics.inc('errors_total', op='fetch_data')
             print(f"Error fetching data: {e}")
             return pd.DataFrame()   
-    def add_technical_indicators(self, df):
-        """Add technical indicators to the data"""
+    @metrics.timed('add_technical_indicators')
+    def add_technical_indicators(self, df, symbol=None):
+        """Add technical indicators to the data.
+
+        With a ``symbol`` the indicator state is kept between calls, so a frame
+        that only gained or revised trailing bars is updated incrementally.
+        """
+        if df.empty:
+            return df
+        metrics.inc('rows_total', len(df), op='add_technical_indicators')
+        if symbol is not None:
+            return self.indicator_cache.apply(symbol, df).dropna()
+        return self._compute_indicators(df).dropna()
+    @staticmethod
+    def _compute_indicators(df):
+        """Compute all indicator columns over the whole frame"""
         if df.empty:
-            return df           
+            return df
+        import ta
         # Moving averages
         df['SMA_20'] = df['Close'].rolling(window=20).mean()
         df['SMA_50'] = df['Close'].rolling(window=50).mean()
@@ -50,43 +98,90 @@ class StockPredictor:
         # Price changes
         df['Daily_Return'] = df['Close'].pct_change()
         df['Price_Change'] = df['Close'].diff()        
-        return df.dropna()    
+        return df
     def prepare_features(self, df, forecast_days=5):
-        """Prepare features for prediction"""
-        features = df[['Close', 'Volume', 'SMA_20', 'SMA_50', 'RSI', 
-                      'MACD', 'MACD_signal', 'BB_upper', 'BB_lower']].copy()        
-        # Create lag features
-        for lag in range(1, 6):
-            features[f'Close_lag_{lag}'] = features['Close'].shift(lag)        
-        # Target: Future price (5 days ahead)
-        features['Target'] = features['Close'].shift(-forecast_days)       
-        return features.dropna()   
+        """Prepare features for prediction (float32, built in one pass)"""
+        # Target: Future price (forecast_days ahead)
+        return build_feature_frame(df, STOCK_FEATURES, {'Target': forecast_days})
+    def prepare_multi_horizon_features(self, df, max_horizon=30):
+        """Prepare features with one target column per horizon (Target_1..Target_N)"""
+        return build_feature_frame(df, STOCK_FEATURES,
+                                   {f'Target_{h}': h for h in range(1, max_horizon + 1)})
+    @staticmethod
+    def _target_columns(features):
+        return [c for c in features.columns if c == 'Target' or c.startswith('Target_')]
+    @metrics.timed('train_model')
     def train_model(self, features):
-        """Train the prediction model"""
-        X = features.drop(['Target'], axis=1)
-        y = features['Target']       
+        """Train the prediction model (one output per target column)"""
+        from sklearn.base import clone
+        from sklearn.metrics import mean_absolute_error
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        target_columns = self._target_columns(features)
+        metrics.inc('rows_total', len(features), op='train_model')
+        X = features.drop(target_columns, axis=1)
+        y = features[target_columns[0]] if len(target_columns) == 1 else features[target_columns]
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, shuffle=False
         )
         
+        # Fresh estimators so models handed to the registry are never refit
+        self.fitted_model = for_targets(clone(self.model), len(target_columns))
+        self.scaler = StandardScaler()
+        
         # Scale features
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
         # Train model
-        self.model.fit(X_train_scaled, y_train)
+        self.fitted_model.fit(X_train_scaled, y_train)
         
         # Evaluate
-        predictions = self.model.predict(X_test_scaled)
+        predictions = self.fitted_model.predict(X_test_scaled)
         mae = mean_absolute_error(y_test, predictions)
         
-        return {
+        training_info = {
             'mae': mae,
             'last_training_date': datetime.now().strftime('%Y-%m-%d'),
             'features_used': list(X.columns)
         }
+        if len(target_columns) > 1:
+            training_info['mae_by_horizon'] = list(
+                mean_absolute_error(y_test, predictions, multioutput='raw_values'))
+        return training_info
+    
+    def _load_or_train(self, symbol, horizon_key, df, features):
+        """Reuse the fitted model while the underlying bars have not advanced"""
+        params = dict(self.model.get_params(), estimator=type(self.model).__name__)
+        fhash = feature_hash(features.columns, params)
+        cached = self.registry.get(symbol, horizon_key, fhash, df.index[-1])
+        if cached:
+            self.fitted_model, self.scaler = cached['model'], cached['scaler']
+            return cached['training_info']
+        # Train model
+        training_info = self.train_model(features)
+        self.registry.put(symbol, horizon_key, fhash, df.index[-1], {
+            'model': self.fitted_model,
+            'scaler': self.scaler,
+            'training_info': training_info
+        })
+        return training_info
+    
+    @staticmethod
+    def _prediction_result(symbol, current_price, prediction, days_ahead, training_info, mae):
+        return {
+            'symbol': symbol,
+            'current_price': round(current_price, 2),
+            'predicted_price': round(prediction, 2),
+            'prediction_date': (datetime.now() + timedelta(days=days_ahead)).strftime('%Y-%m-%d'),
+            'days_ahead': days_ahead,
+            'price_change_pct': round(((prediction - current_price) / current_price) * 100, 2),
+            'training_info': training_info,
+            'confidence': max(0, min(100, 100 - mae))
+        }
     
+    @metrics.timed('predict')
     def predict(self, symbol, days_ahead=5):
         """Make predictions for a given stock"""
         # Fetch and prepare data
@@ -94,30 +189,58 @@ class StockPredictor:
         if df.empty:
             return None
             
-        df = self.add_technical_indicators(df)
+        df = self.add_technical_indicators(df, symbol)
         features = self.prepare_features(df, days_ahead)
         
         if len(features) < 100:  # Need sufficient data
             return None
         
-        # Train model
-        training_info = self.train_model(features)
+        training_info = self._load_or_train(symbol, days_ahead, df, features)
         
-        # Prepare latest data for prediction
-        latest_features = features.drop(['Target'], axis=1).iloc[-1:].copy()
+        # Training rows stop days_ahead bars early (no target yet); predict
+        # from the latest bar instead
+        latest_features = build_feature_frame(df, STOCK_FEATURES).iloc[-1:]
         latest_scaled = self.scaler.transform(latest_features)
         
         # Make prediction
-        prediction = self.model.predict(latest_scaled)[0]
+        prediction = self.fitted_model.predict(latest_scaled)[0]
+        current_price = df['Close'].iloc[-1]
+        
+        return self._prediction_result(symbol, current_price, prediction, days_ahead,
+                                       training_info, training_info['mae'])
+    
+    @metrics.timed('predict_horizons')
+    def predict_horizons(self, symbol, max_horizon=30, period='1y'):
+        """Predict every horizon from 1 to ``max_horizon`` days with a single model fit"""
+        df = self.fetch_data(symbol, period)
+        if df.empty:
+            return None
+        
+        df = self.add_technical_indicators(df, symbol)
+        features = self.prepare_multi_horizon_features(df, max_horizon)
+        
+        if len(features) < 100:  # Need sufficient data
+            return None
+        
+        # Models trained on different history windows are kept apart
+        training_info = self._load_or_train(symbol, f'1-{max_horizon}-{period}', df, features)
+        
+        # Training rows need all targets, so they stop max_horizon bars early;
+        # the forecast starts from the latest bar instead
+        latest_features = build_feature_frame(df, STOCK_FEATURES).iloc[-1:]
+        latest_scaled = self.scaler.transform(latest_features)
+        
+        curve = np.atleast_1d(self.fitted_model.predict(latest_scaled)[0])
+        mae_by_horizon = training_info.get('mae_by_horizon', [training_info['mae']])
         current_price = df['Close'].iloc[-1]
         
         return {
             'symbol': symbol,
             'current_price': round(current_price, 2),
-            'predicted_price': round(prediction, 2),
-            'prediction_date': (datetime.now() + timedelta(days=days_ahead)).strftime('%Y-%m-%d'),
-            'days_ahead': days_ahead,
-            'price_change_pct': round(((prediction - current_price) / current_price) * 100, 2),
             'training_info': training_info,
-            'confidence': max(0, min(100, 100 - training_info['mae']))
-        }
\ No newline at end of file
+            'predictions': [
+                self._prediction_result(symbol, current_price, prediction, horizon,
+                                        training_info, mae_by_horizon[horizon - 1])
+                for horizon, prediction in enumerate(curve, start=1)
+            ]
+        }
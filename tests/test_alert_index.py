@@ -0,0 +1,66 @@
+# tests/test_alert_index.py
+import pytest
+from alert_index import AlertIndex
+
+
+def _index(inclusive):
+    index = AlertIndex(inclusive=inclusive)
+    index.add(1, 'AAPL', 'above', 100)
+    index.add(2, 'AAPL', 'above', 110)
+    index.add(3, 'AAPL', 'below', 90)
+    index.add(4, 'AAPL', 'below', 80)
+    index.add(5, 'AAPL', 'pct_up', 3)
+    index.add(6, 'AAPL', 'pct_up', 10)
+    index.add(7, 'AAPL', 'pct_down', 3)
+    index.add(8, 'AAPL', 'pct_down', 10)
+    return index
+
+
+@pytest.mark.parametrize('inclusive', [False, True])
+def test_price_kinds(inclusive):
+    index = _index(inclusive)
+    assert sorted(index.triggered('AAPL', 95)) == []
+    assert sorted(index.triggered('AAPL', 105)) == [1]
+    assert sorted(index.triggered('AAPL', 120)) == [1, 2]
+    assert sorted(index.triggered('AAPL', 85)) == [3]
+    assert sorted(index.triggered('AAPL', 70)) == [3, 4]
+    # Equal to a threshold only triggers when inclusive
+    assert sorted(index.triggered('AAPL', 100)) == ([1] if inclusive else [])
+    assert sorted(index.triggered('AAPL', 90)) == ([3] if inclusive else [])
+
+
+@pytest.mark.parametrize('inclusive', [False, True])
+def test_percent_kinds(inclusive):
+    index = _index(inclusive)
+    assert sorted(index.triggered('AAPL', 95, 0.0)) == []
+    assert sorted(index.triggered('AAPL', 95, 5.0)) == [5]
+    assert sorted(index.triggered('AAPL', 95, 12.0)) == [5, 6]
+    assert sorted(index.triggered('AAPL', 95, -5.0)) == [7]
+    assert sorted(index.triggered('AAPL', 95, -12.0)) == [7, 8]
+    assert sorted(index.triggered('AAPL', 95, 3.0)) == ([5] if inclusive else [])
+    assert sorted(index.triggered('AAPL', 95, -3.0)) == ([7] if inclusive else [])
+
+
+def test_rise_does_not_trigger_decrease_alerts():
+    index = _index(False)
+    assert index.triggered('AAPL', 105, 5.0) == [1, 5]
+
+
+def test_remove_and_other_symbols():
+    index = _index(False)
+    assert index.remove(1)
+    assert not index.remove(1)
+    assert index.triggered('AAPL', 105) == []
+    assert index.triggered('MSFT', 1000, 50.0) == []
+    index.add(9, 'MSFT', 'above', 10)
+    assert index.symbols() == ['AAPL', 'MSFT']
+    with pytest.raises(ValueError):
+        index.add(10, 'MSFT', 'sideways', 1)
+
+
+def test_crossed():
+    index = _index(False)
+    assert index.crossed('AAPL', 95, 105) == [1]
+    assert index.crossed('AAPL', 105, 115) == [2]
+    assert index.crossed('AAPL', 95, 85) == [3]
+    assert index.crossed('AAPL', 85, 95) == []
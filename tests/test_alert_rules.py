@@ -0,0 +1,123 @@
+# tests/test_alert_rules.py
+import numpy as np
+import pandas as pd
+import pytest
+from alert_rules import FIELDS, RuleBook, RuleSnapshot, parse
+
+
+def _frame(*bars):
+    """Bars as {field: value} dicts (oldest first); unspecified fields are 0"""
+    return pd.DataFrame([{field: bar.get(field, 0.0) for field in FIELDS} for bar in bars])
+
+
+def _triggered(expression, *bars):
+    book = RuleBook()
+    book.add(1, 'AAPL', expression)
+    return book.triggered(RuleSnapshot({'AAPL': _frame(*bars)})) == [1]
+
+
+def test_parse_lifts_numbers_into_params():
+    template, params = parse('RSI < 30 and Close crosses_above SMA_50')
+    assert template == ('and', ('cmp', '<', ('field', 'RSI'), ('param', 0)),
+                        ('cross', 'crosses_above', ('field', 'Close'), ('field', 'SMA_50')))
+    assert params == (30.0,)
+    # Keywords and field names are case-insensitive
+    assert parse('rsi < 25 AND close CROSSES_ABOVE sma_50') == (template, (25.0,))
+
+
+def test_precedence():
+    a, b, c = ('cmp', '<', ('field', 'RSI'), ('param', 0)), \
+        ('cmp', '>', ('field', 'Close'), ('param', 1)), \
+        ('cmp', '>', ('field', 'Volume'), ('param', 2))
+    assert parse('RSI < 1 or Close > 2 and Volume > 3')[0] == ('or', a, ('and', b, c))
+    assert parse('(RSI < 1 or Close > 2) and Volume > 3')[0] == ('and', ('or', a, b), c)
+    assert parse('not RSI < 1 and Close > 2')[0] == ('and', ('not', a), b)
+    assert parse('not (RSI < 1 and Close > 2)')[0] == ('not', ('and', a, b))
+
+    bar = {'RSI': 50, 'Close': 10, 'Volume': 0}
+    assert _triggered('RSI < 60 or Close > 20 and Volume > 1', bar)
+    assert not _triggered('(RSI < 60 or Close > 20) and Volume > 1', bar)
+    assert _triggered('not RSI < 40 and Close > 5', bar)
+    assert not _triggered('not (RSI < 60 and Close > 5)', bar)
+
+
+def test_unary_minus():
+    assert parse('Daily_Return < -0.05')[1] == (-0.05,)
+    assert _triggered('Daily_Return < -0.05', {'Daily_Return': -0.06})
+    assert not _triggered('Daily_Return < -0.05', {'Daily_Return': -0.04})
+    with pytest.raises(ValueError):
+        parse('-RSI < 30')
+
+
+@pytest.mark.parametrize('expression', [
+    'RSI <', 'Foo > 3', 'RSI < 30 and', '(RSI < 30', 'RSI 30', 'RSI < 30 )', 'RSI < 3 $',
+])
+def test_invalid_rules(expression):
+    with pytest.raises(ValueError):
+        parse(expression)
+
+
+def test_crosses():
+    below, above = {'Close': 9, 'SMA_50': 10}, {'Close': 11, 'SMA_50': 10}
+    assert _triggered('Close crosses_above SMA_50', below, above)
+    assert not _triggered('Close crosses_above SMA_50', above, above)
+    assert _triggered('Close crosses_below SMA_50', above, below)
+    assert not _triggered('Close crosses_below SMA_50', below, above)
+    assert _triggered('RSI crosses_above 70', {'RSI': 70}, {'RSI': 71})
+
+
+def test_crosses_with_nan_previous_bar():
+    above = {'Close': 11, 'SMA_50': 10}
+    # A single bar has no previous one, and warm-up values are NaN
+    assert not _triggered('Close crosses_above SMA_50', above)
+    assert not _triggered('Close crosses_above SMA_50', {'Close': 9, 'SMA_50': np.nan}, above)
+    assert not _triggered('not Close crosses_above SMA_50', above)
+
+
+def test_missing_values_never_trigger():
+    bar = {'RSI': np.nan, 'Close': 10}
+    assert not _triggered('RSI < 30', bar)
+    assert not _triggered('not RSI < 30', bar)
+    assert not _triggered('not (RSI < 30 and Close > 5)', bar)
+    assert not _triggered('RSI < 30 or Close > 50', bar)
+    # The known side can still decide the outcome
+    assert _triggered('RSI < 30 or Close > 5', bar)
+    assert _triggered('not (RSI < 30 and Close > 50)', bar)
+    assert not _triggered('RSI < 30 and Close > 50', bar)
+
+
+def test_rules_differing_in_numbers_share_a_template():
+    book = RuleBook()
+    book.add(1, 'AAPL', 'RSI < 30')
+    book.add(2, 'AAPL', 'RSI < 60')
+    book.add(3, 'MSFT', 'RSI < 30')
+    book.add(4, 'MSFT', 'RSI <= 30')
+    assert len(book.groups) == 2
+    snapshot = RuleSnapshot({'AAPL': _frame({'RSI': 40}), 'MSFT': _frame({'RSI': 30})})
+    assert sorted(book.triggered(snapshot)) == [2, 4]
+    # Symbols missing from the snapshot never trigger
+    assert book.triggered(RuleSnapshot({'TSLA': _frame({'RSI': 1})})) == []
+    assert book.symbols() == ['AAPL', 'MSFT']
+
+
+def test_remove_and_re_add():
+    book = RuleBook()
+    book.add(1, 'AAPL', 'RSI < 30')
+    book.add(2, 'AAPL', 'RSI < 60')
+    snapshot = RuleSnapshot({'AAPL': _frame({'RSI': 20, 'Close': 5})})
+    assert sorted(book.triggered(snapshot)) == [1, 2]
+
+    book.remove(1)
+    book.remove(1)
+    assert book.triggered(snapshot) == [2]
+    book.add(1, 'AAPL', 'RSI < 10')
+    assert sorted(book.triggered(snapshot)) == [2]
+    # Re-adding an id replaces its rule, moving it to another template
+    book.add(2, 'AAPL', 'Close > 1')
+    assert sorted(book.triggered(snapshot)) == [2]
+    assert len(book) == 2 and len(book.groups) == 2
+
+    book.remove(1)
+    book.remove(2)
+    assert len(book) == 0 and book.groups == {}
+    assert book.triggered(snapshot) == []
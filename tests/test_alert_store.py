@@ -0,0 +1,68 @@
+# tests/test_alert_store.py
+import json
+import os
+from alert_store import AlertStore
+
+
+def _write_legacy(path, alerts):
+    with open(path, 'w') as f:
+        json.dump(alerts, f)
+
+
+def test_migration_keeps_duplicate_ids(tmp_path):
+    legacy = os.path.join(tmp_path, 'alerts.json')
+    _write_legacy(legacy, [
+        {'id': 1, 'symbol': 'AAPL', 'type': 'price_above', 'threshold': 200, 'triggered': False},
+        {'id': 1, 'symbol': 'MSFT', 'type': 'price_below', 'threshold': 300, 'triggered': False},
+        {'id': 2, 'symbol': 'TSLA', 'target_price': 150, 'condition': 'above', 'triggered': False},
+    ])
+    store = AlertStore(os.path.join(tmp_path, 'alerts.db'), legacy_json=legacy)
+    bot = store.load('bot')
+    assert [(a['id'], a['symbol']) for a in bot] == [(1, 'AAPL'), (3, 'MSFT')]
+    assert [(a['id'], a['symbol']) for a in store.load('system')] == [(2, 'TSLA')]
+
+    # Imported once only
+    store = AlertStore(os.path.join(tmp_path, 'alerts.db'), legacy_json=legacy)
+    assert len(store.load('bot')) == 2
+
+
+def test_unreadable_legacy_file_is_retried(tmp_path):
+    legacy = os.path.join(tmp_path, 'alerts.json')
+    with open(legacy, 'w') as f:
+        f.write('[{"id": 1, "symbol": ')
+    db = os.path.join(tmp_path, 'alerts.db')
+    assert AlertStore(db, legacy_json=legacy).load('bot') == []
+
+    _write_legacy(legacy, [{'id': 1, 'symbol': 'AAPL', 'type': 'price_above',
+                            'threshold': 200, 'triggered': False}])
+    assert [a['symbol'] for a in AlertStore(db, legacy_json=legacy).load('bot')] == ['AAPL']
+
+
+def _alert(symbol, threshold, triggered=False):
+    return {'symbol': symbol, 'type': 'price_above', 'threshold': threshold,
+            'condition': None, 'triggered': triggered}
+
+
+def test_changes_since(tmp_path):
+    store = AlertStore(os.path.join(tmp_path, 'alerts.db'), legacy_json=os.path.join(tmp_path, 'none.json'))
+    first = store.add('bot', _alert('AAPL', 100))
+    store.add('system', {'symbol': 'MSFT', 'target_price': 1, 'condition': 'above', 'triggered': False})
+    seq = store.last_change()
+    assert store.changes('bot', seq) == (seq, [], [])
+
+    second = store.add('bot', _alert('MSFT', 200))
+    first['triggered'] = True
+    store.update(first)
+    store.remove(second['id'])
+    seq, changed, removed = store.changes('bot', seq)
+    assert [(a['id'], a['triggered']) for a in changed] == [(first['id'], True)]
+    assert removed == [second['id']]
+    assert seq == store.last_change()
+    assert store.changes('bot', seq + 5) is None
+
+
+def test_load_pending_only(tmp_path):
+    store = AlertStore(os.path.join(tmp_path, 'alerts.db'), legacy_json=os.path.join(tmp_path, 'none.json'))
+    store.add_many('bot', [_alert('AAPL', 100), _alert('AAPL', 50, triggered=True)])
+    assert len(store.load('bot')) == 2
+    assert [a['threshold'] for a in store.load('bot', pending_only=True)] == [100]
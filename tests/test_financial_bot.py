@@ -0,0 +1,78 @@
+# tests/test_financial_bot.py
+import os
+from alert_store import AlertStore
+from financial_bot import FinancialBot
+
+
+def _store(tmp_path):
+    return AlertStore(os.path.join(tmp_path, 'alerts.db'), legacy_json=os.path.join(tmp_path, 'none.json'))
+
+
+def test_reload_applies_other_sessions_changes(tmp_path):
+    store = _store(tmp_path)
+    daemon_bot = FinancialBot(store=store, pending_only=True)
+    session_bot = FinancialBot(store=store)
+
+    kept = session_bot.add_alert('AAPL', 'price_above', 100, None)
+    removed = session_bot.add_alert('MSFT', 'price_below', 50, None)
+    fired = session_bot.add_alert('TSLA', 'percent_change', 5, 'decrease')
+    daemon_bot.reload_alerts()
+    assert sorted(daemon_bot.alerts_by_id) == [kept['id'], removed['id'], fired['id']]
+    assert daemon_bot.pending_symbols() == ['AAPL', 'MSFT', 'TSLA']
+
+    session_bot.remove_alert(removed['id'])
+    fired['triggered'] = True
+    session_bot.save_alerts([fired])
+    daemon_bot.reload_alerts()
+    assert [a['id'] for a in daemon_bot.alerts] == [kept['id']]
+    assert daemon_bot.pending_symbols() == ['AAPL']
+
+    # A full load sees the same pending alerts
+    assert [a['id'] for a in FinancialBot(store=store, pending_only=True).alerts] == [kept['id']]
+
+
+def test_rule_symbols_skip_quote_fetch(tmp_path):
+    import numpy as np
+    import pandas as pd
+    from quotes import QuoteSnapshot
+
+    fetched, loaded = [], []
+
+    def quote_fetch(symbols):
+        fetched.append(list(symbols))
+        return QuoteSnapshot({s: [100.0, 120.0] for s in symbols}, {})
+
+    def frame_fetch(symbol):
+        loaded.append(symbol)
+        return pd.DataFrame({'Close': [10.0, 20.0], 'RSI': [np.nan, 25.0]})
+
+    bot = FinancialBot(store=_store(tmp_path), quote_fetch=quote_fetch, frame_fetch=frame_fetch)
+    bot.add_alert('AAPL', 'price_above', 110, None)
+    bot.add_alert('NVDA', 'rule', None, 'RSI < 30')
+    assert bot.pending_symbols() == ['AAPL', 'NVDA']
+    assert bot.quote_symbols() == ['AAPL']
+
+    triggered = bot.check_alerts()
+    assert fetched == [['AAPL']]
+    assert loaded == ['NVDA']
+    assert sorted(a['symbol'] for a in triggered) == ['AAPL', 'NVDA']
+
+
+def test_market_summary_without_alert_store(monkeypatch):
+    import financial_bot
+    from quotes import QuoteSnapshot
+
+    class NoStore:
+        def __init__(self, *args, **kwargs):
+            raise AssertionError("market_summary must not open the alert store")
+
+    class Metadata:
+        def get_many(self, symbols):
+            return {s: {'shortName': s.lower(), 'marketCap': 1} for s in symbols}
+
+    monkeypatch.setattr(financial_bot, 'AlertStore', NoStore)
+    snapshot = QuoteSnapshot({'AAPL': [100.0, 110.0]}, {'AAPL': [4, 5]})
+    summary = financial_bot.market_summary(['AAPL', 'MSFT'], quote_fetch=lambda symbols: snapshot,
+                                           metadata=Metadata())
+    assert summary == [{'symbol': 'AAPL', 'name': 'aapl', 'price': 110.0, 'change': 10.0,
+                        'change_pct': 10.0, 'volume': 5, 'market_cap': 1}]
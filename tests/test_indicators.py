@@ -0,0 +1,43 @@
+# tests/test_indicators.py
+import numpy as np
+import pytest
+from indicators import IndicatorCache, IndicatorEngine, TECHNICAL_SPEC
+from stock_predictor import StockPredictor
+from benchmarks.synthetic import generate_ohlcv
+
+COLUMNS = [c for columns, _, _ in TECHNICAL_SPEC for c in columns]
+
+
+def _batch(df):
+    # StockPredictor's batch path, which uses the ``ta`` implementations
+    return StockPredictor._compute_indicators(df.copy())
+
+
+def _assert_matches(actual, expected):
+    np.testing.assert_allclose(actual[COLUMNS].to_numpy(dtype=float),
+                               expected[COLUMNS].to_numpy(dtype=float),
+                               rtol=1e-7, atol=1e-7, equal_nan=True)
+
+
+@pytest.mark.parametrize('seed_rows', [60, 200])
+def test_streaming_matches_batch(seed_rows):
+    df = generate_ohlcv('AAPL', 300)
+    expected = _batch(df)
+    engine = IndicatorEngine(TECHNICAL_SPEC).seed(df.iloc[:seed_rows])
+    rows = engine.extend(df.iloc[seed_rows:])
+    _assert_matches(rows, expected.iloc[seed_rows:])
+
+
+def test_cache_extends_and_amends_like_batch():
+    df = generate_ohlcv('AAPL', 300)
+    cache = IndicatorCache(TECHNICAL_SPEC, _batch)
+    _assert_matches(cache.apply('AAPL', df.iloc[:250]), _batch(df.iloc[:250]))
+
+    # New bars are appended through the engine
+    _assert_matches(cache.apply('AAPL', df), _batch(df))
+
+    # A revised last bar (still-forming candle) is amended in place
+    amended = df.copy()
+    amended.iloc[-1, amended.columns.get_loc('Close')] *= 1.03
+    amended.iloc[-1, amended.columns.get_loc('Volume')] += 1000
+    _assert_matches(cache.apply('AAPL', amended), _batch(amended))
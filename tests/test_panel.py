@@ -0,0 +1,76 @@
+# tests/test_panel.py
+import os
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import SyntheticProvider, generate_ohlcv
+from panel import PricePanel
+from price_store import PriceStore
+
+
+def _bars(symbol, periods=30):
+    return generate_ohlcv(symbol, periods)
+
+
+def _panel(max_bytes=None, capacity=2):
+    dates = _bars('A', 40).index
+    return PricePanel(dates, max_bytes=max_bytes or 10 ** 9, capacity=capacity)
+
+
+def test_add_and_frame():
+    panel = _panel()
+    bars = _bars('A')
+    panel.add('A', bars)
+    df = panel.frame('A')
+    assert len(df) == len(bars)
+    np.testing.assert_allclose(df['Close'].to_numpy(), bars['Close'].to_numpy(), rtol=1e-6)
+    assert (df['Volume'].to_numpy() == bars['Volume'].to_numpy()).all()
+    assert df['Close'].dtype == np.float32
+
+
+def test_replace_clears_old_bars():
+    panel = _panel()
+    panel.add('A', _bars('A', 40))
+    shorter = _bars('B', 10)
+    panel.add('A', shorter)
+    assert len(panel) == 1
+    dates, prices, _ = panel.view('A')
+    assert len(dates) == 10
+    # Bars from the first add outside the new range are gone
+    assert np.isnan(panel.prices[panel.slots['A'], :-10]).all()
+
+
+def test_view_is_zero_copy():
+    panel = _panel()
+    panel.add('A', _bars('A'))
+    _, prices, volumes = panel.view('A')
+    assert np.shares_memory(prices, panel.prices)
+    assert np.shares_memory(volumes, panel.volumes)
+    assert np.shares_memory(panel.frame('A')['Close'].to_numpy(), panel.prices)
+
+
+def test_grows_then_evicts_least_recently_used():
+    dates = _bars('A', 40).index
+    slot_bytes = len(dates) * (4 * 4 + 8)
+    panel = PricePanel(dates, max_bytes=3 * slot_bytes, capacity=1)
+    for symbol in 'ABC':
+        panel.add(symbol, _bars(symbol))
+    assert panel.capacity == 3 and panel.symbols == ['A', 'B', 'C']
+
+    panel.view('A')  # A becomes most recently used
+    panel.add('D', _bars('D'))
+    assert panel.symbols == ['C', 'A', 'D']
+    assert 'B' not in panel
+    assert panel.capacity == 3
+
+
+def test_from_store_keeps_every_symbol(tmp_path):
+    provider = SyntheticProvider()
+    store = PriceStore(os.path.join(tmp_path, 'prices'), fetch=provider.history,
+                       refresh_seconds=10 ** 9)
+    symbols = [f'S{i}' for i in range(5)]
+    panel = PricePanel.from_store(store, symbols, '1y', max_bytes=1)
+    assert panel.symbols == symbols
+    close = panel.frame('S2')['Close'].dropna()
+    expected = store.get('S2', period='1y')['Close']
+    assert len(close) == len(expected)
+    assert isinstance(panel.dates, pd.DatetimeIndex)
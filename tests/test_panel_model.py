@@ -0,0 +1,50 @@
+# tests/test_panel_model.py
+import os
+import panel_model
+from benchmarks.synthetic import SyntheticProvider
+from model_registry import ModelRegistry
+from price_store import PriceStore
+from stock_predictor import StockPredictor
+
+SYMBOLS = [f'SYM{i}' for i in range(6)]
+
+
+def _predictor(tmp_path):
+    provider = SyntheticProvider()
+    store = PriceStore(os.path.join(tmp_path, 'prices'), fetch=provider.history,
+                       refresh_seconds=10 ** 9)
+    return StockPredictor(store=store)
+
+
+def test_symbol_encoding_does_not_grow_with_universe(tmp_path):
+    frames = panel_model.load_frames(SYMBOLS, _predictor(tmp_path), '2y')
+    small = panel_model.PanelModel(5, 'ridge').fit({s: frames[s] for s in SYMBOLS[:2]})
+    large = panel_model.PanelModel(5, 'ridge').fit(frames)
+    assert small['features_used'] == large['features_used']
+    assert large['features_used'][-1] == 'symbol_effect'
+
+
+def test_registry_refits_when_any_symbol_gets_a_new_bar(tmp_path, monkeypatch):
+    predictor = _predictor(tmp_path)
+    registry = ModelRegistry(os.path.join(tmp_path, 'models'))
+    fits = []
+    fit = panel_model.PanelModel.fit
+    monkeypatch.setattr(panel_model.PanelModel, 'fit',
+                        lambda self, frames: fits.append(1) or fit(self, frames))
+
+    ranked = panel_model.predict_universe(SYMBOLS, 5, '2y', 'ridge', predictor, registry)
+    assert sorted(ranked['symbol']) == SYMBOLS
+    panel_model.predict_universe(SYMBOLS, 5, '2y', 'ridge', predictor, registry)
+    assert len(fits) == 1
+
+    # One symbol lagging a bar behind the newest leaves the newest bar unchanged
+    load_frames = panel_model.load_frames
+
+    def lagging(*args, **kwargs):
+        frames = load_frames(*args, **kwargs)
+        bars = frames.panel.frame('SYM3').copy()
+        frames.panel.add('SYM3', bars[bars['Close'].notna()].iloc[:-1])
+        return frames
+    monkeypatch.setattr(panel_model, 'load_frames', lagging)
+    panel_model.predict_universe(SYMBOLS, 5, '2y', 'ridge', predictor, registry)
+    assert len(fits) == 2
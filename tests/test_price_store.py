@@ -0,0 +1,68 @@
+# tests/test_price_store.py
+import os
+import pytest
+from benchmarks.synthetic import SyntheticProvider
+from price_store import PriceStore
+
+
+class FlakyProvider(SyntheticProvider):
+    """SyntheticProvider whose history calls can be made to fail"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        self.failing = False
+
+    def history(self, symbol, interval='1d', period=None, start=None):
+        self.calls.append({'period': period, 'start': start})
+        if self.failing:
+            raise ConnectionError('provider down')
+        return super().history(symbol, interval, period, start)
+
+
+def _store(tmp_path, provider, refresh_seconds=0):
+    return PriceStore(os.path.join(tmp_path, 'prices'), fetch=provider.history,
+                      refresh_seconds=refresh_seconds)
+
+
+def test_cold_miss_then_hit(tmp_path):
+    provider = FlakyProvider()
+    store = _store(tmp_path, provider, refresh_seconds=10 ** 9)
+    df = store.get('AAPL', '1y')
+    assert len(df) > 200
+    assert store.get('AAPL', '6mo').index[-1] == df.index[-1]
+    assert len(provider.calls) == 1
+
+
+def test_delta_merges_new_and_revised_bars(tmp_path):
+    provider = FlakyProvider()
+    store = _store(tmp_path, provider)
+    full = provider.bars('AAPL')
+    # Store everything but the last bar, with a stale version of the bar before it
+    stale = full.iloc[:-1].copy()
+    stale.iloc[-1, stale.columns.get_loc('Close')] += 1
+    store.write('AAPL', '1d', stale, '2000-01-01')
+
+    df = store.get('AAPL', '1y')
+    assert provider.calls[-1]['start'] == stale.index[-1].strftime('%Y-%m-%d')
+    assert df.index[-1] == full.index[-1]
+    assert df['Close'].iloc[-2] == full['Close'].iloc[-2]
+    assert not df.index.duplicated().any()
+    assert len(store.read('AAPL')) == len(full)
+
+
+def test_delta_failure_serves_stored_bars(tmp_path):
+    provider = FlakyProvider()
+    store = _store(tmp_path, provider)
+    before = store.get('AAPL', '1y')
+    provider.failing = True
+    after = store.get('AAPL', '1y')
+    assert len(provider.calls) == 2
+    assert after.equals(before)
+
+
+def test_cold_miss_failure_propagates(tmp_path):
+    provider = FlakyProvider()
+    provider.failing = True
+    with pytest.raises(ConnectionError):
+        _store(tmp_path, provider).get('AAPL', '1y')
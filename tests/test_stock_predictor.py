@@ -0,0 +1,55 @@
+# tests/test_stock_predictor.py
+import os
+from unittest import mock
+from sklearn.preprocessing import StandardScaler
+from benchmarks.synthetic import SyntheticProvider
+from model_registry import ModelRegistry
+from price_store import PriceStore
+from stock_predictor import StockPredictor
+
+
+def _predictor(tmp_path):
+    provider = SyntheticProvider()
+    store = PriceStore(os.path.join(tmp_path, 'prices'), fetch=provider.history,
+                       refresh_seconds=10 ** 9)
+    return StockPredictor(store=store, registry=ModelRegistry(os.path.join(tmp_path, 'models')),
+                          backend='ridge')
+
+
+def _predicted_rows(call):
+    """Run ``call`` and return what it passed to the scaler for prediction"""
+    transformed = []
+    transform = StandardScaler.transform
+
+    def spy(self, X, *args, **kwargs):
+        transformed.append(X)
+        return transform(self, X, *args, **kwargs)
+
+    with mock.patch.object(StandardScaler, 'transform', spy):
+        result = call()
+    return result, transformed[-1]
+
+
+def test_predict_starts_from_latest_bar(tmp_path):
+    predictor = _predictor(tmp_path)
+    result, rows = _predicted_rows(lambda: predictor.predict('AAPL', 5))
+    df = predictor.fetch_data('AAPL')
+    assert rows.index[-1] == df.index[-1]
+    assert result['current_price'] == round(df['Close'].iloc[-1], 2)
+
+
+def test_predict_horizons_starts_from_latest_bar(tmp_path):
+    predictor = _predictor(tmp_path)
+    result, rows = _predicted_rows(lambda: predictor.predict_horizons('AAPL', 30))
+    assert len(result['predictions']) == 30
+    assert rows.index[-1] == predictor.fetch_data('AAPL').index[-1]
+
+
+def test_predict_horizons_uses_period(tmp_path):
+    predictor = _predictor(tmp_path)
+    with mock.patch.object(predictor, 'fetch_data', wraps=predictor.fetch_data) as fetch:
+        predictor.predict_horizons('AAPL', 30, period='2y')
+        predictor.predict_horizons('AAPL', 30, period='1y')
+    assert [c.args[1] for c in fetch.call_args_list] == ['2y', '1y']
+    # Each window keeps its own model
+    assert len([n for n in os.listdir(os.path.join(tmp_path, 'models')) if n.endswith('.joblib')]) == 2